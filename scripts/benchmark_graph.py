@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""End-to-end graph latency benchmark.
+
+Compiles the real graph from ``create_chatbot_graph`` with a fake chat
+model (configurable token rate and tool-call pattern), fake embeddings
+and a local vector store of synthetic passages, then drives it with
+scripted multi-turn conversations at increasing concurrency.
+
+For every concurrency level it reports p50/p95/p99 latency per node and
+end to end, the graph overhead (end-to-end time not spent inside a node)
+and the number of agent -> tools loops per turn, so a slowdown can be
+attributed to graph overhead, retrieval or generation.
+
+Usage:
+    python scripts/benchmark_graph.py
+    python scripts/benchmark_graph.py --concurrency 1,4,16,64 --turns 4
+    python scripts/benchmark_graph.py --tool-pattern "search_documents;calculate" --tokens-per-second 30
+    python scripts/benchmark_graph.py --output graph.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+from uuid import UUID
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.callbacks import BaseCallbackHandler
+from rich.console import Console
+from rich.table import Table
+
+from src.benchmarks.corpus import CorpusGenerator
+from src.benchmarks.fakes import FakeChatModel, FakeEmbeddings, parse_tool_pattern
+from src.benchmarks.report import percentiles, result_header
+from src.config.config import Config
+from src.graph import create_chatbot_graph
+from src.tools.cache import invalidate_tool_cache
+from src.utils.clients import get_clients
+from src.utils.local_vector_store import LocalVectorStore
+
+console = Console(stderr=True)
+
+SMALL_TALK = ["Hello!", "Thanks, that helps.", "Good morning, how are you?"]
+WEATHER = ["What's the weather in Seoul?", "Is it raining in London?"]
+
+
+class NodeTimer(BaseCallbackHandler):
+    """Records the duration of every graph node run of one invocation."""
+
+    # Run in the event loop thread so timings are not skewed by executors
+    run_inline = True
+
+    def __init__(self):
+        self.spans: List[tuple] = []
+        self._starts: Dict[UUID, tuple] = {}
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, metadata: Optional[dict] = None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        # Nested runs inherit langgraph_node; the node itself carries its name
+        if node is not None and kwargs.get("name") == node:
+            self._starts[run_id] = (node, time.perf_counter())
+
+    def _finish(self, run_id: UUID) -> None:
+        started = self._starts.pop(run_id, None)
+        if started is not None:
+            node, start = started
+            self.spans.append((node, time.perf_counter() - start))
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs):
+        self._finish(run_id)
+
+
+def build_conversations(count: int, turns: int, mix: Dict[str, float], seed: int) -> List[List[str]]:
+    """Script multi-turn conversations.
+
+    Args:
+        count: Number of conversations
+        turns: User turns per conversation
+        mix: Relative weight of doc, smalltalk, math and weather turns
+        seed: Random seed
+
+    Returns:
+        List of conversations, each a list of user messages
+    """
+    corpus = CorpusGenerator(seed)
+    rng = random.Random(seed)
+    kinds = list(mix)
+    conversations = []
+    for _ in range(count):
+        conversation = []
+        for _ in range(turns):
+            kind = rng.choices(kinds, weights=[mix[k] for k in kinds])[0]
+            if kind == "doc":
+                conversation.append(corpus.question())
+            elif kind == "math":
+                conversation.append(f"What is {rng.randint(10, 999)} * {rng.randint(10, 999)}?")
+            elif kind == "weather":
+                conversation.append(rng.choice(WEATHER))
+            else:
+                conversation.append(rng.choice(SMALL_TALK))
+        conversations.append(conversation)
+    return conversations
+
+
+def parse_turn_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ("doc", "smalltalk", "math", "weather"):
+            raise ValueError(f"Unknown turn kind: {name!r}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+async def run_level(graph, conversations: List[List[str]], concurrency: int) -> dict:
+    """Run conversations with a fixed number of concurrent users.
+
+    Args:
+        graph: Compiled graph
+        conversations: Scripted conversations
+        concurrency: Conversations in flight at once
+
+    Returns:
+        Level result with latency percentiles per node and end to end
+    """
+    # Levels start from the same cache state
+    invalidate_tool_cache()
+    get_clients().get_embedding_cache().clear()
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for conversation in conversations:
+        queue.put_nowait(conversation)
+
+    node_times: Dict[str, List[float]] = defaultdict(list)
+    end_to_end: List[float] = []
+    overhead: List[float] = []
+    loops: Counter = Counter()
+    errors: List[str] = []
+
+    async def user() -> None:
+        while not queue.empty():
+            conversation = queue.get_nowait()
+            state: dict = {}
+            for text in conversation:
+                timer = NodeTimer()
+                start = time.perf_counter()
+                try:
+                    state = await graph.ainvoke(
+                        {"messages": state.get("messages", []), "summary": state.get("summary"), "input": text},
+                        config={"callbacks": [timer]},
+                    )
+                except Exception as e:
+                    errors.append(f"{type(e).__name__}: {e}")
+                    break
+                elapsed = time.perf_counter() - start
+                end_to_end.append(elapsed)
+                overhead.append(max(0.0, elapsed - sum(duration for _, duration in timer.spans)))
+                for node, duration in timer.spans:
+                    node_times[node].append(duration)
+                loops[sum(1 for node, _ in timer.spans if node == "tools")] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    turns = len(end_to_end)
+    return {
+        "concurrency": concurrency,
+        "conversations": len(conversations),
+        "turns": turns,
+        "errors": len(errors),
+        "error_samples": errors[:3],
+        "seconds": round(seconds, 4),
+        "turns_per_s": round(turns / seconds, 2) if seconds > 0 else 0.0,
+        "end_to_end": percentiles(end_to_end),
+        "graph_overhead": percentiles(overhead),
+        "nodes": {node: percentiles(times) for node, times in sorted(node_times.items())},
+        "tool_loops": {
+            "mean": round(sum(count * turns_ for count, turns_ in loops.items()) / turns, 3) if turns else 0.0,
+            "max": max(loops) if loops else 0,
+            "distribution": {str(count): loops[count] for count in sorted(loops)},
+        },
+    }
+
+
+def print_level(level: dict) -> None:
+    """Print the latency table of one concurrency level."""
+    table = Table(
+        title=(
+            f"concurrency {level['concurrency']}: {level['turns']} turns, "
+            f"{level['turns_per_s']} turns/s, {level['errors']} errors, "
+            f"{level['tool_loops']['mean']} tool loops/turn"
+        )
+    )
+    table.add_column("Node", style="cyan")
+    table.add_column("Count", justify="right")
+    for point in ("p50", "p95", "p99"):
+        table.add_column(f"{point} (ms)", justify="right")
+
+    def add(name: str, summary: dict, style: str = "") -> None:
+        if not summary.get("count"):
+            return
+        table.add_row(
+            f"[{style}]{name}[/{style}]" if style else name,
+            str(summary["count"]),
+            *(f"{summary[point] * 1000:.1f}" for point in ("p50", "p95", "p99")),
+        )
+
+    for node, summary in level["nodes"].items():
+        add(node, summary)
+    add("graph overhead", level["graph_overhead"], "yellow")
+    add("end to end", level["end_to_end"], "bold")
+    console.print(table)
+    for sample in level["error_samples"]:
+        console.print(f"  error: {sample}", style="red")
+
+
+async def run(args) -> dict:
+    """Build the graph around the fakes and run every concurrency level."""
+    Config.VECTOR_BACKEND = "local"
+    Config.ANSWER_CACHE_ENABLED = args.answer_cache
+    index_dir = tempfile.TemporaryDirectory(prefix="bench-graph-")
+    try:
+        store = LocalVectorStore(Path(index_dir.name), FakeEmbeddings(args.embed_dims, latency=0.0))
+        passages = CorpusGenerator(args.seed).passages(args.passages)
+        store.add_texts(passages, metadatas=[{"source": f"passage_{i}"} for i in range(len(passages))])
+
+        chat_model = FakeChatModel(
+            tokens_per_second=args.tokens_per_second,
+            time_to_first_token=args.time_to_first_token,
+            response_tokens=args.response_tokens,
+            tool_pattern=parse_tool_pattern(args.tool_pattern),
+            tool_probability=args.tool_probability,
+            seed=args.seed,
+        )
+        embeddings = FakeEmbeddings(args.embed_dims, latency=args.embed_latency)
+        graph = await create_chatbot_graph(chat_model=chat_model, embeddings=embeddings, vector_store=store)
+
+        levels = []
+        mix = parse_turn_mix(args.turn_mix)
+        for concurrency in args.concurrency:
+            conversations = build_conversations(
+                concurrency * args.conversations_per_user, args.turns, mix, args.seed + concurrency
+            )
+            level = await run_level(graph, conversations, concurrency)
+            print_level(level)
+            levels.append(level)
+    finally:
+        index_dir.cleanup()
+
+    return {
+        **result_header("graph"),
+        "config": {
+            "passages": args.passages,
+            "turns": args.turns,
+            "conversations_per_user": args.conversations_per_user,
+            "turn_mix": args.turn_mix,
+            "tokens_per_second": args.tokens_per_second,
+            "time_to_first_token": args.time_to_first_token,
+            "response_tokens": args.response_tokens,
+            "tool_pattern": args.tool_pattern,
+            "tool_probability": args.tool_probability,
+            "embed_latency": args.embed_latency,
+            "embed_dims": args.embed_dims,
+            "answer_cache": args.answer_cache,
+            "retrieval_mode": Config.RETRIEVAL_MODE,
+            "mmr": Config.MMR_ENABLED,
+        },
+        "levels": levels,
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark graph latency with fake models")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[1, 4, 16],
+        help="Comma-separated concurrent conversations per level (default: 1,4,16)",
+    )
+    parser.add_argument("--turns", type=int, default=3, help="User turns per conversation (default: 3)")
+    parser.add_argument("--conversations-per-user", type=int, default=2, help="Conversations per concurrent user")
+    parser.add_argument("--turn-mix", default="doc=6,smalltalk=1,math=2,weather=1", help="Relative turn kinds")
+    parser.add_argument("--passages", type=int, default=2000, help="Passages in the local index (default: 2000)")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Fake generation rate")
+    parser.add_argument("--time-to-first-token", type=float, default=0.2, help="Fake seconds before the first token")
+    parser.add_argument("--response-tokens", type=int, default=60, help="Tokens per fake answer")
+    parser.add_argument(
+        "--tool-pattern",
+        default="search_documents",
+        help='Tool rounds per turn, ";" between rounds and "," between parallel calls (default: search_documents)',
+    )
+    parser.add_argument("--tool-probability", type=float, default=0.5, help="Share of turns that follow the pattern")
+    parser.add_argument("--embed-latency", type=float, default=0.02, help="Fake seconds per embedding request")
+    parser.add_argument("--embed-dims", type=int, default=1024, help="Fake embedding dimensions")
+    parser.add_argument("--answer-cache", action="store_true", help="Enable the semantic answer cache")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the JSON result here instead of stdout")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    result = asyncio.run(run(args))
+    output = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+        console.print(f"Wrote {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
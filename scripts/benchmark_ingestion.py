@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""Offline ingestion benchmark.
+
+Generates a synthetic corpus and measures the ingestion stages without a
+live Ollama or Elasticsearch: embedding and bulk-index requests go to
+local HTTP stand-ins that simulate service latency (see
+src/benchmarks/stand_ins.py).
+
+Stages:
+    load      parse every file in the loader process pool
+    split     split the loaded documents into chunks
+    pipeline  the full streaming pipeline (load, split, embed, index)
+
+Each stage reports wall time, throughput and peak RSS (this process plus
+loader workers, excluding the stand-ins). Results are written as JSON so
+runs can be compared; --compare exits non-zero on a regression.
+
+Usage:
+    python scripts/benchmark_ingestion.py
+    python scripts/benchmark_ingestion.py --files 500 --mix "txt=4,md=4,pdf=1,docx=1"
+    python scripts/benchmark_ingestion.py --output baseline.json
+    python scripts/benchmark_ingestion.py --compare baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import psutil
+from elasticsearch import AsyncElasticsearch
+from langchain_ollama import OllamaEmbeddings
+from rich.console import Console
+from rich.table import Table
+
+from src.benchmarks.corpus import CorpusGenerator, parse_mix
+from src.benchmarks.report import result_header
+from src.benchmarks.stand_ins import StandInConfig, StandInProcess
+from src.config.config import Config
+from src.ingestion.batching import AdaptiveBatcher
+from src.ingestion.loaders import create_splitter, iter_chunks, load_file
+from src.ingestion.pipeline import IngestionPipeline
+from src.ingestion.sinks import ElasticsearchSink, LocalSink
+from src.utils.local_vector_store import LocalVectorStore
+
+console = Console(stderr=True)
+
+# Metrics checked by --compare: (path, higher_is_better)
+COMPARED_METRICS = [
+    ("stages.load.files_per_s", True),
+    ("stages.split.chunks_per_s", True),
+    ("stages.pipeline.docs_per_s", True),
+    ("stages.pipeline.chunks_per_s", True),
+    ("stages.load.peak_rss_mb", False),
+    ("stages.split.peak_rss_mb", False),
+    ("stages.pipeline.peak_rss_mb", False),
+]
+
+
+class RssSampler:
+    """Tracks peak resident memory of this process and its children."""
+
+    def __init__(self, exclude_pids: Optional[set] = None, interval: float = 0.02):
+        """Initialize the sampler.
+
+        Args:
+            exclude_pids: Child processes to ignore (the stand-ins)
+            interval: Seconds between samples
+        """
+        self.exclude_pids = exclude_pids or set()
+        self.interval = interval
+        self.peak = 0
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _rss(self) -> int:
+        total = self._process.memory_info().rss
+        for child in self._process.children(recursive=True):
+            if child.pid in self.exclude_pids:
+                continue
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "RssSampler":
+        self.peak = self._rss()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._rss())
+
+    @property
+    def peak_mb(self) -> float:
+        return round(self.peak / 2**20, 1)
+
+
+def bench_load(files: List[Path], workers: int, sampler: RssSampler) -> tuple:
+    """Parse all files in a process pool.
+
+    Returns:
+        Tuple of (documents, stage result)
+    """
+    start = time.perf_counter()
+    with sampler, ProcessPoolExecutor(max_workers=workers) as pool:
+        documents = [doc for docs in pool.map(load_file, map(str, files), chunksize=4) for doc in docs]
+    seconds = time.perf_counter() - start
+    total_bytes = sum(path.stat().st_size for path in files)
+    return documents, {
+        "seconds": round(seconds, 4),
+        "files": len(files),
+        "documents": len(documents),
+        "files_per_s": round(len(files) / seconds, 2),
+        "mb_per_s": round(total_bytes / 2**20 / seconds, 2),
+        "peak_rss_mb": sampler.peak_mb,
+    }
+
+
+def bench_split(documents: list, chunk_size: int, chunk_overlap: int, sampler: RssSampler) -> dict:
+    """Split loaded documents into chunks."""
+    splitter = create_splitter(chunk_size, chunk_overlap)
+    start = time.perf_counter()
+    with sampler:
+        chunks = sum(1 for _ in iter_chunks(documents, splitter))
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": round(seconds, 4),
+        "chunks": chunks,
+        "chunks_per_s": round(chunks / seconds, 2),
+        "peak_rss_mb": sampler.peak_mb,
+    }
+
+
+async def bench_pipeline(files: List[Path], stand_in: StandInProcess, args, sampler: RssSampler) -> dict:
+    """Run the full ingestion pipeline against the stand-ins."""
+    embeddings = OllamaEmbeddings(model=Config.OLLAMA_EMBEDDING_MODEL, base_url=stand_in.url)
+    client = None
+    local_dir = None
+    if args.backend == "local":
+        local_dir = tempfile.TemporaryDirectory(prefix="bench-index-")
+        sink = LocalSink(LocalVectorStore(Path(local_dir.name), embeddings))
+    else:
+        client = AsyncElasticsearch(stand_in.url)
+        sink = ElasticsearchSink(client, "benchmark")
+
+    batcher = AdaptiveBatcher(
+        args.batch_size,
+        args.embed_concurrency,
+        adaptive=not args.fixed_batching,
+        target_latency=Config.INGEST_TARGET_LATENCY,
+        max_batch_size=Config.INGEST_MAX_BATCH_SIZE,
+        max_concurrency=Config.INGEST_MAX_EMBED_CONCURRENCY,
+    )
+    pipeline = IngestionPipeline(
+        embeddings,
+        sink,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        load_workers=args.workers,
+        batcher=batcher,
+    )
+    try:
+        with sampler:
+            stats = await pipeline.run(files)
+    finally:
+        if client is not None:
+            await client.close()
+        if local_dir is not None:
+            local_dir.cleanup()
+
+    return {
+        "seconds": round(stats.elapsed, 4),
+        "files": stats.files,
+        "failed_files": stats.failed_files,
+        "chunks": stats.embedded_chunks,
+        "docs_per_s": round(stats.files / stats.elapsed, 2),
+        "chunks_per_s": round(stats.embedded_chunks / stats.elapsed, 2),
+        "peak_rss_mb": sampler.peak_mb,
+        "batching": {key: round(value, 4) if isinstance(value, float) else value for key, value in stats.batching.items()},
+        "stand_in": stand_in.stats(),
+    }
+
+
+def lookup(result: dict, path: str):
+    value = result
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Compare a run with a baseline and print the differences.
+
+    Args:
+        result: Current run
+        baseline: Earlier run
+        tolerance: Allowed relative change in the bad direction
+
+    Returns:
+        Descriptions of metrics that regressed beyond the tolerance
+    """
+    table = Table(title=f"Compared with {baseline.get('git_commit') or 'baseline'}")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Current", justify="right")
+    table.add_column("Change", justify="right")
+
+    regressions = []
+    for path, higher_is_better in COMPARED_METRICS:
+        old, new = lookup(baseline, path), lookup(result, path)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        worse = -change if higher_is_better else change
+        style = "red" if worse > tolerance else "green" if worse < -tolerance else "white"
+        table.add_row(path, f"{old:g}", f"{new:g}", f"[{style}]{change:+.1%}[/{style}]")
+        if worse > tolerance:
+            regressions.append(f"{path}: {old:g} -> {new:g} ({change:+.1%})")
+    console.print(table)
+    return regressions
+
+
+def print_result(result: dict) -> None:
+    """Print a human-readable summary of the stages."""
+    table = Table(title="Ingestion benchmark")
+    table.add_column("Stage", style="cyan")
+    table.add_column("Time", justify="right")
+    table.add_column("Throughput", justify="right")
+    table.add_column("Peak RSS", justify="right")
+    load, split, pipeline = (result["stages"][name] for name in ("load", "split", "pipeline"))
+    table.add_row("load", f"{load['seconds']:.2f}s", f"{load['files_per_s']:.1f} files/s", f"{load['peak_rss_mb']} MB")
+    table.add_row("split", f"{split['seconds']:.2f}s", f"{split['chunks_per_s']:.0f} chunks/s", f"{split['peak_rss_mb']} MB")
+    table.add_row(
+        "pipeline",
+        f"{pipeline['seconds']:.2f}s",
+        f"{pipeline['docs_per_s']:.1f} docs/s, {pipeline['chunks_per_s']:.0f} chunks/s",
+        f"{pipeline['peak_rss_mb']} MB",
+    )
+    console.print(table)
+    batching = pipeline["batching"]
+    console.print(
+        f"Operating point: batch {batching['batch_size']} x {batching['concurrency']} concurrent, "
+        f"p50 {batching['latency_p50']:.3f}s, p95 {batching['latency_p95']:.3f}s per request"
+    )
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark ingestion against local Ollama/Elasticsearch stand-ins")
+    parser.add_argument("--files", type=int, default=200, help="Files in the synthetic corpus (default: 200)")
+    parser.add_argument("--words-per-file", type=int, default=2000, help="Average words per file (default: 2000)")
+    parser.add_argument("--mix", default="txt=4,md=4,pdf=1,docx=1", help="Relative file type weights")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus random seed (default: 0)")
+    parser.add_argument("--corpus", type=Path, help="Reuse or keep the corpus in this directory")
+    parser.add_argument("--backend", choices=["elasticsearch", "local"], default="elasticsearch")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=Config.INGEST_BATCH_SIZE)
+    parser.add_argument("--embed-concurrency", type=int, default=Config.INGEST_EMBED_CONCURRENCY)
+    parser.add_argument("--fixed-batching", action="store_true", help="Disable adaptive batching")
+    parser.add_argument("--workers", type=int, default=Config.INGEST_LOAD_WORKERS or os.cpu_count() or 1)
+    parser.add_argument("--embed-dims", type=int, default=1024, help="Stand-in embedding dimensions")
+    parser.add_argument("--embed-latency", type=float, default=0.02, help="Stand-in seconds per embed request")
+    parser.add_argument("--embed-item-latency", type=float, default=0.002, help="Stand-in seconds per embedded text")
+    parser.add_argument("--embed-parallel", type=int, default=1, help="Embed requests the stand-in serves at once")
+    parser.add_argument("--bulk-latency", type=float, default=0.005, help="Stand-in seconds per bulk request")
+    parser.add_argument("--bulk-doc-latency", type=float, default=0.0001, help="Stand-in seconds per bulk document")
+    parser.add_argument("--output", type=Path, help="Write the JSON result here instead of stdout")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed regression for --compare (default: 0.1)")
+    args = parser.parse_args()
+
+    stand_in_config = StandInConfig(
+        embed_dims=args.embed_dims,
+        embed_base_latency=args.embed_latency,
+        embed_item_latency=args.embed_item_latency,
+        embed_parallel=args.embed_parallel,
+        bulk_base_latency=args.bulk_latency,
+        bulk_doc_latency=args.bulk_doc_latency,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="bench-corpus-") as tmp:
+        corpus_dir = args.corpus or Path(tmp)
+        start = time.perf_counter()
+        corpus = CorpusGenerator(args.seed).generate(corpus_dir, args.files, args.words_per_file, parse_mix(args.mix))
+        corpus["generation_seconds"] = round(time.perf_counter() - start, 4)
+        files = sorted(path for path in corpus_dir.iterdir() if path.is_file())
+        console.print(f"Generated {len(files)} files ({corpus['bytes'] / 2**20:.1f} MB) in {corpus_dir}")
+
+        with StandInProcess(stand_in_config) as stand_in:
+            exclude = {stand_in.pid}
+            documents, load = bench_load(files, args.workers, RssSampler(exclude))
+            split = bench_split(documents, args.chunk_size, args.chunk_overlap, RssSampler(exclude))
+            del documents
+            pipeline = asyncio.run(bench_pipeline(files, stand_in, args, RssSampler(exclude)))
+
+    result = {
+        **result_header("ingestion"),
+        "config": {
+            "backend": args.backend,
+            "chunk_size": args.chunk_size,
+            "chunk_overlap": args.chunk_overlap,
+            "batch_size": args.batch_size,
+            "embed_concurrency": args.embed_concurrency,
+            "adaptive_batching": not args.fixed_batching,
+            "workers": args.workers,
+            "stand_in": stand_in.describe(),
+        },
+        "corpus": corpus,
+        "stages": {"load": load, "split": split, "pipeline": pipeline},
+    }
+
+    print_result(result)
+    output = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+        console.print(f"Wrote {args.output}")
+    else:
+        print(output)
+
+    if args.compare:
+        regressions = compare(result, json.loads(args.compare.read_text(encoding="utf-8")), args.tolerance)
+        if regressions:
+            console.print("Regressions:", style="bold red")
+            for regression in regressions:
+                console.print(f"  - {regression}", style="red")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
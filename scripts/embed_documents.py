@@ -2,41 +2,38 @@
 """Document embedding script for Elasticsearch.
 
 This script reads documents from a directory and embeds them into Elasticsearch
-using Ollama embeddings.
+(or the local memory-mapped vector store) using Ollama embeddings.
 
 Usage:
     python scripts/embed_documents.py <directory_path>
     python scripts/embed_documents.py <directory_path> --recursive
     python scripts/embed_documents.py <directory_path> --pattern "*.md"
+    python scripts/embed_documents.py <directory_path> --backend local
+    python scripts/embed_documents.py <directory_path> --incremental
+    python scripts/embed_documents.py <directory_path> --resume
 """
 
+from __future__ import annotations
+
 import argparse
+import asyncio
 import sys
-import time
 from pathlib import Path
-from typing import List
-
-from langchain_community.document_loaders import (
-    TextLoader,
-    PyPDFLoader,
-    Docx2txtLoader,
-)
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_ollama import OllamaEmbeddings
-from langchain_elasticsearch import ElasticsearchStore
-from langchain_core.documents import Document
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn, TimeRemainingColumn
-from rich.table import Table
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
 
 from src.config.config import Config
-from src.utils.docker import ensure_elasticsearch_running
 
-console = Console()
+# rich, the loaders and the Elasticsearch/Ollama clients are imported after
+# argument parsing, so --help and argument errors return immediately
+if TYPE_CHECKING:
+    from langchain_ollama import OllamaEmbeddings
+    from rich.console import Console
+
+    from src.ingestion.pipeline import FileResult, PipelineStats
 
 
-def load_documents(directory: Path, pattern: str = "*.*", recursive: bool = False) -> List[Document]:
-    """Load documents from directory.
+def find_files(directory: Path, pattern: str = "*.*", recursive: bool = False) -> List[Path]:
+    """Find files to ingest.
 
     Args:
         directory: Directory containing documents
@@ -44,180 +41,52 @@ def load_documents(directory: Path, pattern: str = "*.*", recursive: bool = Fals
         recursive: Whether to search subdirectories
 
     Returns:
-        List of loaded documents
+        Sorted list of matching files
     """
-    documents = []
     glob_pattern = f"**/{pattern}" if recursive else pattern
+    return sorted(path for path in directory.glob(glob_pattern) if path.is_file())
 
-    for file_path in directory.glob(glob_pattern):
-        if not file_path.is_file():
-            continue
-
-        try:
-            # Determine loader based on file extension
-            suffix = file_path.suffix.lower()
-
-            if suffix == ".pdf":
-                loader = PyPDFLoader(str(file_path))
-            elif suffix in [".docx", ".doc"]:
-                loader = Docx2txtLoader(str(file_path))
-            elif suffix in [".md", ".markdown", ".txt", ".text", ".py", ".js", ".ts", ".java", ".go"]:
-                # Use TextLoader for text-based files
-                loader = TextLoader(str(file_path), encoding="utf-8")
-            else:
-                # Try as text file with error handling
-                try:
-                    loader = TextLoader(str(file_path), encoding="utf-8")
-                except UnicodeDecodeError:
-                    console.print(f"✗ Skipping binary file: {file_path.name}", style="yellow")
-                    continue
-
-            docs = loader.load()
-
-            # Add metadata
-            for doc in docs:
-                doc.metadata["source"] = str(file_path)
-                doc.metadata["filename"] = file_path.name
 
-            documents.extend(docs)
-            console.print(f"✓ Loaded: [cyan]{file_path.name}[/cyan]")
-
-        except Exception as e:
-            console.print(f"✗ Failed to load {file_path.name}: {e}", style="yellow")
-
-    return documents
-
-
-def split_documents(documents: List[Document], chunk_size: int = 1000, chunk_overlap: int = 200) -> List[Document]:
-    """Split documents into chunks.
+def create_sink(index_name: str, backend: str, embeddings: OllamaEmbeddings, console: Console):
+    """Create the destination for embedded chunks.
 
     Args:
-        documents: List of documents to split
-        chunk_size: Size of each chunk
-        chunk_overlap: Overlap between chunks
+        index_name: Elasticsearch index name (local store subdirectory)
+        backend: "elasticsearch" or "local"
+        embeddings: Embedding model (used by the local store for queries)
+        console: Console for progress output
 
     Returns:
-        List of document chunks
-    """
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        length_function=len,
-        separators=["\n\n", "\n", " ", ""]
-    )
-
-    return text_splitter.split_documents(documents)
-
-
-def embed_documents(
-    documents: List[Document],
-    index_name: str,
-    batch_size: int = 50
-) -> None:
-    """Embed documents into Elasticsearch.
-
-    Args:
-        documents: List of documents to embed
-        index_name: Elasticsearch index name
-        batch_size: Number of documents to process at once
+        Tuple of (sink, async client to close or None)
     """
-    # Initialize embeddings with dedicated embedding model
-    console.print("\n🔧 Initializing embedding model...", style="cyan")
-    start_init = time.time()
+    from src.ingestion.sinks import ElasticsearchSink, LocalSink
+    from src.utils.clients import create_local_vector_store, get_es_connection_params
 
-    embeddings = OllamaEmbeddings(
-        model=Config.OLLAMA_EMBEDDING_MODEL,
-        base_url=Config.OLLAMA_BASE_URL
-    )
+    if backend == "local":
+        store = create_local_vector_store(embeddings, index_name)
+        console.print(f"✓ Opened local vector store: {store.path}", style="green")
+        return LocalSink(store), None
 
-    init_time = time.time() - start_init
-    console.print(f"✓ Model initialized in {init_time:.2f}s", style="green")
+    from elasticsearch import AsyncElasticsearch
 
-    # Initialize Elasticsearch store
-    console.print("🔧 Connecting to Elasticsearch...", style="cyan")
-    vector_store = ElasticsearchStore(
-        es_url=Config.ELASTICSEARCH_URL,
-        index_name=index_name,
-        embedding=embeddings,
-    )
+    client = AsyncElasticsearch(**get_es_connection_params())
     console.print("✓ Connected to Elasticsearch", style="green")
+    return ElasticsearchSink(client, index_name), client
 
-    # Embed documents in batches
-    total_docs = len(documents)
-    total_batches = (total_docs + batch_size - 1) // batch_size
 
-    console.print(f"\n📝 Embedding {total_docs} document chunks in {total_batches} batches...")
-    console.print(f"   Batch size: {batch_size} documents")
-    console.print()
-
-    start_time = time.time()
-    successful_docs = 0
-    failed_batches = []
-
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-        TextColumn("({task.completed}/{task.total})"),
-        TimeElapsedColumn(),
-        TimeRemainingColumn(),
-        console=console,
-    ) as progress:
-        task = progress.add_task(
-            f"[cyan]Processing batches...",
-            total=total_docs
-        )
-
-        for batch_idx in range(0, total_docs, batch_size):
-            batch_num = (batch_idx // batch_size) + 1
-            batch = documents[batch_idx:batch_idx + batch_size]
-            batch_start = time.time()
-
-            try:
-                # Update progress description with current batch
-                progress.update(
-                    task,
-                    description=f"[cyan]Batch {batch_num}/{total_batches} ({len(batch)} docs)"
-                )
-
-                vector_store.add_documents(batch)
-
-                batch_time = time.time() - batch_start
-                successful_docs += len(batch)
-
-                # Calculate speed
-                docs_per_sec = len(batch) / batch_time if batch_time > 0 else 0
-
-                progress.update(task, advance=len(batch))
-
-                # Log batch completion
-                console.print(
-                    f"  ✓ Batch {batch_num}/{total_batches}: "
-                    f"{len(batch)} docs in {batch_time:.2f}s "
-                    f"({docs_per_sec:.1f} docs/s)",
-                    style="dim"
-                )
-
-            except Exception as e:
-                batch_time = time.time() - batch_start
-                failed_batches.append((batch_num, str(e)))
+def print_summary(console: Console, stats: PipelineStats, cache_stats: Optional[dict] = None) -> None:
+    """Print the embedding summary.
 
-                console.print(
-                    f"\n  ✗ Batch {batch_num}/{total_batches} failed after {batch_time:.2f}s: {e}",
-                    style="red"
-                )
-                console.print(f"     Batch range: {batch_idx} to {batch_idx + len(batch)}")
-
-                # Ask user if they want to continue
-                response = console.input("\n  Continue with next batch? [y/N]: ")
-                if response.lower() != 'y':
-                    raise
+    Args:
+        console: Console to print to
+        stats: Pipeline counters
+        cache_stats: Chunk-embedding cache counters, if the cache was used
+    """
+    from rich.table import Table
 
-    elapsed_time = time.time() - start_time
-    avg_speed = successful_docs / elapsed_time if elapsed_time > 0 else 0
+    to_embed = stats.chunks - stats.skipped_chunks
+    avg_speed = stats.embedded_chunks / stats.elapsed if stats.elapsed > 0 else 0
 
-    # Print summary
     console.print("\n" + "="*60, style="cyan")
     console.print("📊 Embedding Summary", style="bold cyan")
     console.print("="*60, style="cyan")
@@ -226,28 +95,257 @@ def embed_documents(
     table.add_column("Label", style="cyan")
     table.add_column("Value", style="white")
 
-    table.add_row("Total documents", str(total_docs))
-    table.add_row("Successfully embedded", f"{successful_docs} ({successful_docs/total_docs*100:.1f}%)")
-    table.add_row("Failed batches", str(len(failed_batches)))
-    table.add_row("Total time", f"{elapsed_time:.2f}s")
-    table.add_row("Average speed", f"{avg_speed:.2f} docs/s")
+    table.add_row("Files processed", f"{stats.files} ({stats.failed_files} failed)")
+    table.add_row("Total chunks", str(stats.chunks))
+    table.add_row("Unchanged chunks skipped", str(stats.skipped_chunks))
+    if to_embed:
+        table.add_row("Successfully embedded", f"{stats.embedded_chunks} ({stats.embedded_chunks/to_embed*100:.1f}%)")
+    if cache_stats is not None:
+        table.add_row("Embedding cache hits", f"{cache_stats['hits']} ({cache_stats['misses']} embedded by Ollama)")
+    table.add_row("Failed chunks", f"{stats.failed_chunks} in {len(stats.failed_batches)} batches")
+    table.add_row("Retried requests", str(stats.retries))
+    table.add_row("Total time", f"{stats.elapsed:.2f}s")
+    table.add_row("Average speed", f"{avg_speed:.2f} chunks/s")
+
+    batching = stats.batching
+    if batching.get("requests"):
+        mode = "adaptive" if batching["adaptive"] else "fixed"
+        table.add_row(
+            "Operating point",
+            f"batch {batching['batch_size']} x {batching['concurrency']} concurrent ({mode})",
+        )
+        if batching["adaptive"] and batching["best_throughput"]:
+            table.add_row(
+                "Best observed",
+                f"batch {batching['best_batch_size']} x {batching['best_concurrency']} "
+                f"at {batching['best_throughput']:.1f} chunks/s",
+            )
+        table.add_row(
+            "Request latency",
+            f"p50 {batching['latency_p50']:.2f}s, p95 {batching['latency_p95']:.2f}s "
+            f"({batching['requests']} requests, {batching['errors']} errors)",
+        )
 
     console.print(table)
 
-    if failed_batches:
+    if stats.failed_batches:
         console.print("\n⚠️  Failed batches:", style="yellow")
-        for batch_num, error in failed_batches:
-            console.print(f"  - Batch {batch_num}: {error}", style="yellow")
+        for error in stats.failed_batches:
+            console.print(f"  - {error}", style="yellow")
 
-    if successful_docs == total_docs:
+    if stats.embedded_chunks == to_embed and not stats.failed_files:
         console.print("\n✅ All documents embedded successfully!", style="bold green")
-    elif successful_docs > 0:
-        console.print(f"\n⚠️  Partial success: {successful_docs}/{total_docs} documents embedded", style="yellow")
-    else:
+    elif stats.embedded_chunks > 0:
+        console.print(f"\n⚠️  Partial success: {stats.embedded_chunks}/{to_embed} chunks embedded", style="yellow")
+    elif to_embed:
         console.print("\n❌ No documents were embedded", style="bold red")
         raise Exception("Embedding failed completely")
 
 
+async def ingest(args: argparse.Namespace, console: Console) -> None:
+    """Bring the index in line with the directory.
+
+    Args:
+        args: Parsed command-line arguments
+        console: Console for progress output
+    """
+    from langchain_ollama import OllamaEmbeddings
+    from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
+
+    from src.ingestion.batching import AdaptiveBatcher
+    from src.ingestion.embedding_store import ChunkEmbeddingStore
+    from src.ingestion.journal import IngestJournal
+    from src.ingestion.manifest import IngestManifest, file_sha256
+    from src.ingestion.pipeline import IngestionPipeline
+
+    # Compare the directory with the manifest of the last run
+    files = find_files(args.directory, args.pattern, args.recursive)
+    settings = {
+        "embedding_model": Config.OLLAMA_EMBEDDING_MODEL,
+        "chunk_size": args.chunk_size,
+        "chunk_overlap": args.chunk_overlap,
+    }
+    manifest_path = get_manifest_path(args.backend, args.index)
+    manifest = IngestManifest(manifest_path, settings=settings)
+    journal = IngestJournal(manifest_path.with_suffix(".journal.jsonl"), settings=settings)
+
+    # Progress of an interrupted run: files it finished go into the
+    # manifest, chunks it indexed are not embedded again
+    replaced_ids: List[str] = []
+    resumed_chunks: Dict[str, Set[str]] = {}
+    resumed_files: Set[str] = set()
+    if args.resume:
+        journal_state = journal.load()
+        for source, (chunk_ids, sha256) in journal_state.files.items():
+            if not Path(source).exists() or file_sha256(Path(source)) != sha256:
+                continue
+            record = manifest.get(source)
+            if record is not None:
+                replaced_ids.extend(set(record.chunk_ids) - set(chunk_ids))
+            manifest.record(source, chunk_ids, sha256=sha256)
+            resumed_files.add(source)
+        resumed_chunks = journal_state.chunks
+        if journal_state.files or journal_state.chunks:
+            console.print(
+                f"↻ Resuming: {len(resumed_files)} files and "
+                f"{sum(len(ids) for ids in resumed_chunks.values())} chunks already indexed"
+            )
+    elif journal.exists():
+        console.print("⚠️  A previous run did not finish; starting over (use --resume to continue it)", style="yellow")
+
+    plan = manifest.plan(files, args.directory, force=not args.incremental)
+    plan.unchanged.extend(path for path in plan.changed if str(path) in resumed_files)
+    plan.changed = [path for path in plan.changed if str(path) not in resumed_files]
+
+    if not files and not plan.deleted:
+        console.print("⚠️  No documents found", style="yellow")
+        return
+
+    console.print(
+        f"\n📋 {len(plan.changed)} new/changed, {len(plan.unchanged)} unchanged, "
+        f"{len(plan.deleted)} deleted files"
+    )
+    if manifest.settings_changed:
+        console.print("   Embedding or chunking settings changed; re-indexing all files", style="yellow")
+    if not plan.changed and not plan.deleted and not replaced_ids:
+        manifest.save()
+        journal.discard()
+        console.print("\n✅ Index is up to date", style="bold green")
+        return
+
+    embeddings = OllamaEmbeddings(
+        model=Config.OLLAMA_EMBEDDING_MODEL,
+        base_url=Config.OLLAMA_BASE_URL
+    )
+    sink, client = create_sink(args.index, args.backend, embeddings, console)
+    chunk_embeddings = embeddings
+    if Config.INGEST_EMBEDDING_CACHE_ENABLED and not args.no_embedding_cache:
+        # Chunk texts seen in any earlier run are not sent to Ollama again
+        chunk_embeddings = ChunkEmbeddingStore(
+            embeddings, Config.INGEST_EMBEDDING_CACHE_PATH, Config.OLLAMA_EMBEDDING_MODEL
+        )
+    try:
+        # Remove chunks of files that no longer exist
+        stale_ids = [chunk_id for source in plan.deleted for chunk_id in manifest.get(source).chunk_ids]
+        if stale_ids:
+            await sink.delete(stale_ids)
+            console.print(f"✓ Removed {len(stale_ids)} chunks of {len(plan.deleted)} deleted files")
+        for source in plan.deleted:
+            manifest.remove(source)
+        manifest.save()
+
+        # Chunks whose ID is already indexed have identical content
+        indexed_ids: Dict[str, Set[str]] = {}
+        for file_path in plan.changed:
+            source = str(file_path)
+            known = set(resumed_chunks.get(source, ()))
+            record = manifest.get(source)
+            if args.incremental and not manifest.settings_changed and record is not None:
+                known.update(record.chunk_ids)
+            if known:
+                indexed_ids[source] = known
+
+        def on_batch_done(chunks) -> None:
+            chunk_ids_by_source: Dict[str, List[str]] = {}
+            for chunk in chunks:
+                chunk_ids_by_source.setdefault(chunk.metadata["source"], []).append(chunk.id)
+            journal.record_chunks(chunk_ids_by_source)
+
+        def on_file_done(result: FileResult) -> None:
+            progress.update(task, advance=1)
+            if not result.ok:
+                console.print(f"✗ {Path(result.source).name}: {result.error}", style="yellow")
+                return
+            # Replace old chunks once all new chunks of the file are indexed
+            record = manifest.get(result.source)
+            if record is not None:
+                replaced_ids.extend(set(record.chunk_ids) - set(result.chunk_ids))
+            sha256 = plan.hashes.get(result.source) or file_sha256(Path(result.source))
+            manifest.record(result.source, result.chunk_ids, sha256=sha256)
+            journal.record_file(result.source, result.chunk_ids, sha256)
+
+        batcher = AdaptiveBatcher(
+            args.batch_size,
+            args.embed_concurrency,
+            adaptive=Config.INGEST_ADAPTIVE_BATCHING and not args.fixed_batching,
+            target_latency=Config.INGEST_TARGET_LATENCY,
+            max_batch_size=Config.INGEST_MAX_BATCH_SIZE,
+            max_concurrency=Config.INGEST_MAX_EMBED_CONCURRENCY,
+        )
+        pipeline = IngestionPipeline(
+            chunk_embeddings,
+            sink,
+            chunk_size=args.chunk_size,
+            chunk_overlap=args.chunk_overlap,
+            load_workers=args.workers,
+            max_retries=Config.INGEST_MAX_RETRIES,
+            retry_backoff=Config.INGEST_RETRY_BACKOFF,
+            batcher=batcher,
+        )
+
+        console.print(f"\n📝 Embedding {len(plan.changed)} files...")
+        if batcher.adaptive:
+            console.print(
+                f"   Batch size: adaptive from {batcher.batch_size} chunks, {batcher.concurrency} concurrent batches "
+                f"(target {batcher.target_latency:.1f}s per request)"
+            )
+        else:
+            console.print(f"   Batch size: {args.batch_size} chunks, {args.embed_concurrency} concurrent batches")
+        console.print()
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+            TextColumn("({task.completed}/{task.total})"),
+            TimeElapsedColumn(),
+            TimeRemainingColumn(),
+            console=console,
+        ) as progress:
+            task = progress.add_task("[cyan]Embedding files...", total=len(plan.changed))
+            journal.open(resume=args.resume)
+            stats = await pipeline.run(
+                plan.changed,
+                indexed_ids=indexed_ids,
+                on_file_done=on_file_done,
+                on_batch_done=on_batch_done,
+            )
+
+        if replaced_ids:
+            await sink.delete(replaced_ids)
+        manifest.save()
+        if stats.failed_files:
+            # Keep the journal so --resume retries only what is missing
+            console.print("\n↻ Re-run with --resume to retry the failed files", style="yellow")
+        else:
+            journal.discard()
+    except BaseException:
+        if journal.exists():
+            console.print("\n↻ Progress was saved; re-run with --resume to continue", style="yellow")
+        raise
+    finally:
+        journal.close()
+        if client is not None:
+            await client.close()
+
+    cache_stats = chunk_embeddings.stats() if isinstance(chunk_embeddings, ChunkEmbeddingStore) else None
+    print_summary(console, stats, cache_stats)
+
+
+def get_manifest_path(backend: str, index_name: str) -> Path:
+    """Get the manifest file for an index.
+
+    Args:
+        backend: "elasticsearch" or "local"
+        index_name: Index name
+
+    Returns:
+        Path under ``INGEST_MANIFEST_DIR``
+    """
+    return Path(Config.INGEST_MANIFEST_DIR) / f"{backend}-{index_name}.json"
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -274,6 +372,27 @@ def main():
         default=Config.ELASTICSEARCH_INDEX,
         help=f"Elasticsearch index name (default: {Config.ELASTICSEARCH_INDEX})"
     )
+    parser.add_argument(
+        "--backend",
+        choices=["elasticsearch", "local"],
+        default=Config.VECTOR_BACKEND,
+        help=f"Vector store backend (default: {Config.VECTOR_BACKEND})"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only embed new or changed files and remove chunks of deleted files"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run, skipping files and chunks it already indexed"
+    )
+    parser.add_argument(
+        "--no-embedding-cache",
+        action="store_true",
+        help="Embed every chunk with Ollama instead of reusing cached vectors"
+    )
     parser.add_argument(
         "--chunk-size",
         type=int,
@@ -289,12 +408,33 @@ def main():
     parser.add_argument(
         "--batch-size",
         type=int,
-        default=50,
-        help="Batch size for embedding (default: 50)"
+        default=Config.INGEST_BATCH_SIZE,
+        help=f"Batch size for embedding; the starting point when adaptive (default: {Config.INGEST_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--embed-concurrency",
+        type=int,
+        default=Config.INGEST_EMBED_CONCURRENCY,
+        help=f"Embedding batches in flight at once; the starting point when adaptive (default: {Config.INGEST_EMBED_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--fixed-batching",
+        action="store_true",
+        help="Keep --batch-size and --embed-concurrency instead of tuning them"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=Config.INGEST_LOAD_WORKERS or None,
+        help="Processes for loading and parsing files (default: CPU count)"
     )
 
     args = parser.parse_args()
 
+    from rich.console import Console
+
+    console = Console()
+
     # Validate directory
     if not args.directory.exists():
         console.print(f"❌ Directory not found: {args.directory}", style="bold red")
@@ -309,7 +449,10 @@ def main():
     console.print(f"  Directory: {args.directory}")
     console.print(f"  Pattern: {args.pattern}")
     console.print(f"  Recursive: {args.recursive}")
+    console.print(f"  Backend: {args.backend}")
     console.print(f"  Index: {args.index}")
+    console.print(f"  Incremental: {args.incremental}")
+    console.print(f"  Resume: {args.resume}")
     console.print(f"  Chunk Size: {args.chunk_size}")
     console.print(f"  Chunk Overlap: {args.chunk_overlap}")
     console.print(f"  Ollama Embedding Model: {Config.OLLAMA_EMBEDDING_MODEL}")
@@ -317,32 +460,15 @@ def main():
 
     try:
         # Ensure Elasticsearch is running
-        console.print("🐳 Checking Elasticsearch...")
-        if not ensure_elasticsearch_running():
-            console.print("❌ Failed to start Elasticsearch", style="bold red")
-            sys.exit(1)
+        if args.backend == "elasticsearch":
+            from src.utils.docker import ensure_elasticsearch_running
 
-        # Load documents
-        console.print("\n📂 Loading documents...")
-        documents = load_documents(args.directory, args.pattern, args.recursive)
-
-        if not documents:
-            console.print("⚠️  No documents found", style="yellow")
-            sys.exit(0)
-
-        console.print(f"\n✓ Loaded {len(documents)} documents")
-
-        # Split documents
-        console.print("\n✂️  Splitting documents into chunks...")
-        chunks = split_documents(
-            documents,
-            chunk_size=args.chunk_size,
-            chunk_overlap=args.chunk_overlap
-        )
-        console.print(f"✓ Created {len(chunks)} chunks")
+            console.print("🐳 Checking Elasticsearch...")
+            if not ensure_elasticsearch_running():
+                console.print("❌ Failed to start Elasticsearch", style="bold red")
+                sys.exit(1)
 
-        # Embed documents
-        embed_documents(chunks, args.index, args.batch_size)
+        asyncio.run(ingest(args, console))
 
         console.print("\n🎉 Done!", style="bold green")
 
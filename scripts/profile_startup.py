@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""Startup profiler.
+
+Runs the graph startup in a fresh interpreter with ``-X importtime`` and
+reports, per startup step, the wall time and the import time broken down
+by module (project modules individually, third-party modules grouped by
+package). It also times CLI ``--help`` invocations.
+
+Usage:
+    python scripts/profile_startup.py
+    python scripts/profile_startup.py --backend local --top 20
+    python scripts/profile_startup.py --skip-init --json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+_STEP_MARKER = "## startup-step "
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+DEFAULT_COMMANDS = ["scripts/embed_documents.py --help"]
+
+
+def run_steps(skip_init: bool) -> List[dict]:
+    """Run the startup steps in this process (child side).
+
+    Each step is announced on stderr, so the parent can attribute the
+    ``-X importtime`` lines that follow to it.
+
+    Args:
+        skip_init: Only import the graph module
+
+    Returns:
+        Step results with wall time and error, if any
+    """
+    import asyncio
+
+    def import_graph():
+        import src.graph  # noqa: F401
+
+    def resolve_config():
+        from src.config.config import Config
+
+        Config.resolve()
+
+    def create_graph():
+        from src.graph import create_chatbot_graph
+
+        asyncio.run(create_chatbot_graph())
+
+    steps = [("import src.graph", import_graph)]
+    if not skip_init:
+        steps += [("resolve config", resolve_config), ("create graph", create_graph)]
+
+    results = []
+    for name, step in steps:
+        print(f"{_STEP_MARKER}{name}", file=sys.stderr, flush=True)
+        start = time.perf_counter()
+        error = None
+        try:
+            step()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        results.append({"step": name, "seconds": round(time.perf_counter() - start, 4), "error": error})
+    return results
+
+
+def _group(module: str) -> str:
+    """Project modules are reported individually, others by package."""
+    return module if module.startswith("src.") or module == "src" else module.split(".")[0]
+
+
+def parse_importtime(stderr: str) -> Dict[str, dict]:
+    """Attribute ``-X importtime`` output to startup steps.
+
+    Args:
+        stderr: Child stderr with step markers and import-time lines
+
+    Returns:
+        Mapping of step name to its import time (seconds), module count
+        and self time per module group
+    """
+    steps: Dict[str, dict] = {}
+    current = None
+    for line in stderr.splitlines():
+        if line.startswith(_STEP_MARKER):
+            current = line[len(_STEP_MARKER):]
+            steps[current] = {"import_seconds": 0.0, "modules": 0, "by_module": defaultdict(float)}
+            continue
+        match = _IMPORT_LINE.match(line)
+        if current is None or match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        step = steps[current]
+        step["modules"] += 1
+        step["by_module"][_group(module)] += int(self_us) / 1e6
+        # Top-level imports (one space of indent) sum to the step's import time
+        if len(indent) <= 1:
+            step["import_seconds"] += int(cumulative_us) / 1e6
+    return steps
+
+
+def profile_startup(backend: str, skip_init: bool) -> List[dict]:
+    """Profile the startup steps in a fresh interpreter.
+
+    Args:
+        backend: VECTOR_BACKEND for the child, or None for the configured one
+        skip_init: Only import the graph module
+
+    Returns:
+        Step results with wall time, import time and per-module breakdown
+    """
+    env = dict(os.environ)
+    if backend:
+        env["VECTOR_BACKEND"] = backend
+    command = [sys.executable, "-X", "importtime", __file__, "--child"]
+    if skip_init:
+        command.append("--skip-init")
+    completed = subprocess.run(command, cwd=project_root, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Startup child failed:\n{completed.stderr[-2000:]}")
+
+    imports = parse_importtime(completed.stderr)
+    results = json.loads(completed.stdout.strip().splitlines()[-1])
+    for result in results:
+        step_imports = imports.get(result["step"], {})
+        result["import_seconds"] = round(step_imports.get("import_seconds", 0.0), 4)
+        result["modules"] = step_imports.get("modules", 0)
+        result["by_module"] = {
+            module: round(seconds, 4)
+            for module, seconds in sorted(step_imports.get("by_module", {}).items(), key=lambda item: -item[1])
+        }
+    return results
+
+
+def time_command(command: str, repeats: int) -> dict:
+    """Time a CLI command, e.g. ``--help``.
+
+    Args:
+        command: Script path and arguments, relative to the project root
+        repeats: Number of runs
+
+    Returns:
+        Median and minimum wall time in seconds
+    """
+    # Scripts import ``src`` as installed with ``pip install -e .``; the path
+    # makes them runnable from a plain checkout as well
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(project_root), os.getenv("PYTHONPATH")]))}
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *command.split()],
+            cwd=project_root,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        times.append(time.perf_counter() - start)
+    return {"command": command, "median": round(statistics.median(times), 4), "min": round(min(times), 4)}
+
+
+def print_report(steps: List[dict], commands: List[dict], top: int) -> None:
+    """Print the startup report."""
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    summary = Table(title="Startup steps")
+    summary.add_column("Step", style="cyan")
+    summary.add_column("Wall (ms)", justify="right")
+    summary.add_column("Imports (ms)", justify="right")
+    summary.add_column("Init (ms)", justify="right")
+    summary.add_column("Modules", justify="right")
+    for step in steps:
+        summary.add_row(
+            step["step"],
+            f"{step['seconds'] * 1000:.0f}",
+            f"{step['import_seconds'] * 1000:.0f}",
+            f"{max(0.0, step['seconds'] - step['import_seconds']) * 1000:.0f}",
+            str(step["modules"]),
+        )
+    console.print(summary)
+    for step in steps:
+        if step["error"]:
+            console.print(f"  {step['step']} failed: {step['error']}", style="yellow")
+
+    for step in steps:
+        if not step["by_module"]:
+            continue
+        table = Table(title=f"Import time by module: {step['step']}")
+        table.add_column("Module", style="cyan")
+        table.add_column("Self (ms)", justify="right")
+        for module, seconds in list(step["by_module"].items())[:top]:
+            table.add_row(module, f"{seconds * 1000:.1f}")
+        console.print(table)
+
+    if commands:
+        table = Table(title="CLI commands")
+        table.add_column("Command", style="cyan")
+        table.add_column("Median (ms)", justify="right")
+        table.add_column("Min (ms)", justify="right")
+        for command in commands:
+            table.add_row(command["command"], f"{command['median'] * 1000:.0f}", f"{command['min'] * 1000:.0f}")
+        console.print(table)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Report import and initialization cost of startup")
+    parser.add_argument("--backend", choices=["elasticsearch", "local"], help="Vector backend for the profiled run")
+    parser.add_argument("--skip-init", action="store_true", help="Only profile importing the graph module")
+    parser.add_argument("--top", type=int, default=15, help="Modules listed per step (default: 15)")
+    parser.add_argument(
+        "--command",
+        action="append",
+        dest="commands",
+        help='CLI command to time, repeatable (default: "scripts/embed_documents.py --help")',
+    )
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per CLI command (default: 3)")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_steps(args.skip_init)))
+        return
+
+    steps = profile_startup(args.backend, args.skip_init)
+    commands = [time_command(command, args.repeats) for command in (args.commands or DEFAULT_COMMANDS)]
+    if args.json:
+        print(json.dumps({"steps": steps, "commands": commands}, indent=2))
+    else:
+        print_report(steps, commands, args.top)
+
+
+if __name__ == "__main__":
+    main()
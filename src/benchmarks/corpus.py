@@ -0,0 +1,204 @@
+"""Synthetic document corpora for benchmarks.
+
+Files are generated from a seeded random vocabulary, so a given
+(seed, size, mix) always produces the same corpus and runs are
+comparable. PDFs are written directly (single-font text pages) and DOCX
+files with python-docx, so no extra dependencies are needed.
+"""
+
+import random
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from docx import Document as DocxDocument
+
+DEFAULT_MIX = {"txt": 0.4, "md": 0.4, "pdf": 0.1, "docx": 0.1}
+
+_LINES_PER_PDF_PAGE = 60
+_PDF_LINE_WIDTH = 90
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse a file mix like ``"txt=4,md=4,pdf=1,docx=1"``.
+
+    Args:
+        spec: Comma-separated type=weight pairs
+
+    Returns:
+        Mapping of file type to weight
+
+    Raises:
+        ValueError: If a type is unknown or a weight is not a number
+    """
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip().lower()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown file type in mix: {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class CorpusGenerator:
+    """Writes a reproducible corpus of text, Markdown, PDF and DOCX files."""
+
+    def __init__(self, seed: int = 0, vocabulary_size: int = 5000):
+        """Initialize the generator.
+
+        Args:
+            seed: Random seed
+            vocabulary_size: Number of distinct words
+        """
+        self.random = random.Random(seed)
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        self.vocabulary = [
+            "".join(self.random.choice(letters) for _ in range(self.random.randint(2, 10)))
+            for _ in range(vocabulary_size)
+        ]
+
+    def _sentence(self) -> str:
+        words = self.random.choices(self.vocabulary, k=self.random.randint(6, 18))
+        return " ".join(words).capitalize() + "."
+
+    def _paragraphs(self, words: int) -> List[str]:
+        paragraphs = []
+        remaining = words
+        while remaining > 0:
+            sentences = [self._sentence() for _ in range(self.random.randint(3, 7))]
+            paragraph = " ".join(sentences)
+            paragraphs.append(paragraph)
+            remaining -= paragraph.count(" ") + 1
+        return paragraphs
+
+    def passages(self, count: int, words: int = 150) -> List[str]:
+        """Generate standalone passages, e.g. for an in-memory index.
+
+        Args:
+            count: Number of passages
+            words: Approximate words per passage
+
+        Returns:
+            Passage texts
+        """
+        return [" ".join(self._paragraphs(words))[: words * 12] for _ in range(count)]
+
+    def question(self) -> str:
+        """Generate a document question from the corpus vocabulary.
+
+        Returns:
+            Question text
+        """
+        topic = " ".join(self.random.choices(self.vocabulary, k=3))
+        return f"What do the documents say about {topic}?"
+
+    def generate(
+        self,
+        directory: Path,
+        files: int,
+        words_per_file: int = 2000,
+        mix: Optional[Dict[str, float]] = None,
+    ) -> dict:
+        """Write a corpus.
+
+        Args:
+            directory: Output directory (created if missing)
+            files: Number of files
+            words_per_file: Average words per file (varies by +-50%)
+            mix: Relative weight of each file type
+
+        Returns:
+            Corpus description with file counts per type and total bytes
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        mix = mix or DEFAULT_MIX
+        types = list(mix)
+        by_type: Counter = Counter()
+        total_bytes = 0
+
+        for number in range(files):
+            file_type = self.random.choices(types, weights=[mix[t] for t in types])[0]
+            words = max(50, int(words_per_file * self.random.uniform(0.5, 1.5)))
+            path = directory / f"doc_{number:05d}.{file_type}"
+            paragraphs = self._paragraphs(words)
+            getattr(self, f"_write_{file_type}")(path, paragraphs)
+            by_type[file_type] += 1
+            total_bytes += path.stat().st_size
+
+        return {
+            "files": files,
+            "by_type": dict(sorted(by_type.items())),
+            "bytes": total_bytes,
+            "words_per_file": words_per_file,
+        }
+
+    def _write_txt(self, path: Path, paragraphs: List[str]) -> None:
+        path.write_text("\n\n".join(paragraphs) + "\n", encoding="utf-8")
+
+    def _write_md(self, path: Path, paragraphs: List[str]) -> None:
+        lines = [f"# {self._sentence()[:-1]}", ""]
+        for index, paragraph in enumerate(paragraphs):
+            if index and index % 4 == 0:
+                lines += [f"## {self._sentence()[:-1]}", ""]
+            lines += [paragraph, ""]
+        path.write_text("\n".join(lines), encoding="utf-8")
+
+    def _write_docx(self, path: Path, paragraphs: List[str]) -> None:
+        document = DocxDocument()
+        document.add_heading(self._sentence()[:-1], level=1)
+        for paragraph in paragraphs:
+            document.add_paragraph(paragraph)
+        document.save(str(path))
+
+    def _write_pdf(self, path: Path, paragraphs: List[str]) -> None:
+        lines: List[str] = []
+        for paragraph in paragraphs:
+            line = ""
+            for word in paragraph.split():
+                if len(line) + len(word) + 1 > _PDF_LINE_WIDTH:
+                    lines.append(line)
+                    line = word
+                else:
+                    line = f"{line} {word}" if line else word
+            lines += [line, ""]
+        pages = [lines[i:i + _LINES_PER_PDF_PAGE] for i in range(0, len(lines), _LINES_PER_PDF_PAGE)]
+        path.write_bytes(_render_pdf(pages))
+
+
+def _render_pdf(pages: List[List[str]]) -> bytes:
+    """Render pages of plain ASCII lines as a minimal PDF."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    for lines in pages:
+        text = "".join(
+            "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") Tj T* "
+            for line in lines
+        )
+        stream = f"BT /F1 10 Tf 12 TL 50 800 Td {text}ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_refs)} >>".encode("latin-1")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(output)
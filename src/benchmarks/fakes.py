@@ -0,0 +1,233 @@
+"""In-process fake models for graph benchmarks.
+
+:class:`FakeChatModel` streams tokens at a configurable rate and follows
+a scripted tool-call pattern, and :class:`FakeEmbeddings` returns
+deterministic vectors after a configurable delay. Both plug into
+``create_chatbot_graph`` in place of the Ollama models, so a benchmark
+measures the real graph, nodes and tools with generation and embedding
+cost under its control.
+"""
+
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from typing import Any, List, Optional, Sequence
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk, BaseMessage, message_chunk_to_message
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from src.benchmarks.stand_ins import fake_embedding
+
+_ANSWER_WORDS = (
+    "the documents describe this in detail and the relevant passage explains "
+    "how the system handles the request along with the expected result"
+).split()
+
+
+def parse_tool_pattern(spec: str) -> List[List[str]]:
+    """Parse a tool-call pattern like ``"search_documents;calculate,get_weather"``.
+
+    Rounds are separated by ``;`` and parallel calls within a round by
+    ``,``. The example calls search_documents, then calculate and
+    get_weather together, then answers.
+
+    Args:
+        spec: Pattern string; empty means the model always answers directly
+
+    Returns:
+        List of rounds, each a list of tool names
+    """
+    return [
+        [name.strip() for name in round_spec.split(",") if name.strip()]
+        for round_spec in spec.split(";")
+        if round_spec.strip()
+    ]
+
+
+def _estimate_tokens(messages: Sequence[BaseMessage]) -> int:
+    return sum(len(str(message.content)) for message in messages) // 4
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that simulates Ollama timing and tool calls.
+
+    Every user turn follows ``tool_pattern``: the n-th model call of a turn
+    issues the tool calls of round n, and the call after the last round
+    streams an answer. With ``tool_probability`` < 1 some turns skip the
+    tools (decided per user message, so runs are reproducible).
+    """
+
+    tokens_per_second: float = 50.0
+    time_to_first_token: float = 0.2
+    prompt_tokens_per_second: float = 2000.0
+    response_tokens: int = 60
+    tool_pattern: List[List[str]] = []
+    tool_probability: float = 1.0
+    seed: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-benchmark-chat"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _plan(self, messages: Sequence[BaseMessage]) -> List[dict]:
+        """Decide the tool calls for this model call."""
+        last_human = None
+        rounds_done = 0
+        for message in messages:
+            if message.type == "human":
+                last_human = message
+                rounds_done = 0
+            elif message.type == "ai" and getattr(message, "tool_calls", None):
+                rounds_done += 1
+        if last_human is None or rounds_done >= len(self.tool_pattern):
+            return []
+        query = str(last_human.content)
+        if random.Random(f"{self.seed}:{query}").random() >= self.tool_probability:
+            return []
+        return [
+            {"name": name, "args": self._tool_args(name, query), "id": f"call_{uuid.uuid4().hex[:12]}"}
+            for name in self.tool_pattern[rounds_done]
+        ]
+
+    @staticmethod
+    def _tool_args(name: str, query: str) -> dict:
+        if name == "search_documents":
+            return {"query": query}
+        if name == "calculate":
+            numbers = re.findall(r"\d+", query)
+            return {"expression": " * ".join(numbers[:2]) if len(numbers) >= 2 else "(17 * 23) + 4"}
+        if name == "get_weather":
+            return {"location": "Seoul"}
+        return {}
+
+    def _metadata(self, prompt_tokens: int, eval_tokens: int, seconds: float) -> dict:
+        # Same keys (and nanosecond units) as Ollama responses
+        return {
+            "model": "fake",
+            "prompt_eval_count": prompt_tokens,
+            "eval_count": eval_tokens,
+            "load_duration": 0,
+            "total_duration": int(seconds * 1e9),
+        }
+
+    def _schedule(self, messages: Sequence[BaseMessage]):
+        """Yield (delay, chunk, prompt tokens, eval tokens) for one response."""
+        prompt_tokens = _estimate_tokens(messages)
+        first_delay = self.time_to_first_token + prompt_tokens / self.prompt_tokens_per_second
+        calls = self._plan(messages)
+        if calls:
+            chunks = [
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+                for index, call in enumerate(calls)
+            ]
+            yield first_delay, AIMessageChunk(content="", tool_call_chunks=chunks), prompt_tokens, len(calls) * 10
+            return
+        for index in range(self.response_tokens):
+            delay = first_delay if index == 0 else 1 / self.tokens_per_second
+            word = _ANSWER_WORDS[index % len(_ANSWER_WORDS)]
+            yield delay, AIMessageChunk(content=word + " "), prompt_tokens, self.response_tokens
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ):
+        start = time.perf_counter()
+        due = start
+        prompt_tokens = eval_tokens = 0
+        for delay, message, prompt_tokens, eval_tokens in self._schedule(messages):
+            # Sleep to an absolute deadline so per-token delays do not drift
+            due += delay
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            chunk = ChatGenerationChunk(message=message)
+            if run_manager is not None and message.content:
+                await run_manager.on_llm_new_token(str(message.content), chunk=chunk)
+            yield chunk
+        metadata = self._metadata(prompt_tokens, eval_tokens, time.perf_counter() - start)
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", response_metadata=metadata))
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ):
+        start = time.perf_counter()
+        due = start
+        prompt_tokens = eval_tokens = 0
+        for delay, message, prompt_tokens, eval_tokens in self._schedule(messages):
+            due += delay
+            time.sleep(max(0.0, due - time.perf_counter()))
+            chunk = ChatGenerationChunk(message=message)
+            if run_manager is not None and message.content:
+                run_manager.on_llm_new_token(str(message.content), chunk=chunk)
+            yield chunk
+        metadata = self._metadata(prompt_tokens, eval_tokens, time.perf_counter() - start)
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", response_metadata=metadata))
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        merged = None
+        async for chunk in self._astream(messages, stop, run_manager, **kwargs):
+            merged = chunk if merged is None else merged + chunk
+        return ChatResult(generations=[ChatGeneration(message=message_chunk_to_message(merged.message))])
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        merged = None
+        for chunk in self._stream(messages, stop, run_manager, **kwargs):
+            merged = chunk if merged is None else merged + chunk
+        return ChatResult(generations=[ChatGeneration(message=message_chunk_to_message(merged.message))])
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic embeddings with simulated request latency."""
+
+    def __init__(self, dims: int = 1024, latency: float = 0.02, item_latency: float = 0.0):
+        """Initialize the embeddings.
+
+        Args:
+            dims: Vector dimensions
+            latency: Seconds per request
+            item_latency: Additional seconds per embedded text
+        """
+        self.dims = dims
+        self.latency = latency
+        self.item_latency = item_latency
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency + self.item_latency * len(texts))
+        return [fake_embedding(text, self.dims) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.latency + self.item_latency * len(texts))
+        return [fake_embedding(text, self.dims) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
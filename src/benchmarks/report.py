@@ -0,0 +1,72 @@
+"""Shared helpers for benchmark results."""
+
+import math
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+_PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+def git_commit() -> Optional[str]:
+    """Get the current commit, if run inside the repository.
+
+    Returns:
+        Short commit hash, or None
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=_PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return None
+    return result.stdout.strip() or None
+
+
+def result_header(benchmark: str) -> dict:
+    """Build the common fields of a benchmark result.
+
+    Args:
+        benchmark: Benchmark name
+
+    Returns:
+        Dictionary with name, timestamp, commit and environment
+    """
+    return {
+        "benchmark": benchmark,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+    }
+
+
+def percentiles(values: Sequence[float], points: Sequence[int] = (50, 95, 99)) -> Dict[str, float]:
+    """Summarize latencies with nearest-rank percentiles.
+
+    Args:
+        values: Samples in seconds
+        points: Percentiles to report
+
+    Returns:
+        Dictionary with ``count``, ``mean`` and ``p<N>`` entries (seconds)
+    """
+    ordered = sorted(values)
+    summary = {"count": len(ordered)}
+    if not ordered:
+        return summary
+    summary["mean"] = round(sum(ordered) / len(ordered), 6)
+    for point in points:
+        rank = max(1, math.ceil(point / 100 * len(ordered)))
+        summary[f"p{point}"] = round(ordered[rank - 1], 6)
+    return summary
@@ -0,0 +1,263 @@
+"""Local HTTP stand-ins for Ollama and Elasticsearch.
+
+Benchmarks should exercise the real client libraries (request encoding,
+JSON (de)serialization of large vectors, the bulk helper) without needing
+a live Ollama or a Docker Elasticsearch. :class:`StandInServer` answers
+the subset of both APIs the ingestion path uses on a single port, and
+simulates service time with configurable latencies:
+
+* ``POST /api/embed`` - deterministic unit vectors per input text; takes
+  ``embed_base_latency + embed_item_latency * len(input)`` and at most
+  ``embed_parallel`` requests are served at once (like a single GPU)
+* ``HEAD|PUT /<index>``, ``PUT /_bulk``, ``POST /<index>/_refresh`` -
+  an in-memory index; bulk requests take
+  ``bulk_base_latency + bulk_doc_latency * docs``
+* ``GET /_stats/stand_in`` - request counters, for reports
+
+Run it in a separate process with :class:`StandInProcess` so the
+simulated services do not compete with the code under test for the GIL.
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from urllib.request import urlopen
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StandInConfig:
+    """Simulated service characteristics."""
+
+    embed_dims: int = 1024
+    embed_base_latency: float = 0.02
+    embed_item_latency: float = 0.002
+    embed_parallel: int = 1
+    bulk_base_latency: float = 0.005
+    bulk_doc_latency: float = 0.0001
+
+
+def fake_embedding(text: str, dims: int) -> list:
+    """Deterministic unit vector for a text.
+
+    Args:
+        text: Input text
+        dims: Vector dimensions
+
+    Returns:
+        List of floats
+    """
+    seed = int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dims).astype(np.float32)
+    vector /= np.linalg.norm(vector)
+    return vector.tolist()
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the stand-in state."""
+
+    daemon_threads = True
+
+    def __init__(self, config: StandInConfig, host: str = "127.0.0.1", port: int = 0):
+        """Bind the server.
+
+        Args:
+            config: Simulated latencies
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+        """
+        super().__init__((host, port), _Handler)
+        self.config = config
+        self.embed_slots = threading.BoundedSemaphore(max(1, config.embed_parallel))
+        self.lock = threading.Lock()
+        self.indices: Dict[str, Dict[str, dict]] = {}
+        self.counters: Dict[str, int] = {}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StandInServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        logger.debug(format, *args)
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status: int, payload: Optional[dict] = None) -> None:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        # Required by the Elasticsearch client's product check
+        self.send_header("X-Elastic-Product", "Elasticsearch")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _parts(self) -> list:
+        return [part for part in urlparse(self.path).path.split("/") if part]
+
+    def do_GET(self) -> None:
+        parts = self._parts()
+        if parts == ["_stats", "stand_in"]:
+            with self.server.lock:
+                counters = dict(self.server.counters)
+                counters["documents"] = sum(len(docs) for docs in self.server.indices.values())
+            self._send(200, counters)
+        elif not parts:
+            self._send(200, {"name": "stand-in", "version": {"number": "8.19.3"}, "tagline": "You Know, for Search"})
+        else:
+            self._send(404, {"error": "not found", "status": 404})
+
+    def do_HEAD(self) -> None:
+        parts = self._parts()
+        exists = len(parts) == 1 and parts[0] in self.server.indices
+        self._send(200 if exists else 404)
+
+    def do_PUT(self) -> None:
+        parts = self._parts()
+        if parts and parts[-1] in self.routes:
+            # The client sends bulk requests with PUT
+            self.do_POST()
+            return
+        self._body()
+        if len(parts) != 1:
+            self._send(404, {"error": "not found", "status": 404})
+            return
+        with self.server.lock:
+            self.server.indices.setdefault(parts[0], {})
+        self._send(200, {"acknowledged": True, "shards_acknowledged": True, "index": parts[0]})
+
+    def do_POST(self) -> None:
+        parts = self._parts()
+        body = self._body()
+        handler = self.routes.get(parts[-1] if parts else "")
+        if handler is None:
+            self._send(404, {"error": "not found", "status": 404})
+            return
+        handler(self, parts, body)
+
+    def _embed(self, parts: list, body: bytes) -> None:
+        request = json.loads(body)
+        texts = request.get("input") or []
+        if isinstance(texts, str):
+            texts = [texts]
+        config = self.server.config
+        with self.server.embed_slots:
+            time.sleep(config.embed_base_latency + config.embed_item_latency * len(texts))
+        vectors = [fake_embedding(text, config.embed_dims) for text in texts]
+        self.server.count("embed_requests")
+        self.server.count("embedded_texts", len(texts))
+        self._send(200, {"model": request.get("model", ""), "embeddings": vectors})
+
+    def _bulk(self, parts: list, body: bytes) -> None:
+        lines = [json.loads(line) for line in body.splitlines() if line.strip()]
+        default_index = parts[0] if len(parts) == 2 else None
+        items = []
+        position = 0
+        config = self.server.config
+        with self.server.lock:
+            while position < len(lines):
+                (op, meta), = lines[position].items()
+                position += 1
+                index = self.server.indices.setdefault(meta.get("_index", default_index), {})
+                if op == "delete":
+                    found = index.pop(meta["_id"], None) is not None
+                    items.append({op: {"_id": meta["_id"], "status": 200 if found else 404}})
+                    continue
+                index[meta["_id"]] = lines[position]
+                position += 1
+                items.append({op: {"_id": meta["_id"], "status": 201}})
+        time.sleep(config.bulk_base_latency + config.bulk_doc_latency * len(items))
+        self.server.count("bulk_requests")
+        self.server.count("bulk_items", len(items))
+        self._send(200, {"took": 1, "errors": False, "items": items})
+
+    def _refresh(self, parts: list, body: bytes) -> None:
+        self.server.count("refreshes")
+        self._send(200, {"_shards": {"total": 1, "successful": 1, "failed": 0}})
+
+    routes = {
+        "embed": _embed,
+        "_bulk": _bulk,
+        "_refresh": _refresh,
+    }
+
+
+def _serve(config: StandInConfig, connection) -> None:
+    server = StandInServer(config)
+    connection.send(server.url)
+    server.serve_forever()
+
+
+class StandInProcess:
+    """Runs a StandInServer in a child process.
+
+    Use as a context manager; ``url`` is the base URL for both the Ollama
+    and the Elasticsearch clients.
+    """
+
+    def __init__(self, config: Optional[StandInConfig] = None):
+        """Initialize the process wrapper.
+
+        Args:
+            config: Simulated latencies (defaults to StandInConfig())
+        """
+        self.config = config or StandInConfig()
+        self.url: Optional[str] = None
+        self._process: Optional[multiprocessing.Process] = None
+
+    def __enter__(self) -> "StandInProcess":
+        parent, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve, args=(self.config, child), daemon=True)
+        self._process.start()
+        self.url = parent.recv()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process is not None else None
+
+    def stats(self) -> dict:
+        """Fetch the server's request counters.
+
+        Returns:
+            Counter dictionary
+        """
+        with urlopen(f"{self.url}/_stats/stand_in", timeout=5) as response:
+            return json.loads(response.read())
+
+    def describe(self) -> dict:
+        """Get the simulated service configuration.
+
+        Returns:
+            StandInConfig as a dictionary
+        """
+        return asdict(self.config)
@@ -1,37 +1,214 @@
-"""Configuration management."""
+"""Configuration management.
+
+Settings are resolved lazily: the ``.env`` file is loaded and a value is
+read from the environment the first time it is accessed, and then cached
+on the class. Importing this module is therefore free of I/O, and
+assigning ``Config.NAME = value`` overrides a setting as before.
+"""
 
 import os
-from dotenv import load_dotenv
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+_env_loaded = False
+_env_lock = threading.Lock()
+
+
+def _load_env() -> None:
+    """Load ``.env`` into the environment once, on first setting access."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _env_lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+            _env_loaded = True
+
+
+def _bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+def _lower(value: str) -> str:
+    return value.lower()
+
+
+def _csv(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _float_map(value: str) -> Dict[str, float]:
+    return {
+        name.strip(): float(seconds)
+        for name, seconds in (item.split("=", 1) for item in value.split(",") if "=" in item)
+    }
+
+
+class _Setting:
+    """Config attribute resolved from the environment on first access."""
+
+    def __init__(self, name: str, default: Optional[str], parse: Callable[[str], Any]):
+        self.name = name
+        self.default = default
+        self.parse = parse
 
-load_dotenv()
+    def resolve(self) -> Any:
+        _load_env()
+        value = os.getenv(self.name, self.default)
+        return value if value is None else self.parse(value)
+
+    def __get__(self, instance, owner) -> Any:
+        value = self.resolve()
+        # Later reads are plain class attribute lookups
+        setattr(owner, self.name, value)
+        return value
+
+
+def _env(name: str, default: Optional[str] = None, parse: Callable[[str], Any] = str) -> _Setting:
+    return _Setting(name, default, parse)
 
 
 class Config:
     """Application configuration."""
 
     # Ollama
-    OLLAMA_MODEL = os.getenv(
-        "OLLAMA_MODEL",
-        "qwen3:4b"
-    )
-    OLLAMA_EMBEDDING_MODEL = os.getenv(
-        "OLLAMA_EMBEDDING_MODEL",
-        "qwen3-embedding:0.6b"
-    )
-    OLLAMA_BASE_URL = os.getenv(
-        "OLLAMA_BASE_URL",
-        "http://localhost:11434"
-    )
+    OLLAMA_MODEL = _env("OLLAMA_MODEL", "qwen3:4b")
+    OLLAMA_EMBEDDING_MODEL = _env("OLLAMA_EMBEDDING_MODEL", "qwen3-embedding:0.6b")
+    OLLAMA_BASE_URL = _env("OLLAMA_BASE_URL", "http://localhost:11434")
+    # Seconds or a duration such as "30m"; -1 keeps models loaded forever
+    OLLAMA_KEEP_ALIVE = _env("OLLAMA_KEEP_ALIVE", "30m")
+    # Comma-separated models that are never unloaded
+    OLLAMA_PINNED_MODELS = _env("OLLAMA_PINNED_MODELS", "", _csv)
+    # Context window bounds; the size is picked per prompt
+    OLLAMA_NUM_CTX_MIN = _env("OLLAMA_NUM_CTX_MIN", "2048", int)
+    OLLAMA_NUM_CTX_MAX = _env("OLLAMA_NUM_CTX_MAX", "8192", int)
+    # Tokens reserved for the response when sizing the context window
+    OLLAMA_NUM_PREDICT_RESERVE = _env("OLLAMA_NUM_PREDICT_RESERVE", "1024", int)
+    OLLAMA_WARMUP = _env("OLLAMA_WARMUP", "true", _bool)
+
+    # Vector backend: "elasticsearch" or "local" (memory-mapped files)
+    VECTOR_BACKEND = _env("VECTOR_BACKEND", "elasticsearch", _lower)
+    # Local backend: store directory (one subdirectory per index), storage
+    # dtype ("float32" or "int8"), IVF index threshold and probes
+    LOCAL_INDEX_PATH = _env("LOCAL_INDEX_PATH", ".cache/local_index")
+    LOCAL_INDEX_DTYPE = _env("LOCAL_INDEX_DTYPE", "float32", _lower)
+    LOCAL_INDEX_IVF_MIN_DOCS = _env("LOCAL_INDEX_IVF_MIN_DOCS", "20000", int)
+    LOCAL_INDEX_NPROBE = _env("LOCAL_INDEX_NPROBE", "8", int)
+
+    # Ingestion manifests (per backend and index) for incremental runs
+    INGEST_MANIFEST_DIR = _env("INGEST_MANIFEST_DIR", ".cache/ingest")
+    # Ingestion pipeline: chunks per embedding request, requests in flight
+    # and loader processes (0 = CPU count)
+    INGEST_BATCH_SIZE = _env("INGEST_BATCH_SIZE", "50", int)
+    INGEST_EMBED_CONCURRENCY = _env("INGEST_EMBED_CONCURRENCY", "4", int)
+    INGEST_LOAD_WORKERS = _env("INGEST_LOAD_WORKERS", "0", int)
+    # Adaptive batching tunes batch size and concurrency toward a target
+    # request latency; INGEST_BATCH_SIZE/INGEST_EMBED_CONCURRENCY are the start point
+    INGEST_ADAPTIVE_BATCHING = _env("INGEST_ADAPTIVE_BATCHING", "true", _bool)
+    INGEST_TARGET_LATENCY = _env("INGEST_TARGET_LATENCY", "2.0", float)
+    INGEST_MAX_BATCH_SIZE = _env("INGEST_MAX_BATCH_SIZE", "256", int)
+    INGEST_MAX_EMBED_CONCURRENCY = _env("INGEST_MAX_EMBED_CONCURRENCY", "8", int)
+    # Retries of failed embedding requests and index writes, with exponential backoff
+    INGEST_MAX_RETRIES = _env("INGEST_MAX_RETRIES", "5", int)
+    INGEST_RETRY_BACKOFF = _env("INGEST_RETRY_BACKOFF", "1.0", float)
+    # Persistent chunk-embedding cache, one vector file per embedding model
+    INGEST_EMBEDDING_CACHE_ENABLED = _env("INGEST_EMBEDDING_CACHE_ENABLED", "true", _bool)
+    INGEST_EMBEDDING_CACHE_PATH = _env("INGEST_EMBEDDING_CACHE_PATH", ".cache/chunk_embeddings")
 
     # Elasticsearch
-    ELASTICSEARCH_URL = os.getenv(
-        "ELASTICSEARCH_URL",
-        "http://localhost:9200"
-    )
-    ELASTICSEARCH_INDEX = os.getenv(
-        "ELASTICSEARCH_INDEX",
-        "documents"
-    )
-    ELASTICSEARCH_API_KEY = os.getenv("ELASTICSEARCH_API_KEY")
-    ELASTICSEARCH_USER = os.getenv("ELASTICSEARCH_USER")
-    ELASTICSEARCH_PASSWORD = os.getenv("ELASTICSEARCH_PASSWORD")
+    ELASTICSEARCH_URL = _env("ELASTICSEARCH_URL", "http://localhost:9200")
+    ELASTICSEARCH_INDEX = _env("ELASTICSEARCH_INDEX", "documents")
+    ELASTICSEARCH_API_KEY = _env("ELASTICSEARCH_API_KEY")
+    ELASTICSEARCH_USER = _env("ELASTICSEARCH_USER")
+    ELASTICSEARCH_PASSWORD = _env("ELASTICSEARCH_PASSWORD")
+    # Readiness: minimum cluster health ("yellow" or "green"), seconds to
+    # wait at bootstrap, and the jittered probe backoff while waiting
+    ELASTICSEARCH_WAIT_FOR_STATUS = _env("ELASTICSEARCH_WAIT_FOR_STATUS", "yellow", _lower)
+    ELASTICSEARCH_READY_TIMEOUT = _env("ELASTICSEARCH_READY_TIMEOUT", "60", float)
+    ELASTICSEARCH_PROBE_TIMEOUT = _env("ELASTICSEARCH_PROBE_TIMEOUT", "2", float)
+    ELASTICSEARCH_PROBE_BACKOFF = _env("ELASTICSEARCH_PROBE_BACKOFF", "0.5", float)
+    ELASTICSEARCH_PROBE_BACKOFF_MAX = _env("ELASTICSEARCH_PROBE_BACKOFF_MAX", "10", float)
+
+    # Retrieval
+    RETRIEVAL_K = _env("RETRIEVAL_K", "8", int)
+    RETRIEVAL_NUM_CANDIDATES = _env("RETRIEVAL_NUM_CANDIDATES", "50", int)
+    # "hybrid" (BM25 + kNN fused with RRF) or "dense" (kNN only)
+    RETRIEVAL_MODE = _env("RETRIEVAL_MODE", "hybrid", _lower)
+    # Reciprocal rank fusion: per-list weights, rank constant, and how
+    # many hits each list contributes before fusion
+    RETRIEVAL_LEXICAL_WEIGHT = _env("RETRIEVAL_LEXICAL_WEIGHT", "1.0", float)
+    RETRIEVAL_VECTOR_WEIGHT = _env("RETRIEVAL_VECTOR_WEIGHT", "1.0", float)
+    RETRIEVAL_RRF_K = _env("RETRIEVAL_RRF_K", "60", int)
+    RETRIEVAL_RRF_WINDOW = _env("RETRIEVAL_RRF_WINDOW", "20", int)
+    # Maximal-marginal-relevance diversification after retrieval:
+    # candidates fetched, relevance/diversity trade-off (1.0 = relevance
+    # only) and share of relevance from lexical query coverage
+    MMR_ENABLED = _env("MMR_ENABLED", "true", _bool)
+    MMR_FETCH_K = _env("MMR_FETCH_K", "40", int)
+    MMR_LAMBDA = _env("MMR_LAMBDA", "0.7", float)
+    MMR_LEXICAL_WEIGHT = _env("MMR_LEXICAL_WEIGHT", "0.2", float)
+    # Share of MMR relevance taken from the hybrid (RRF) ranking
+    MMR_FUSION_WEIGHT = _env("MMR_FUSION_WEIGHT", "0.5", float)
+    # Per-stage timeouts in seconds
+    RETRIEVAL_EMBED_TIMEOUT = _env("RETRIEVAL_EMBED_TIMEOUT", "10", float)
+    RETRIEVAL_SEARCH_TIMEOUT = _env("RETRIEVAL_SEARCH_TIMEOUT", "5", float)
+    # Token budget for retrieved passages in the RAG prompt
+    RAG_CONTEXT_TOKEN_BUDGET = _env("RAG_CONTEXT_TOKEN_BUDGET", "800", int)
+    # Skip retrieval for greetings, arithmetic and weather queries
+    RETRIEVAL_GATE_ENABLED = _env("RETRIEVAL_GATE_ENABLED", "true", _bool)
+    # Minimum classifier score to retrieve for queries no rule matches
+    RETRIEVAL_GATE_THRESHOLD = _env("RETRIEVAL_GATE_THRESHOLD", "0.35", float)
+
+    # Query-embedding cache (size 0 disables it)
+    EMBEDDING_CACHE_SIZE = _env("EMBEDDING_CACHE_SIZE", "1024", int)
+    EMBEDDING_CACHE_TTL = _env("EMBEDDING_CACHE_TTL", "86400", float)
+    # Optional base path for the on-disk store, e.g. ".cache/query_embeddings";
+    # it is bounded by the same size and TTL
+    EMBEDDING_CACHE_PATH = _env("EMBEDDING_CACHE_PATH")
+
+    # Semantic answer cache (disabled by default)
+    ANSWER_CACHE_ENABLED = _env("ANSWER_CACHE_ENABLED", "false", _bool)
+    ANSWER_CACHE_SIZE = _env("ANSWER_CACHE_SIZE", "1000", int)
+    ANSWER_CACHE_THRESHOLD = _env("ANSWER_CACHE_THRESHOLD", "0.95", float)
+    # Seconds between index generation checks
+    INDEX_GENERATION_TTL = _env("INDEX_GENERATION_TTL", "30", float)
+
+    # Conversation history compaction
+    # Token budget for summary plus verbatim recent turns
+    HISTORY_TOKEN_BUDGET = _env("HISTORY_TOKEN_BUDGET", "1200", int)
+    # Portion of the budget reserved for the running summary
+    HISTORY_SUMMARY_TOKENS = _env("HISTORY_SUMMARY_TOKENS", "300", int)
+
+    # Tool execution
+    TOOL_TIMEOUT = _env("TOOL_TIMEOUT", "30", float)
+    # Per-tool overrides, e.g. "search_documents=15,get_weather=5"
+    TOOL_TIMEOUTS = _env("TOOL_TIMEOUTS", "", _float_map)
+    TOOL_MAX_CONCURRENCY = _env("TOOL_MAX_CONCURRENCY", "8", int)
+    # Result cache for deterministic tools
+    TOOL_CACHE_ENABLED = _env("TOOL_CACHE_ENABLED", "true", _bool)
+    TOOL_CACHE_SIZE = _env("TOOL_CACHE_SIZE", "256", int)
+
+    # Per-node/tool spans and latency histograms (served at /metrics)
+    METRICS_ENABLED = _env("METRICS_ENABLED", "true", _bool)
+
+    @classmethod
+    def resolve(cls) -> Dict[str, Any]:
+        """Resolve every setting now instead of on first access.
+
+        Returns:
+            Mapping of setting name to value
+        """
+        return {name: getattr(cls, name) for name in _SETTINGS}
+
+    @classmethod
+    def reload(cls) -> None:
+        """Forget resolved values and overrides; settings are read again on access."""
+        for name, setting in _SETTINGS.items():
+            setattr(cls, name, setting)
+
+
+_SETTINGS: Dict[str, _Setting] = {
+    name: value for name, value in vars(Config).items() if isinstance(value, _Setting)
+}
@@ -7,67 +7,130 @@ This module defines the chatbot graph structure:
 
 """
 
+from __future__ import annotations
+
 import asyncio
 from functools import partial
-from langgraph.graph import StateGraph, END
-from langchain_ollama import ChatOllama
-from src.states.chatbot import ChatbotState
-from src.tools.weather import get_weather
-from src.tools.calculator import calculate
-from src.tools.retriever import search_documents
-from src.utils.llm import get_local_llm
-from src.nodes.model import call_model
-from src.nodes.tools_executor import call_tools
-from src.nodes.router import should_continue
-from src.nodes.input_processor import process_input
-from src.nodes.retriever import retrieve_documents
-
-
-async def create_chatbot_graph():
+from typing import TYPE_CHECKING, Optional
+from src.config.config import Config
+
+# Graph, node, tool and client modules are imported in create_chatbot_graph,
+# so importing this module (e.g. to look up ``graph``) stays cheap
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.vectorstores import VectorStore
+
+
+async def create_chatbot_graph(
+    chat_model: Optional[BaseChatModel] = None,
+    embeddings: Optional[Embeddings] = None,
+    vector_store: Optional[VectorStore] = None,
+):
     """Create and configure the chatbot graph (Hybrid RAG).
 
     Graph structure:
-        process_input → retrieve → agent → [conditional] → tools → agent
-                                                         ↓
-                                                        end
+        process_input → gate_retrieval → [conditional] → retrieve → lookup_answer → compact_history → agent → [conditional] → tools → agent
+                                              ↓ (skip)                       ↑     ↓ (hit)                                   ↓
+                                              └──────────────────────────────┘    end                                   store_answer → end
 
     Features:
-    - Always retrieves documents first (RAG)
+    - Retrieves documents first (RAG), unless the gate classifies the query
+      as small talk, arithmetic or weather
+    - Optional semantic answer cache skips generation for repeated questions
+    - Older turns are folded into a rolling summary to bound prompt size
     - Agent can use retrieved context
     - Agent can also call search_documents tool for additional searches
 
+    Args:
+        chat_model: Chat model to use instead of the local Ollama model
+        embeddings: Embedding model to use instead of OllamaEmbeddings
+        vector_store: Vector store to use instead of the configured index
+
     Returns:
         Compiled StateGraph ready for execution
     """
+    from langgraph.graph import StateGraph, END
+    from src.states.chatbot import ChatbotState
+    from src.tools.weather import get_weather
+    from src.tools.calculator import calculate
+    from src.tools.retriever import search_documents
+    from src.tools.registry import ToolRegistry
+    from src.utils.llm import get_local_llm
+    from src.utils.clients import ClientRegistry, init_clients, set_clients
+    from src.utils.metrics import instrument_node
+    from src.nodes.model import call_model
+    from src.nodes.tools_executor import call_tools
+    from src.nodes.router import should_continue, should_retrieve, route_answer_cache
+    from src.nodes.input_processor import process_input
+    from src.nodes.retrieval_gate import gate_retrieval
+    from src.nodes.retriever import retrieve_documents
+    from src.nodes.answer_cache import lookup_answer, store_answer
+    from src.nodes.history import compact_history
+
     # Initialize LLM with tools (including search_documents for additional searches)
     tools = [get_weather, calculate, search_documents]
-    # Use to_thread to avoid blocking event loop during heavy model loading
-    chat_model: ChatOllama = await asyncio.to_thread(get_local_llm)
+    if chat_model is None:
+        # Use to_thread to avoid blocking event loop during heavy model loading
+        chat_model = await asyncio.to_thread(get_local_llm)
     # Ensure tool binding is correct for Qwen
     chat_model_with_tools = chat_model.bind_tools(tools)
+    # The executor dispatches by name over the same tool list
+    tool_registry = ToolRegistry(tools)
+    if embeddings is not None or vector_store is not None:
+        set_clients(ClientRegistry(embeddings=embeddings, vector_store=vector_store))
+    # Create shared embedding/Elasticsearch clients once for all requests
+    await asyncio.to_thread(init_clients)
 
     # Create graph
     workflow = StateGraph(ChatbotState)
 
     # Add nodes
-    workflow.add_node("process_input", process_input)
-    workflow.add_node("retrieve", retrieve_documents)
-    workflow.add_node("agent", partial(call_model, llm_with_tools=chat_model_with_tools))
-    workflow.add_node("tools", call_tools)
+    nodes = {
+        "process_input": process_input,
+        "gate_retrieval": gate_retrieval,
+        "retrieve": retrieve_documents,
+        "lookup_answer": lookup_answer,
+        "store_answer": store_answer,
+        "compact_history": partial(compact_history, chat_model=chat_model),
+        "agent": partial(call_model, llm_with_tools=chat_model_with_tools),
+        "tools": partial(call_tools, registry=tool_registry),
+    }
+    for name, node in nodes.items():
+        # Every run is recorded as a span and in the /metrics histograms
+        workflow.add_node(name, instrument_node(name, node))
 
     # Configure edges - Hybrid RAG pattern
     workflow.set_entry_point("process_input")
-    workflow.add_edge("process_input", "retrieve")
-    workflow.add_edge("retrieve", "agent")
+    workflow.add_edge("process_input", "gate_retrieval")
+    workflow.add_conditional_edges(
+        "gate_retrieval",
+        should_retrieve,
+        {
+            "retrieve": "retrieve",
+            "skip": "lookup_answer"
+        }
+    )
+    workflow.add_edge("retrieve", "lookup_answer")
+    workflow.add_conditional_edges(
+        "lookup_answer",
+        route_answer_cache,
+        {
+            "hit": END,
+            "miss": "compact_history"
+        }
+    )
+    workflow.add_edge("compact_history", "agent")
     workflow.add_conditional_edges(
         "agent",
         should_continue,
         {
             "tools": "tools",
-            "end": END
+            "end": "store_answer"
         }
     )
     workflow.add_edge("tools", "agent")
+    workflow.add_edge("store_answer", END)
 
     return workflow.compile()
 
@@ -81,4 +144,14 @@ async def graph():
     global _compiled_graph
     if _compiled_graph is None:
         _compiled_graph = await create_chatbot_graph()
+        if Config.VECTOR_BACKEND != "local":
+            from src.utils.readiness import get_search_readiness
+
+            # Probe in the background; retrieval fails fast until ready
+            get_search_readiness().start()
+        if Config.OLLAMA_WARMUP:
+            from src.utils.llm import warm_up_models
+
+            # Preload models so the first request does not pay the load time
+            await warm_up_models()
     return _compiled_graph
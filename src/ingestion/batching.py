@@ -0,0 +1,205 @@
+"""Adaptive sizing of embedding requests.
+
+The fastest batch size for an embedding model depends on chunk length
+and on how busy the host is, so a fixed ``--batch-size`` is either too
+small (the model idles between requests) or too large (requests time
+out). :class:`AdaptiveBatcher` measures every request and steers two
+knobs:
+
+* **Batch size** follows a target request latency: the smoothed
+  per-chunk latency predicts how many chunks fit into the target. The
+  size changes by at most 2x per request.
+* **Concurrency** is hill-climbed on throughput: after each measurement
+  window it moves one step in the current direction and reverses when
+  chunks/s drop.
+
+Errors halve both knobs (multiplicative decrease), like TCP congestion
+control. With ``adaptive=False`` the batcher keeps the configured values
+and only collects the measurements for the report.
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveBatcher:
+    """Chooses embedding batch size and request concurrency."""
+
+    def __init__(
+        self,
+        batch_size: int = 50,
+        concurrency: int = 4,
+        adaptive: bool = True,
+        target_latency: float = 2.0,
+        min_batch_size: int = 1,
+        max_batch_size: int = 256,
+        max_concurrency: int = 8,
+        smoothing: float = 0.3,
+        tolerance: float = 0.05,
+    ):
+        """Initialize the batcher.
+
+        Args:
+            batch_size: Initial (or, if not adaptive, fixed) batch size
+            concurrency: Initial (or fixed) requests in flight
+            adaptive: Whether to tune batch size and concurrency
+            target_latency: Desired seconds per embedding request
+            min_batch_size: Lower bound for the batch size
+            max_batch_size: Upper bound for the batch size
+            max_concurrency: Upper bound for requests in flight
+            smoothing: Weight of the newest sample in the latency average
+            tolerance: Relative throughput drop that reverses the
+                concurrency search
+        """
+        self.adaptive = adaptive
+        self.target_latency = target_latency
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max_concurrency
+        if adaptive:
+            batch_size = self._clamp(batch_size, min_batch_size, max_batch_size)
+            concurrency = self._clamp(concurrency, 1, max_concurrency)
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+
+        self.latencies: List[float] = []
+        self.requests = 0
+        self.chunks = 0
+        self.errors = 0
+        self._per_chunk: Optional[float] = None
+        self._warmed_up = False
+        self._direction = 1
+        self._last_throughput: Optional[float] = None
+        self._best = (0.0, self.batch_size, self.concurrency)
+        self._started: Optional[float] = None
+        self._reset_window()
+
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+
+    @staticmethod
+    def _clamp(value: int, low: int, high: int) -> int:
+        return max(low, min(high, value))
+
+    def _reset_window(self) -> None:
+        self._window_start = time.perf_counter()
+        self._window_chunks = 0
+        self._window_requests = 0
+
+    @property
+    def workers(self) -> int:
+        """Number of workers needed to reach the highest concurrency."""
+        return self.max_concurrency if self.adaptive else self.concurrency
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait until another request may be sent, and hold the slot."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.concurrency)
+            self._in_flight += 1
+        if self._started is None:
+            self._started = time.perf_counter()
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def record(self, size: int, latency: float) -> None:
+        """Record a successful request and adjust the operating point.
+
+        Args:
+            size: Chunks in the request
+            latency: Request duration in seconds
+        """
+        self.requests += 1
+        self.chunks += size
+        self.latencies.append(latency)
+        if not self.adaptive or size == 0:
+            return
+        if not self._warmed_up:
+            # The first request also pays for loading the model
+            self._warmed_up = True
+            self._reset_window()
+            return
+
+        per_chunk = latency / size
+        if self._per_chunk is None:
+            self._per_chunk = per_chunk
+        else:
+            self._per_chunk = self.smoothing * per_chunk + (1 - self.smoothing) * self._per_chunk
+        ideal = int(self.target_latency / self._per_chunk) if self._per_chunk > 0 else self.max_batch_size
+        self.batch_size = self._clamp(
+            self._clamp(ideal, self.batch_size // 2, self.batch_size * 2),
+            self.min_batch_size,
+            self.max_batch_size,
+        )
+
+        self._window_chunks += size
+        self._window_requests += 1
+        if self._window_requests >= 2 * self.concurrency:
+            self._step_concurrency()
+
+    def _step_concurrency(self) -> None:
+        elapsed = time.perf_counter() - self._window_start
+        throughput = self._window_chunks / elapsed if elapsed > 0 else 0.0
+        if throughput > self._best[0]:
+            self._best = (throughput, self.batch_size, self.concurrency)
+        if self._last_throughput is not None and throughput < self._last_throughput * (1 - self.tolerance):
+            self._direction = -self._direction
+        concurrency = self._clamp(self.concurrency + self._direction, 1, self.max_concurrency)
+        if concurrency == self.concurrency:
+            # Hit a bound; probe the other way next time
+            self._direction = -self._direction
+        else:
+            logger.debug(
+                "Embedding throughput %.1f chunks/s at batch %d x %d; concurrency -> %d",
+                throughput, self.batch_size, self.concurrency, concurrency,
+            )
+        self.concurrency = concurrency
+        self._last_throughput = throughput
+        self._reset_window()
+
+    def record_failure(self) -> None:
+        """Record a failed request and back off."""
+        self.errors += 1
+        if not self.adaptive:
+            return
+        self.batch_size = max(self.min_batch_size, self.batch_size // 2)
+        self.concurrency = max(1, self.concurrency // 2)
+        self._direction = 1
+        self._last_throughput = None
+        self._reset_window()
+
+    def summary(self) -> dict:
+        """Describe the operating point the run settled on.
+
+        Returns:
+            Dictionary with the final and best batch size and concurrency,
+            throughput and request latency percentiles
+        """
+        elapsed = time.perf_counter() - self._started if self._started is not None else 0.0
+        latencies = sorted(self.latencies)
+        best_throughput, best_batch_size, best_concurrency = self._best
+        return {
+            "adaptive": self.adaptive,
+            "batch_size": self.batch_size,
+            "concurrency": self.concurrency,
+            "best_batch_size": best_batch_size,
+            "best_concurrency": best_concurrency,
+            "best_throughput": best_throughput,
+            "throughput": self.chunks / elapsed if elapsed > 0 else 0.0,
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_p50": statistics.median(latencies) if latencies else 0.0,
+            "latency_p95": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+        }
@@ -0,0 +1,99 @@
+"""Persistent cache of chunk embeddings.
+
+Chunk vectors depend only on the embedding model and the chunk text, not
+on the index, chunk IDs or cluster they end up in. Keeping them in an
+append-only memory-mapped :class:`VectorFile` (one per model) means a
+re-index after changing chunking parameters, the index name or the
+cluster only embeds chunk texts that were never seen before.
+"""
+
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import List, Union
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.utils.vector_file import VectorFile
+
+logger = logging.getLogger(__name__)
+
+
+def chunk_text_key(text: str) -> str:
+    """Key a chunk by the SHA-256 of its text.
+
+    Args:
+        text: Chunk text
+
+    Returns:
+        Hex digest
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ChunkEmbeddingStore(Embeddings):
+    """Embeddings wrapper that serves previously seen chunk texts from disk.
+
+    Document embeddings are looked up by (model, text hash) before the
+    wrapped model is called, and new vectors are appended to the store.
+    Query embeddings pass straight through.
+    """
+
+    def __init__(self, embeddings: Embeddings, path: Union[str, Path], model: str):
+        """Open the store for a model.
+
+        Args:
+            embeddings: Embedding client used for unseen texts
+            path: Directory holding one vector file per model
+            model: Embedding model name
+        """
+        self.embeddings = embeddings
+        self.model = model
+        file_name = re.sub(r"[^A-Za-z0-9._-]+", "_", model)
+        self._file = VectorFile(Path(path) / file_name)
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, texts: List[str]) -> tuple:
+        keys = [chunk_text_key(text) for text in texts]
+        found = self._file.get_many(keys)
+        # Identical texts within a batch are embedded once
+        missing = list(dict.fromkeys(key for key in keys if key not in found))
+        self.hits += len(keys) - sum(1 for key in keys if key not in found)
+        self.misses += len(missing)
+        return keys, found, missing
+
+    def _merge(self, keys: List[str], found: dict, missing: List[str], vectors) -> List[List[float]]:
+        if missing:
+            self._file.append_many(zip(missing, vectors))
+            found.update(zip(missing, vectors))
+        vectors = (found[key] for key in keys)
+        return [vector.tolist() if isinstance(vector, np.ndarray) else list(vector) for vector in vectors]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = self._lookup(texts)
+        text_by_key = dict(zip(keys, texts))
+        vectors = self.embeddings.embed_documents([text_by_key[key] for key in missing]) if missing else []
+        return self._merge(keys, found, missing, vectors)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = self._lookup(texts)
+        text_by_key = dict(zip(keys, texts))
+        vectors = await self.embeddings.aembed_documents([text_by_key[key] for key in missing]) if missing else []
+        return self._merge(keys, found, missing, vectors)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.embeddings.aembed_query(text)
+
+    def stats(self) -> dict:
+        """Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses and stored vector count
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._file)}
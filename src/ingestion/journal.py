@@ -0,0 +1,142 @@
+"""Checkpoint journal for resumable ingestion.
+
+The manifest is only written at the end of a run, so a crash or an Ollama
+outage part-way through a large ingestion would otherwise lose every
+completed batch. The journal is an append-only JSON-lines file, flushed
+after every entry, that records:
+
+* ``{"settings": {...}}`` - header; a journal written with different
+  settings is ignored
+* ``{"chunks": {source: [ids]}}`` - chunks indexed by one batch
+* ``{"file": source, "chunk_ids": [...], "sha256": ...}`` - a file whose
+  chunks are all indexed
+
+On ``--resume`` the completed files are skipped and the chunks of
+partially indexed files are not embedded again. A truncated last line
+(the process died mid-write) is ignored.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JournalState:
+    """Progress recovered from a previous run."""
+
+    # Source -> IDs of chunks that were indexed
+    chunks: Dict[str, Set[str]] = field(default_factory=dict)
+    # Source -> (chunk IDs, content hash) of fully indexed files
+    files: Dict[str, tuple] = field(default_factory=dict)
+
+
+class IngestJournal:
+    """Append-only progress log for one index."""
+
+    def __init__(self, path: Path, settings: dict):
+        """Initialize the journal.
+
+        Args:
+            path: Journal file
+            settings: Settings of the run; must match for a resume
+        """
+        self.path = Path(path)
+        self.settings = settings
+        self._file = None
+
+    def exists(self) -> bool:
+        """Check whether an unfinished run left a journal behind."""
+        return self.path.exists()
+
+    def load(self) -> JournalState:
+        """Read progress from a previous run.
+
+        Returns:
+            JournalState; empty if there is no usable journal
+        """
+        state = JournalState()
+        if not self.path.exists():
+            return state
+
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        for number, line in enumerate(lines):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.warning("Ignoring damaged journal line %d in %s", number + 1, self.path)
+                continue
+            if "settings" in entry:
+                if entry["settings"] != self.settings:
+                    logger.warning("Journal %s was written with other settings; ignoring it", self.path)
+                    return JournalState()
+            elif "chunks" in entry:
+                for source, ids in entry["chunks"].items():
+                    state.chunks.setdefault(source, set()).update(ids)
+            elif "file" in entry:
+                state.files[entry["file"]] = (entry["chunk_ids"], entry.get("sha256"))
+        return state
+
+    def open(self, resume: bool = False) -> None:
+        """Open the journal for appending.
+
+        Args:
+            resume: Keep the entries of the previous run; otherwise start
+                a new journal. A journal written with other settings is
+                never kept, since :meth:`load` would ignore it again.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        keep = resume and self._settings_match()
+        self._file = open(self.path, "a" if keep else "w", encoding="utf-8")
+        if not keep:
+            self._write({"settings": self.settings})
+
+    def _settings_match(self) -> bool:
+        """Whether the existing journal's header matches this run's settings."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                header = json.loads(f.readline())
+        except (OSError, ValueError):
+            return False
+        return isinstance(header, dict) and header.get("settings") == self.settings
+
+    def _write(self, entry: dict) -> None:
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def record_chunks(self, chunk_ids_by_source: Dict[str, List[str]]) -> None:
+        """Record indexed chunks.
+
+        Args:
+            chunk_ids_by_source: Chunk IDs of one batch, grouped by source
+        """
+        if chunk_ids_by_source:
+            self._write({"chunks": chunk_ids_by_source})
+
+    def record_file(self, source: str, chunk_ids: Iterable[str], sha256: Optional[str] = None) -> None:
+        """Record a fully indexed file.
+
+        Args:
+            source: Source file path
+            chunk_ids: IDs of all chunks of the file
+            sha256: Content hash, if already computed
+        """
+        self._write({"file": source, "chunk_ids": list(chunk_ids), "sha256": sha256})
+
+    def close(self) -> None:
+        """Close the journal file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Remove the journal once the run's progress is in the manifest."""
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,104 @@
+"""File loading and splitting for ingestion.
+
+:func:`load_file` and :func:`load_and_split` are plain top-level
+functions so they can run in worker processes; parsing PDFs and DOCX
+files and splitting them into chunks is CPU-bound and scales with cores.
+"""
+
+from pathlib import Path
+from typing import Iterable, Iterator, List, Union
+
+from langchain_community.document_loaders import (
+    TextLoader,
+    PyPDFLoader,
+    Docx2txtLoader,
+)
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from src.ingestion.manifest import assign_chunk_ids
+
+TEXT_SUFFIXES = {".md", ".markdown", ".txt", ".text", ".py", ".js", ".ts", ".java", ".go"}
+
+
+def load_file(file_path: Union[str, Path]) -> List[Document]:
+    """Load one file with a loader chosen by extension.
+
+    Args:
+        file_path: File to load
+
+    Returns:
+        Loaded documents with ``source`` and ``filename`` metadata
+
+    Raises:
+        Exception: If the file cannot be read or parsed
+    """
+    file_path = Path(file_path)
+    suffix = file_path.suffix.lower()
+
+    if suffix == ".pdf":
+        loader = PyPDFLoader(str(file_path))
+    elif suffix in [".docx", ".doc"]:
+        loader = Docx2txtLoader(str(file_path))
+    else:
+        # Text-based files, and a best-effort attempt for unknown types
+        loader = TextLoader(str(file_path), encoding="utf-8")
+
+    docs = loader.load()
+    for doc in docs:
+        doc.metadata["source"] = str(file_path)
+        doc.metadata["filename"] = file_path.name
+    return docs
+
+
+def create_splitter(chunk_size: int = 1000, chunk_overlap: int = 200) -> RecursiveCharacterTextSplitter:
+    """Create the text splitter used for ingestion.
+
+    Args:
+        chunk_size: Size of each chunk
+        chunk_overlap: Overlap between chunks
+
+    Returns:
+        Configured splitter
+    """
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        separators=["\n\n", "\n", " ", ""]
+    )
+
+
+def iter_chunks(
+    documents: Iterable[Document],
+    splitter: RecursiveCharacterTextSplitter,
+) -> Iterator[Document]:
+    """Split documents lazily, one document at a time.
+
+    Args:
+        documents: Documents to split
+        splitter: Text splitter
+
+    Yields:
+        Chunks in document order
+    """
+    for document in documents:
+        yield from splitter.split_documents([document])
+
+
+def load_and_split(file_path: Union[str, Path], splitter: RecursiveCharacterTextSplitter) -> List[Document]:
+    """Load one file and split it into chunks with deterministic IDs.
+
+    Args:
+        file_path: File to load
+        splitter: Text splitter
+
+    Returns:
+        Chunks in document order
+
+    Raises:
+        Exception: If the file cannot be read or parsed
+    """
+    chunks = list(iter_chunks(load_file(file_path), splitter))
+    assign_chunk_ids(chunks)
+    return chunks
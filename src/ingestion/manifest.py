@@ -0,0 +1,225 @@
+"""Ingestion manifest for incremental re-indexing.
+
+The manifest records, per source file, its size, mtime, content hash and
+the IDs of the chunks it produced. A re-run compares the directory against
+it: unchanged files are skipped without being read (size and mtime match)
+or without being re-embedded (hash matches), changed files have their
+stale chunks replaced, and files that disappeared have their chunks
+deleted.
+
+Chunk IDs are derived from the source path and chunk text, so
+re-indexing the same content overwrites documents instead of duplicating
+them. They do not depend on the chunk's position: after an edit near the
+top of a file, the chunks below it keep their IDs and are not embedded
+again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+_HASH_BLOCK = 1 << 20
+
+
+def file_sha256(path: Path) -> str:
+    """Hash a file's content.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def make_chunk_id(source: str, text: str, occurrence: int = 0) -> str:
+    """Build a deterministic chunk ID.
+
+    Args:
+        source: Source file path
+        text: Chunk text
+        occurrence: Number of earlier chunks in the file with the same text
+
+    Returns:
+        Hex ID, stable across runs for identical input
+    """
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{source}\0{text_hash}\0{occurrence}".encode("utf-8")).hexdigest()[:40]
+
+
+def assign_chunk_ids(chunks: Sequence[Document]) -> List[str]:
+    """Set deterministic IDs on the chunks of one file.
+
+    Repeated chunk texts (boilerplate, table headers) are told apart by
+    their occurrence count, so every chunk of a file gets a distinct ID.
+
+    Args:
+        chunks: Chunks of a single source file, in document order
+
+    Returns:
+        Assigned IDs, in chunk order
+    """
+    ids = []
+    occurrences: Counter = Counter()
+    for chunk in chunks:
+        text = chunk.page_content
+        chunk.id = make_chunk_id(chunk.metadata.get("source", ""), text, occurrences[text])
+        occurrences[text] += 1
+        ids.append(chunk.id)
+    return ids
+
+
+@dataclass
+class FileRecord:
+    """Manifest entry for one source file."""
+
+    size: int
+    mtime_ns: int
+    sha256: str
+    chunk_ids: List[str] = field(default_factory=list)
+
+
+@dataclass
+class IngestPlan:
+    """Work needed to bring the index in line with the directory."""
+
+    unchanged: List[Path] = field(default_factory=list)
+    changed: List[Path] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    # Content hashes computed while planning, reused when recording
+    hashes: Dict[str, str] = field(default_factory=dict)
+
+
+class IngestManifest:
+    """Per-index record of ingested files and their chunk IDs."""
+
+    def __init__(self, path: Path, settings: dict):
+        """Load the manifest.
+
+        Args:
+            path: Manifest JSON file
+            settings: Values that affect chunk content or vectors (e.g.
+                embedding model, chunk size); if they differ from the
+                stored ones, every file counts as changed
+        """
+        self.path = Path(path)
+        self.settings = settings
+        self.files: Dict[str, FileRecord] = {}
+        self.settings_changed = False
+
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable manifest %s: %s", self.path, e)
+            return
+        self.files = {source: FileRecord(**record) for source, record in data.get("files", {}).items()}
+        self.settings_changed = data.get("settings") != settings
+
+    def get(self, source: str) -> Optional[FileRecord]:
+        """Look up a file record.
+
+        Args:
+            source: Source file path
+
+        Returns:
+            FileRecord, or None if the file was never ingested
+        """
+        return self.files.get(source)
+
+    def record(self, source: str, chunk_ids: Iterable[str], sha256: Optional[str] = None) -> None:
+        """Record a successfully ingested file.
+
+        Args:
+            source: Source file path
+            chunk_ids: IDs of all chunks now indexed for the file
+            sha256: Content hash, if already computed
+        """
+        stat = os.stat(source)
+        self.files[source] = FileRecord(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha256=sha256 or file_sha256(Path(source)),
+            chunk_ids=list(chunk_ids),
+        )
+
+    def remove(self, source: str) -> None:
+        """Forget a file.
+
+        Args:
+            source: Source file path
+        """
+        self.files.pop(source, None)
+
+    def plan(self, files: Iterable[Path], root: Path, force: bool = False) -> IngestPlan:
+        """Compare files on disk with the manifest.
+
+        Args:
+            files: Files matched by this run
+            root: Directory being ingested; only records under it can be
+                reported as deleted
+            force: Treat every file as changed (full re-index)
+
+        Returns:
+            IngestPlan listing unchanged, changed and deleted files
+        """
+        plan = IngestPlan()
+        force = force or self.settings_changed
+        seen = set()
+
+        for path in files:
+            source = str(path)
+            seen.add(source)
+            record = self.files.get(source)
+            if force or record is None:
+                plan.changed.append(path)
+                continue
+
+            stat = path.stat()
+            if stat.st_size == record.size and stat.st_mtime_ns == record.mtime_ns:
+                plan.unchanged.append(path)
+                continue
+            digest = file_sha256(path)
+            if digest == record.sha256:
+                # Touched but identical; refresh the stat so the next run
+                # skips hashing
+                record.size, record.mtime_ns = stat.st_size, stat.st_mtime_ns
+                plan.unchanged.append(path)
+            else:
+                plan.hashes[source] = digest
+                plan.changed.append(path)
+
+        root = Path(root).resolve()
+        for source in self.files:
+            if source in seen:
+                continue
+            source_path = Path(source).resolve()
+            if source_path.is_relative_to(root) and not source_path.exists():
+                plan.deleted.append(source)
+        return plan
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "settings": self.settings,
+            "files": {source: asdict(record) for source, record in sorted(self.files.items())},
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,367 @@
+"""Streaming ingestion pipeline.
+
+Stages, connected by bounded queues so a slow stage throttles the ones
+before it and memory stays flat regardless of corpus size::
+
+    load + split (process pool) → embed (N concurrent batches) → index (sink)
+
+At most ``load_workers * 2`` files are being parsed, ``queue_size``
+batches wait for embedding and ``queue_size`` embedded batches wait for
+indexing at any time. A file is reported done once every one of its
+chunks has been indexed, so callers can record progress per file.
+
+Batch size and the number of embedding requests in flight come from an
+:class:`AdaptiveBatcher`, which tunes both from measured latency and
+throughput unless adaptive batching is disabled.
+
+Failed embedding requests and sink writes are retried with exponential
+backoff, which rides out an Ollama or Elasticsearch restart. If an
+embedding batch still fails, it is split in halves until the chunks that
+cannot be embedded are isolated; the rest of the batch is indexed.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.ingestion.batching import AdaptiveBatcher
+from src.ingestion.loaders import create_splitter, load_and_split
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+@dataclass
+class FileResult:
+    """Outcome of ingesting one file."""
+
+    source: str
+    chunk_ids: List[str] = field(default_factory=list)
+    embedded: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class PipelineStats:
+    """Counters for one pipeline run."""
+
+    files: int = 0
+    failed_files: int = 0
+    chunks: int = 0
+    skipped_chunks: int = 0
+    embedded_chunks: int = 0
+    failed_chunks: int = 0
+    failed_batches: List[str] = field(default_factory=list)
+    retries: int = 0
+    # Operating point chosen by the batcher (see AdaptiveBatcher.summary)
+    batching: dict = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+@dataclass
+class _FileState:
+    result: FileResult
+    pending: int = 0
+    split_done: bool = False
+
+
+class IngestionPipeline:
+    """Loads, splits, embeds and indexes files concurrently."""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        sink,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        batch_size: int = 50,
+        embed_concurrency: int = 4,
+        load_workers: Optional[int] = None,
+        queue_size: int = 8,
+        max_retries: int = 5,
+        retry_backoff: float = 1.0,
+        retry_backoff_max: float = 30.0,
+        batcher: Optional[AdaptiveBatcher] = None,
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            embeddings: Embeddings used for chunk texts
+            sink: ElasticsearchSink or LocalSink receiving embedded chunks
+            chunk_size: Size of each chunk
+            chunk_overlap: Overlap between chunks
+            batch_size: Chunks per embedding request, if no batcher is given
+            embed_concurrency: Embedding requests in flight at once, if no
+                batcher is given
+            load_workers: Loader processes (defaults to the CPU count)
+            queue_size: Batches buffered between stages
+            max_retries: Retries of a failed embedding request or sink write
+            retry_backoff: Delay before the first retry in seconds; doubles
+                with every further attempt
+            retry_backoff_max: Upper bound for the retry delay in seconds
+            batcher: Chooses batch size and concurrency; defaults to the
+                fixed values above
+        """
+        self.embeddings = embeddings
+        self.sink = sink
+        self.splitter = create_splitter(chunk_size, chunk_overlap)
+        self.batcher = batcher or AdaptiveBatcher(batch_size, embed_concurrency, adaptive=False)
+        self.load_workers = load_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self._stats = PipelineStats()
+
+    async def run(
+        self,
+        files: Sequence[Path],
+        indexed_ids: Optional[Dict[str, Set[str]]] = None,
+        on_file_done: Optional[Callable[[FileResult], None]] = None,
+        on_batch_done: Optional[Callable[[List[Document]], None]] = None,
+    ) -> PipelineStats:
+        """Ingest files.
+
+        Args:
+            files: Files to ingest
+            indexed_ids: Per-source chunk IDs already in the index; those
+                chunks are not embedded again
+            on_file_done: Called once per file after its last chunk is
+                indexed (or once it fails)
+            on_batch_done: Called with the chunks of each batch that were
+                indexed successfully
+
+        Returns:
+            PipelineStats for the run
+        """
+        indexed_ids = indexed_ids or {}
+        stats = self._stats = PipelineStats(files=len(files))
+        states: Dict[str, _FileState] = {}
+        embed_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        index_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        start = time.perf_counter()
+
+        def finish_file(state: _FileState) -> None:
+            if not state.result.ok:
+                stats.failed_files += 1
+            if on_file_done is not None:
+                on_file_done(state.result)
+
+        def settle(sources: Set[str], count_by_source: Dict[str, int], error: Optional[str]) -> None:
+            for source in sources:
+                state = states[source]
+                state.pending -= count_by_source[source]
+                if error is not None and state.result.error is None:
+                    state.result.error = error
+                if state.pending == 0 and state.split_done:
+                    finish_file(state)
+
+        async def produce() -> None:
+            loop = asyncio.get_running_loop()
+            batch: List[Document] = []
+            with ProcessPoolExecutor(max_workers=self.load_workers) as pool:
+                in_flight: List[tuple] = []
+                paths = iter(files)
+
+                def submit_next() -> bool:
+                    path = next(paths, None)
+                    if path is None:
+                        return False
+                    # Splitting runs in the worker too, keeping the event
+                    # loop free for the embedding and indexing stages
+                    future = loop.run_in_executor(pool, load_and_split, str(path), self.splitter)
+                    in_flight.append((path, future))
+                    return True
+
+                for _ in range(self.load_workers * 2):
+                    if not submit_next():
+                        break
+
+                while in_flight:
+                    # Consume in submission order so batches follow file order
+                    path, future = in_flight.pop(0)
+                    submit_next()
+                    source = str(path)
+                    state = _FileState(result=FileResult(source=source))
+                    states[source] = state
+                    try:
+                        chunks = await future
+                    except Exception as e:
+                        state.result.error = f"load failed: {e}"
+                        state.split_done = True
+                        finish_file(state)
+                        continue
+
+                    state.result.chunk_ids = [chunk.id for chunk in chunks]
+                    stats.chunks += len(chunks)
+                    known = indexed_ids.get(source, set())
+                    for chunk in chunks:
+                        if chunk.id in known:
+                            stats.skipped_chunks += 1
+                            continue
+                        state.pending += 1
+                        batch.append(chunk)
+                        if len(batch) >= self.batcher.batch_size:
+                            await embed_queue.put(batch)
+                            batch = []
+                    state.split_done = True
+                    if state.pending == 0:
+                        finish_file(state)
+
+            if batch:
+                await embed_queue.put(batch)
+            for _ in range(self.batcher.workers):
+                await embed_queue.put(_DONE)
+
+        async def embed_worker() -> None:
+            while True:
+                batch = await embed_queue.get()
+                if batch is _DONE:
+                    await index_queue.put(_DONE)
+                    return
+                embedded, vectors, failed = await self._embed(batch, self.max_retries)
+                if failed:
+                    stats.failed_chunks += len(failed)
+                    stats.failed_batches.append(f"{len(failed)}/{len(batch)} chunks not embedded: {failed[0][1]}")
+                    for chunk, error in failed:
+                        self._settle_batch([chunk], settle, f"embedding failed: {error}")
+                if embedded:
+                    await index_queue.put((embedded, vectors))
+
+        async def index_worker() -> None:
+            remaining = self.batcher.workers
+            while remaining:
+                item = await index_queue.get()
+                if item is _DONE:
+                    remaining -= 1
+                    continue
+                batch, vectors = item
+                try:
+                    failed = set(await self._retry(
+                        lambda: self.sink.write(batch, vectors),
+                        f"Indexing batch of {len(batch)} chunks",
+                        self.max_retries,
+                    ))
+                except Exception as e:
+                    stats.failed_chunks += len(batch)
+                    stats.failed_batches.append(str(e))
+                    self._settle_batch(batch, settle, f"indexing failed: {e}")
+                    continue
+                ok = [chunk for chunk in batch if chunk.id not in failed]
+                bad = [chunk for chunk in batch if chunk.id in failed]
+                stats.embedded_chunks += len(ok)
+                stats.failed_chunks += len(bad)
+                for chunk in ok:
+                    states[chunk.metadata["source"]].result.embedded += 1
+                # Report the batch before settling so a file is never
+                # recorded as done ahead of its last chunks
+                if on_batch_done is not None and ok:
+                    on_batch_done(ok)
+                self._settle_batch(ok, settle, None)
+                self._settle_batch(bad, settle, "indexing failed")
+
+        await asyncio.gather(
+            produce(),
+            index_worker(),
+            *(embed_worker() for _ in range(self.batcher.workers)),
+        )
+        await self.sink.finish()
+        stats.elapsed = time.perf_counter() - start
+        stats.batching = self.batcher.summary()
+        return stats
+
+    async def _retry(self, operation: Callable[[], Awaitable], what: str, retries: int):
+        """Run an operation, retrying failures with exponential backoff.
+
+        Args:
+            operation: Creates the awaitable to run
+            what: Description for log messages
+            retries: Retries after the first attempt
+
+        Returns:
+            Result of the operation
+
+        Raises:
+            Exception: The last error once all retries failed
+        """
+        delay = self.retry_backoff
+        for attempt in range(retries + 1):
+            try:
+                return await operation()
+            except Exception as e:
+                if attempt == retries:
+                    logger.warning("%s failed: %s", what, e)
+                    raise
+                # Jitter keeps concurrent workers from retrying in lockstep
+                wait = delay + random.uniform(0, delay / 2)
+                logger.warning("%s failed (attempt %d/%d): %s; retrying in %.1fs", what, attempt + 1, retries + 1, e, wait)
+                self._stats.retries += 1
+                await asyncio.sleep(wait)
+                delay = min(delay * 2, self.retry_backoff_max)
+
+    async def _request(self, texts: List[str]) -> List[List[float]]:
+        """Send one embedding request within the batcher's concurrency limit."""
+        async with self.batcher.slot():
+            start = time.perf_counter()
+            try:
+                vectors = await self.embeddings.aembed_documents(texts)
+            except Exception:
+                self.batcher.record_failure()
+                raise
+            self.batcher.record(len(texts), time.perf_counter() - start)
+        return vectors
+
+    async def _embed(
+        self,
+        batch: List[Document],
+        retries: int,
+    ) -> Tuple[List[Document], List[List[float]], List[Tuple[Document, str]]]:
+        """Embed a batch, isolating chunks that cannot be embedded.
+
+        Args:
+            batch: Chunks to embed
+            retries: Retries for this request
+
+        Returns:
+            Tuple of (embedded chunks, their vectors, failed (chunk, error) pairs)
+        """
+        try:
+            vectors = await self._retry(
+                lambda: self._request([chunk.page_content for chunk in batch]),
+                f"Embedding batch of {len(batch)} chunks",
+                retries,
+            )
+            return list(batch), list(vectors), []
+        except Exception as e:
+            if len(batch) == 1:
+                return [], [], [(batch[0], str(e))]
+
+        # Still failing after all retries; bisect without further backoff
+        # to find the chunks that cannot be embedded
+        middle = len(batch) // 2
+        left = await self._embed(batch[:middle], 0)
+        right = await self._embed(batch[middle:], 0)
+        return left[0] + right[0], left[1] + right[1], left[2] + right[2]
+
+    @staticmethod
+    def _settle_batch(batch: Sequence[Document], settle: Callable, error: Optional[str]) -> None:
+        count_by_source: Dict[str, int] = {}
+        for chunk in batch:
+            source = chunk.metadata["source"]
+            count_by_source[source] = count_by_source.get(source, 0) + 1
+        if count_by_source:
+            settle(set(count_by_source), count_by_source, error)
@@ -0,0 +1,174 @@
+"""Destinations for embedded chunks.
+
+Sinks receive chunks together with their vectors, so embedding and
+indexing are separate pipeline stages. Both sinks write documents in the
+layout the query path expects (``text``, ``vector`` and ``metadata``
+fields for Elasticsearch; the LocalVectorStore files otherwise).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, List, Sequence
+
+from langchain_core.documents import Document
+
+from src.utils.local_vector_store import LocalVectorStore
+
+if TYPE_CHECKING:
+    from elasticsearch import AsyncElasticsearch
+
+logger = logging.getLogger(__name__)
+
+# Same field names ElasticsearchStore uses, so both paths can read the index
+TEXT_FIELD = "text"
+VECTOR_FIELD = "vector"
+METADATA_FIELD = "metadata"
+# Compact a local store once this share of its rows is deleted or replaced
+_COMPACT_DEAD_FRACTION = 0.3
+
+
+class ElasticsearchSink:
+    """Indexes chunks with the Elasticsearch bulk helper."""
+
+    def __init__(self, client: AsyncElasticsearch, index_name: str):
+        """Initialize the sink.
+
+        Args:
+            client: Async Elasticsearch client
+            index_name: Target index
+        """
+        self.client = client
+        self.index_name = index_name
+        self._index_ready = False
+        self._index_lock = asyncio.Lock()
+
+    async def _ensure_index(self, dims: int) -> None:
+        """Create the index with a cosine dense_vector mapping if missing."""
+        async with self._index_lock:
+            if self._index_ready:
+                return
+            if not await self.client.indices.exists(index=self.index_name):
+                await self.client.indices.create(
+                    index=self.index_name,
+                    mappings={
+                        "properties": {
+                            VECTOR_FIELD: {
+                                "type": "dense_vector",
+                                "dims": dims,
+                                "index": True,
+                                "similarity": "cosine",
+                            },
+                        }
+                    },
+                )
+            self._index_ready = True
+
+    async def write(self, chunks: Sequence[Document], vectors: Sequence[Sequence[float]]) -> List[str]:
+        """Index a batch of chunks.
+
+        Args:
+            chunks: Chunks with IDs set
+            vectors: One embedding per chunk
+
+        Returns:
+            IDs that failed to index
+        """
+        if not chunks:
+            return []
+        await self._ensure_index(len(vectors[0]))
+        actions = [
+            {
+                "_op_type": "index",
+                "_index": self.index_name,
+                "_id": chunk.id,
+                TEXT_FIELD: chunk.page_content,
+                VECTOR_FIELD: list(vector),
+                METADATA_FIELD: chunk.metadata,
+            }
+            for chunk, vector in zip(chunks, vectors)
+        ]
+        from elasticsearch.helpers import async_bulk
+
+        _, errors = await async_bulk(self.client, actions, raise_on_error=False, refresh=False)
+        failed = []
+        for error in errors:
+            item = next(iter(error.values()))
+            failed.append(item.get("_id"))
+            logger.warning("Failed to index %s: %s", item.get("_id"), item.get("error"))
+        return failed
+
+    async def delete(self, ids: Sequence[str]) -> None:
+        """Delete chunks by ID.
+
+        Args:
+            ids: Chunk IDs
+        """
+        if not ids:
+            return
+        actions = [{"_op_type": "delete", "_index": self.index_name, "_id": chunk_id} for chunk_id in ids]
+        from elasticsearch.helpers import async_bulk
+
+        # Missing documents (404) are fine; they are already gone
+        await async_bulk(self.client, actions, raise_on_error=False, refresh=False)
+
+    async def finish(self) -> None:
+        """Make written documents visible to searches."""
+        if await self.client.indices.exists(index=self.index_name):
+            await self.client.indices.refresh(index=self.index_name)
+
+
+class LocalSink:
+    """Appends chunks to a LocalVectorStore."""
+
+    def __init__(self, store: LocalVectorStore):
+        """Initialize the sink.
+
+        Args:
+            store: Target store
+        """
+        self.store = store
+
+    async def write(self, chunks: Sequence[Document], vectors: Sequence[Sequence[float]]) -> List[str]:
+        """Append a batch of chunks.
+
+        Args:
+            chunks: Chunks with IDs set
+            vectors: One embedding per chunk
+
+        Returns:
+            IDs that failed to index (always empty; errors raise)
+        """
+        await asyncio.to_thread(
+            self.store.add_vectors,
+            [chunk.page_content for chunk in chunks],
+            vectors,
+            [chunk.metadata for chunk in chunks],
+            [chunk.id for chunk in chunks],
+        )
+        return []
+
+    async def delete(self, ids: Sequence[str]) -> None:
+        """Delete chunks by ID.
+
+        Args:
+            ids: Chunk IDs
+        """
+        if ids:
+            await asyncio.to_thread(self.store.delete, list(ids))
+            await self._compact_if_needed()
+
+    async def _compact_if_needed(self) -> bool:
+        """Rewrite the store once deleted and replaced rows dominate it."""
+        if self.store.dead_fraction <= _COMPACT_DEAD_FRACTION:
+            return False
+        return await asyncio.to_thread(self.store.compact)
+
+    async def finish(self) -> None:
+        """Reclaim replaced rows, and build the IVF index once the store is large enough."""
+        # Compaction rebuilds the IVF index itself
+        if await self._compact_if_needed():
+            return
+        if await asyncio.to_thread(self.store.build_index):
+            logger.info("Built IVF index for %s", self.store.path)
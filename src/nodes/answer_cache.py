@@ -0,0 +1,138 @@
+"""Semantic answer cache nodes."""
+
+import asyncio
+import logging
+from typing import List, Optional
+
+from langchain_core.messages import AIMessage
+
+from src.config.config import Config
+from src.nodes.retriever import get_latest_query
+from src.states.chatbot import ChatbotState
+from src.utils.answer_cache import get_answer_cache
+from src.utils.clients import get_clients
+from src.utils.metrics import note_cache
+
+logger = logging.getLogger(__name__)
+
+
+def _current_turn(messages: list) -> Optional[list]:
+    """Get the messages after the latest user message.
+
+    Only standalone turns (the first user message of a conversation) are
+    eligible, since follow-up questions depend on earlier turns that the
+    cache key does not capture.
+
+    Args:
+        messages: Conversation history
+
+    Returns:
+        Messages of the current turn, or None if the turn is not standalone
+    """
+    human_indices = [
+        i for i, msg in enumerate(messages)
+        if getattr(msg, "type", None) == "human"
+        or (isinstance(msg, dict) and msg.get("role") == "user")
+    ]
+    if len(human_indices) != 1:
+        return None
+    return messages[human_indices[0] + 1:]
+
+
+async def _embed_query(query: str) -> Optional[List[float]]:
+    """Embed a query, served by the embedding cache after retrieval."""
+    try:
+        return await asyncio.wait_for(
+            get_clients().get_embeddings().aembed_query(query),
+            timeout=Config.RETRIEVAL_EMBED_TIMEOUT,
+        )
+    except asyncio.TimeoutError:
+        logger.warning("Answer cache embedding timed out")
+    except Exception as e:
+        logger.warning("Answer cache embedding failed: %s", e)
+    return None
+
+
+async def lookup_answer(state: ChatbotState) -> dict:
+    """Serve a cached answer for semantically equivalent questions.
+
+    Args:
+        state: Current chatbot state
+
+    Returns:
+        Updated state with the cached answer on a hit
+    """
+    if not Config.ANSWER_CACHE_ENABLED:
+        return {"answer_cache_hit": False}
+
+    messages = state.get("messages", [])
+    query = get_latest_query(messages)
+    doc_ids = state.get("retrieved_doc_ids")
+    if not query or doc_ids is None or state.get("summary") or _current_turn(messages) is None:
+        return {"answer_cache_hit": False}
+
+    generation = await get_clients().aget_index_generation()
+    vector = await _embed_query(query)
+    if generation is None or vector is None:
+        return {"answer_cache_hit": False}
+
+    result = get_answer_cache().lookup(vector, doc_ids, generation)
+    note_cache("answer", result is not None)
+    if result is None:
+        return {"answer_cache_hit": False}
+
+    entry, similarity = result
+    logger.info("Answer cache hit (similarity %.3f, saved %.2fs)", similarity, entry.llm_seconds)
+    response = AIMessage(
+        content=entry.answer,
+        response_metadata={
+            "answer_cache": {
+                "similarity": similarity,
+                "llm_seconds_saved": entry.llm_seconds,
+            }
+        },
+    )
+    return {"messages": [response], "answer_cache_hit": True}
+
+
+async def store_answer(state: ChatbotState) -> dict:
+    """Cache the final answer of a standalone turn.
+
+    Turns that called tools are not cached, since tool results may change
+    independently of the retrieved documents.
+
+    Args:
+        state: Current chatbot state
+
+    Returns:
+        Empty update (the state is not modified)
+    """
+    if not Config.ANSWER_CACHE_ENABLED:
+        return {}
+
+    messages = state.get("messages", [])
+    query = get_latest_query(messages)
+    doc_ids = state.get("retrieved_doc_ids")
+    turn = _current_turn(messages)
+    if not query or doc_ids is None or state.get("summary") or not turn:
+        return {}
+
+    ai_messages = [msg for msg in turn if getattr(msg, "type", None) == "ai"]
+    if not ai_messages or any(getattr(msg, "tool_calls", None) for msg in ai_messages):
+        return {}
+
+    answer = ai_messages[-1].content
+    if not isinstance(answer, str) or not answer:
+        return {}
+
+    generation = await get_clients().aget_index_generation()
+    vector = await _embed_query(query)
+    if generation is None or vector is None:
+        return {}
+
+    # Ollama reports generation time in nanoseconds
+    llm_seconds = sum(
+        msg.response_metadata.get("total_duration", 0) for msg in ai_messages
+    ) / 1e9
+    get_answer_cache().store(vector, answer, doc_ids, generation, llm_seconds)
+    return {}
@@ -0,0 +1,135 @@
+"""Conversation history compaction node."""
+
+import logging
+import re
+from typing import List
+
+from langchain_core.messages import BaseMessage, HumanMessage, RemoveMessage
+
+from src.config.config import Config
+from src.prompts.summary import get_summary_prompt
+from src.states.chatbot import ChatbotState
+from src.utils.llm import get_chat_options, select_num_ctx
+from src.utils.tokens import estimate_messages_tokens, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+_THINK_PATTERN = re.compile(r"<think>.*?</think>", re.DOTALL)
+
+# Turns the summary token budget into a word limit the model can follow
+# (200 words for the default 300 tokens)
+_WORDS_PER_TOKEN = 2 / 3
+
+_ROLE_LABELS = {"human": "User", "ai": "Assistant", "tool": "Tool", "system": "System"}
+
+
+def find_compaction_cut(messages: List[BaseMessage], budget: int) -> int:
+    """Find where to split history into folded and verbatim parts.
+
+    Cuts only happen at user messages, so an assistant tool call and its
+    ToolMessages always stay on the same side. The latest turn is always
+    kept verbatim, even if it alone exceeds the budget.
+
+    Args:
+        messages: Conversation history
+        budget: Token budget for the verbatim part
+
+    Returns:
+        Index of the first message kept verbatim (0 keeps everything)
+    """
+    turn_starts = [i for i, msg in enumerate(messages) if msg.type == "human"]
+    if not turn_starts:
+        return 0
+
+    for start in turn_starts:
+        if estimate_messages_tokens(messages[start:]) <= budget:
+            return start
+    return turn_starts[-1]
+
+
+def _format_transcript(messages: List[BaseMessage]) -> str:
+    """Format messages as plain transcript lines for summarization."""
+    lines = []
+    for msg in messages:
+        label = _ROLE_LABELS.get(msg.type, msg.type)
+        if msg.type == "tool":
+            label = f"Tool ({getattr(msg, 'name', None) or 'result'})"
+        content = msg.content if isinstance(msg.content, str) else str(msg.content)
+        tool_calls = getattr(msg, "tool_calls", None) or []
+        if tool_calls:
+            calls = ", ".join(f"{call['name']}({call['args']})" for call in tool_calls)
+            content = f"{content} [called {calls}]".strip()
+        if content:
+            lines.append(f"{label}: {content}")
+    return "\n".join(lines)
+
+
+def _batch_by_tokens(messages: List[BaseMessage], budget: int) -> List[List[BaseMessage]]:
+    """Split messages into consecutive batches of at most ``budget`` tokens."""
+    batches, current, current_tokens = [], [], 0
+    for msg in messages:
+        tokens = estimate_messages_tokens([msg])
+        if current and current_tokens + tokens > budget:
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(msg)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def compact_history(state: ChatbotState, chat_model) -> dict:
+    """Keep the conversation under the history token budget.
+
+    When history plus the running summary exceeds ``HISTORY_TOKEN_BUDGET``,
+    the oldest whole turns are folded into the summary and removed from
+    state, leaving recent turns verbatim. The summary is updated
+    incrementally, so only the newly folded turns are sent to the model.
+
+    Args:
+        state: Current chatbot state
+        chat_model: Chat model used for summarization (without tools)
+
+    Returns:
+        Updated state with the new summary and removals, or no changes
+    """
+    messages = state.get("messages", [])
+    summary = state.get("summary") or ""
+
+    total = estimate_messages_tokens(messages) + estimate_tokens(summary)
+    if total <= Config.HISTORY_TOKEN_BUDGET:
+        return {}
+
+    verbatim_budget = Config.HISTORY_TOKEN_BUDGET - Config.HISTORY_SUMMARY_TOKENS
+    cut = find_compaction_cut(messages, verbatim_budget)
+    folded = messages[:cut]
+    if not folded:
+        return {}
+
+    # Fold in batches that fit the largest context window
+    batch_budget = Config.OLLAMA_NUM_CTX_MAX // 2
+    max_words = max(1, int(Config.HISTORY_SUMMARY_TOKENS * _WORDS_PER_TOKEN))
+    new_summary = summary
+    try:
+        for batch in _batch_by_tokens(folded, batch_budget):
+            prompt = get_summary_prompt(new_summary, _format_transcript(batch), max_words)
+            num_ctx = select_num_ctx(estimate_tokens(prompt))
+            response = await chat_model.bind(options=get_chat_options(num_ctx)).ainvoke(
+                [HumanMessage(content=prompt)]
+            )
+            content = response.content if isinstance(response.content, str) else str(response.content)
+            new_summary = _THINK_PATTERN.sub("", content).strip() or new_summary
+    except Exception as e:
+        # Keep the full history rather than lose turns that were not summarized
+        logger.warning("History compaction failed: %s", e)
+        return {}
+
+    logger.info(
+        "Compacted %d messages into summary (%d → %d tokens)",
+        len(folded), total, estimate_messages_tokens(messages[cut:]) + estimate_tokens(new_summary),
+    )
+    return {
+        "summary": new_summary,
+        "messages": [RemoveMessage(id=msg.id) for msg in folded],
+    }
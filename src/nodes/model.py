@@ -1,16 +1,24 @@
 """LLM model calling node."""
 
-import asyncio
-from langchain_core.messages import SystemMessage
+from langchain_core.messages import AIMessageChunk, SystemMessage, message_chunk_to_message
+from langchain_core.runnables import RunnableConfig
 from src.states.chatbot import ChatbotState
 from src.prompts.agent import get_rag_system_prompt, get_base_system_prompt
+from src.prompts.summary import format_conversation_summary
+from src.utils.llm import get_chat_options, get_residency_stats, select_num_ctx
+from src.utils.tokens import estimate_messages_tokens
 
 
-async def call_model(state: ChatbotState, llm_with_tools) -> ChatbotState:
+async def call_model(state: ChatbotState, config: RunnableConfig, llm_with_tools) -> ChatbotState:
     """Call LLM with current state and retrieved context.
 
+    The response is streamed, so tokens reach LangGraph ``messages``
+    stream consumers as they are generated. Chunks (including tool-call
+    chunks) are merged incrementally into the final message.
+
     Args:
         state: Current chatbot state with message history
+        config: Runnable config carrying the stream callbacks
         llm_with_tools: LLM instance bound with tools
 
     Returns:
@@ -27,10 +35,25 @@ async def call_model(state: ChatbotState, llm_with_tools) -> ChatbotState:
         # Use base system prompt
         system_content = get_base_system_prompt()
 
+    # Include the summary of turns folded out of the history
+    summary = state.get("summary")
+    if summary:
+        system_content = f"{system_content}\n\n{format_conversation_summary(summary)}"
+
     # Prepend system message
     system_message = SystemMessage(content=system_content)
     messages_with_context = [system_message] + messages
 
-    # Run blocking LLM call in a separate thread to avoid blocking the event loop
-    response = await asyncio.to_thread(llm_with_tools.invoke, messages_with_context)
-    return {"messages": [response]}
+    # Size the context window to the assembled prompt
+    num_ctx = select_num_ctx(estimate_messages_tokens(messages_with_context))
+    llm = llm_with_tools.bind(options=get_chat_options(num_ctx))
+
+    # Stream the response natively on the event loop
+    response = None
+    async for chunk in llm.astream(messages_with_context, config=config):
+        response = chunk if response is None else response + chunk
+    if response is None:
+        response = AIMessageChunk(content="")
+
+    get_residency_stats().record(response.response_metadata)
+    return {"messages": [message_chunk_to_message(response)]}
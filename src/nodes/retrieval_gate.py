@@ -0,0 +1,45 @@
+"""Retrieval gate node.
+
+Decides before retrieval whether the latest query needs documents at
+all, so greetings, arithmetic and weather questions skip the query
+embedding, the kNN search and the longer RAG prompt. While the search
+index is not ready, retrieval is skipped so turns are answered without
+documents instead of waiting on Elasticsearch.
+"""
+
+import logging
+
+from src.config.config import Config
+from src.nodes.retriever import get_latest_query
+from src.states.chatbot import ChatbotState
+from src.utils.query_classifier import RetrievalDecision, classify_query
+from src.utils.readiness import search_ready
+
+logger = logging.getLogger(__name__)
+
+
+def gate_retrieval(state: ChatbotState) -> dict:
+    """Classify the latest query and record the retrieval decision.
+
+    Args:
+        state: Current chatbot state
+
+    Returns:
+        State update with ``retrieval_decision``; skipped turns also
+        clear context left over from the previous turn
+    """
+    query = get_latest_query(state.get("messages", [])) or ""
+
+    if not Config.RETRIEVAL_GATE_ENABLED:
+        decision = RetrievalDecision(retrieve=True, reason="disabled", score=1.0)
+    else:
+        decision = classify_query(query, threshold=Config.RETRIEVAL_GATE_THRESHOLD)
+
+    if decision.retrieve and not search_ready():
+        decision = RetrievalDecision(retrieve=False, reason="index_not_ready", score=0.0)
+
+    logger.debug("Retrieval gate: %s (%s, %.2f)", decision.retrieve, decision.reason, decision.score)
+    update = {"retrieval_decision": decision.to_dict()}
+    if not decision.retrieve:
+        update.update({"retrieved_documents": "", "retrieved_doc_ids": [], "query": query})
+    return update
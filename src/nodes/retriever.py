@@ -1,18 +1,47 @@
 """Document retrieval node for RAG."""
 
+import asyncio
 import logging
+from typing import Optional
 
+from langchain_core.runnables import RunnableConfig
+
+from src.config.config import Config
 from src.states.chatbot import ChatbotState
-from src.tools.retriever import get_retriever
+from src.tools.retriever import asearch_with_scores, get_search_options
+from src.utils.context_packer import format_passages, pack_documents
+from src.utils.readiness import SearchUnavailableError
 
 logger = logging.getLogger(__name__)
 
 
-def retrieve_documents(state: ChatbotState) -> dict:
+def get_latest_query(messages: list) -> Optional[str]:
+    """Get the content of the last user message.
+
+    Args:
+        messages: Conversation history
+
+    Returns:
+        Latest user query, or None if there is none
+    """
+    for msg in reversed(messages):
+        if hasattr(msg, "type") and msg.type == "human":
+            return msg.content
+        if isinstance(msg, dict) and msg.get("role") == "user":
+            return msg.get("content", "")
+    return None
+
+
+async def retrieve_documents(state: ChatbotState, config: RunnableConfig) -> dict:
     """Retrieve relevant documents for RAG.
 
+    Embedding and search run as awaited I/O, so concurrent conversations
+    overlap their retrieval instead of queuing on worker threads.
+
     Args:
         state: Current chatbot state
+        config: Runnable config; ``configurable`` may switch MMR
+            (``mmr``) and lexical re-scoring (``lexical_weight``)
 
     Returns:
         Updated state with retrieved documents
@@ -20,42 +49,50 @@ def retrieve_documents(state: ChatbotState) -> dict:
     # Extract query from latest user message
     messages = state.get("messages", [])
     if not messages:
-        return {"retrieved_documents": ""}
+        return {"retrieved_documents": "", "retrieved_doc_ids": []}
 
     # Get the last human message as query
-    query = None
-    for msg in reversed(messages):
-        if hasattr(msg, "type") and msg.type == "human":
-            query = msg.content
-            break
-        if isinstance(msg, dict) and msg.get("role") == "user":
-            query = msg.get("content", "")
-            break
+    query = get_latest_query(messages)
 
     if not query:
-        return {"retrieved_documents": ""}
+        return {"retrieved_documents": "", "retrieved_doc_ids": []}
 
     try:
         # Retrieve documents
-        retriever = get_retriever()
-        docs = retriever.invoke(query)
+        results = await asearch_with_scores(query, k=Config.RETRIEVAL_K, **get_search_options(config))
+        docs = [doc for doc, _ in results]
 
         if not docs:
             return {
                 "retrieved_documents": "",
+                "retrieved_doc_ids": [],
                 "query": query,
             }
 
-        # Format documents as context
-        context_parts = ["Retrieved Documents:\n"]
-        for i, doc in enumerate(docs[:5], 1):  # Limit to top 5
-            content = doc.page_content[:500]  # Limit length
-            context_parts.append(f"{i}. {content}\n")
-
-        retrieved_context = "\n".join(context_parts)
+        # Merge overlapping chunks and fill the context token budget
+        passages = pack_documents(results, Config.RAG_CONTEXT_TOKEN_BUDGET)
+        retrieved_context = format_passages(passages)
 
         return {
             "retrieved_documents": retrieved_context,
+            "retrieved_doc_ids": [doc.id for doc in docs],
+            "query": query,
+        }
+
+    except asyncio.TimeoutError:
+        logger.warning("Retrieval timed out for query: %s", query)
+        return {
+            "retrieved_documents": "Retrieval failed: timed out",
+            "retrieved_doc_ids": None,
+            "query": query,
+        }
+
+    except SearchUnavailableError as e:
+        # Expected while Elasticsearch starts; no traceback
+        logger.info("Retrieval skipped: %s", e)
+        return {
+            "retrieved_documents": "Retrieval unavailable: search index is not ready",
+            "retrieved_doc_ids": None,
             "query": query,
         }
 
@@ -63,5 +100,6 @@ def retrieve_documents(state: ChatbotState) -> dict:
         logger.exception("Retrieval error: %s", e)
         return {
             "retrieved_documents": f"Retrieval failed: {str(e)}",
+            "retrieved_doc_ids": None,
             "query": query,
         }
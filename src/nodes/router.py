@@ -20,3 +20,32 @@ def should_continue(state: ChatbotState) -> Literal["tools", "end"]:
     if hasattr(last_message, "tool_calls") and last_message.tool_calls:
         return "tools"
     return "end"
+
+
+def route_answer_cache(state: ChatbotState) -> Literal["hit", "miss"]:
+    """Route based on whether the semantic answer cache served the turn.
+
+    Args:
+        state: Current chatbot state
+
+    Returns:
+        "hit" if a cached answer was returned, "miss" otherwise
+    """
+    if state.get("answer_cache_hit"):
+        return "hit"
+    return "miss"
+
+
+def should_retrieve(state: ChatbotState) -> Literal["retrieve", "skip"]:
+    """Route based on the retrieval gate decision.
+
+    Args:
+        state: Current chatbot state
+
+    Returns:
+        "skip" if the gate decided against retrieval, "retrieve" otherwise
+    """
+    decision = state.get("retrieval_decision") or {}
+    if decision.get("retrieve", True):
+        return "retrieve"
+    return "skip"
@@ -1,18 +1,18 @@
 """Tool execution node."""
 
-import asyncio
-from langchain_core.messages import ToolMessage
-
 from src.states.chatbot import ChatbotState
-from src.tools.weather import get_weather
-from src.tools.calculator import calculate
+from src.tools.registry import ToolRegistry
 
 
-async def call_tools(state: ChatbotState) -> ChatbotState:
+async def call_tools(state: ChatbotState, registry: ToolRegistry) -> ChatbotState:
     """Execute tool calls from LLM response.
 
+    Independent calls from the same message run concurrently, so a turn
+    takes about as long as its slowest call.
+
     Args:
         state: Current chatbot state with message history
+        registry: Registry of the tools bound to the model
 
     Returns:
         Updated state with tool execution results
@@ -20,25 +20,5 @@ async def call_tools(state: ChatbotState) -> ChatbotState:
     messages = state["messages"]
     last_message = messages[-1]
 
-    tool_results = []
-    for tool_call in last_message.tool_calls:
-        # Find and execute the tool
-        tool_name = tool_call["name"]
-        tool_args = tool_call["args"]
-
-        if tool_name == "get_weather":
-            # Run in thread since tools may have blocking operations
-            result = await asyncio.to_thread(get_weather.invoke, tool_args)
-        elif tool_name == "calculate":
-            result = await asyncio.to_thread(calculate.invoke, tool_args)
-        else:
-            result = f"Unknown tool: {tool_name}"
-
-        tool_results.append(
-            ToolMessage(
-                content=result,
-                tool_call_id=tool_call["id"]
-            )
-        )
-
+    tool_results = await registry.execute_all(last_message.tool_calls)
     return {"messages": tool_results}
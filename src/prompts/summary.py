@@ -0,0 +1,42 @@
+"""Conversation summary prompts."""
+
+
+def get_summary_prompt(existing_summary: str, transcript: str, max_words: int) -> str:
+    """Get the prompt that folds older turns into the running summary.
+
+    Args:
+        existing_summary: Current summary (may be empty)
+        transcript: Formatted messages to fold into the summary
+        max_words: Length limit of the updated summary
+
+    Returns:
+        Summarization prompt
+    """
+    previous = existing_summary or "(none)"
+    return f"""Update the running summary of a conversation between a user and an AI assistant.
+
+Current summary:
+{previous}
+
+New conversation lines:
+{transcript}
+
+Instructions:
+- Merge the new lines into the current summary
+- Keep facts, user preferences, decisions, tool results and open questions
+- Drop greetings and small talk
+- Write in the language of the conversation, at most {max_words} words
+- Reply with the updated summary only"""
+
+
+def format_conversation_summary(summary: str) -> str:
+    """Format the running summary for inclusion in the system prompt.
+
+    Args:
+        summary: Running conversation summary
+
+    Returns:
+        System prompt section with the summary
+    """
+    return f"""Summary of the earlier conversation:
+{summary}"""
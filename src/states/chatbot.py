@@ -1,7 +1,8 @@
 """Chatbot state definition."""
 
 from typing import TypedDict, Annotated, Optional
-import operator
+
+from langgraph.graph.message import add_messages
 
 
 class ChatbotState(TypedDict, total=False):
@@ -9,11 +10,20 @@ class ChatbotState(TypedDict, total=False):
 
     Attributes:
         input: Simple text input from user (optional)
-        messages: Conversation history (accumulated with operator.add)
+        messages: Conversation history (merged with add_messages, so
+            compaction can remove folded messages by ID)
         retrieved_documents: Documents retrieved from Elasticsearch (for RAG)
         query: Current user query for retrieval
+        retrieved_doc_ids: IDs of the retrieved documents (None if retrieval failed)
+        answer_cache_hit: Whether the answer was served from the semantic cache
+        summary: Rolling summary of turns folded out of the history
+        retrieval_decision: Retrieval gate outcome (retrieve, reason, score)
     """
     input: Optional[str]
-    messages: Annotated[list, operator.add]
+    messages: Annotated[list, add_messages]
     retrieved_documents: Optional[str]
     query: Optional[str]
+    retrieved_doc_ids: Optional[list]
+    answer_cache_hit: Optional[bool]
+    summary: Optional[str]
+    retrieval_decision: Optional[dict]
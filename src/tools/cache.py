@@ -0,0 +1,295 @@
+"""Result cache for deterministic tools.
+
+Apply :func:`cached_tool` beneath ``@tool``::
+
+    @tool
+    @cached_tool(ttl=3600)
+    def calculate(expression: str) -> str:
+        ...
+
+Arguments are canonicalized into the cache key (sorted keys, collapsed
+whitespace), so trivially different calls share an entry. Tools whose
+results depend on external data can pass a ``generation`` callable; its
+value is part of the key, so a new generation invalidates old entries.
+Per-tool hit, miss and size counters are exported through
+:func:`src.utils.metrics.render_metrics`.
+"""
+
+import asyncio
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+from src.config.config import Config
+from src.utils.metrics import get_metrics, note_cache, render_samples
+
+_NO_GENERATION = object()
+
+# Per-call hit flag, set by the executor around each tool invocation
+_cache_hit_info: ContextVar[Optional[dict]] = ContextVar("tool_cache_hit_info", default=None)
+
+
+class ToolResultCache:
+    """Size-bounded LRU cache of tool results with a TTL."""
+
+    def __init__(self, name: str, ttl: float, max_size: int):
+        """Initialize the cache.
+
+        Args:
+            name: Tool name, used in stats
+            ttl: Entry lifetime in seconds
+            max_size: Maximum number of entries
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> tuple:
+        """Look up a result.
+
+        Args:
+            key: Canonical argument key
+
+        Returns:
+            (found, value) pair
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a result.
+
+        Args:
+            key: Canonical argument key
+            value: Tool result
+        """
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses and size
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+_caches: Dict[str, ToolResultCache] = {}
+
+
+def canonicalize_args(args: dict) -> str:
+    """Build a stable key from tool arguments.
+
+    Args:
+        args: Tool arguments
+
+    Returns:
+        JSON string with sorted keys and whitespace-collapsed strings
+    """
+    def _normalize(value):
+        if isinstance(value, str):
+            return " ".join(value.split())
+        if isinstance(value, dict):
+            return {k: _normalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [_normalize(v) for v in value]
+        return value
+
+    return json.dumps(_normalize(args), sort_keys=True, ensure_ascii=False, default=str)
+
+
+def is_cacheable(result: Any) -> bool:
+    """Check whether a tool result may be cached.
+
+    Tools report failures as strings starting with "Error", which must
+    not be replayed.
+
+    Args:
+        result: Tool result
+
+    Returns:
+        True if the result is a success
+    """
+    return not (isinstance(result, str) and result.startswith("Error"))
+
+
+def _mark_hit() -> None:
+    info = _cache_hit_info.get()
+    if info is not None:
+        info["cache_hit"] = True
+
+
+@contextmanager
+def track_cache_hits():
+    """Record whether tool calls inside the block were served from cache.
+
+    Yields:
+        Dictionary whose ``cache_hit`` key is set on a hit
+    """
+    info: dict = {}
+    token = _cache_hit_info.set(info)
+    try:
+        yield info
+    finally:
+        _cache_hit_info.reset(token)
+
+
+def cached_tool(
+    ttl: float,
+    max_size: Optional[int] = None,
+    generation: Optional[Callable[[], Any]] = None,
+    normalize: Optional[Callable[[dict], dict]] = None,
+):
+    """Cache a tool function's results.
+
+    Args:
+        ttl: Entry lifetime in seconds
+        max_size: Maximum number of entries (defaults to ``TOOL_CACHE_SIZE``)
+        generation: Optional callable (sync or async) returning the data
+            generation; None from it disables caching for that call
+        normalize: Optional tool-specific argument normalization
+
+    Returns:
+        Decorator for sync or async tool functions
+    """
+    def decorator(func):
+        cache = ToolResultCache(func.__name__, ttl, max_size or Config.TOOL_CACHE_SIZE)
+        _caches[func.__name__] = cache
+        signature = inspect.signature(func)
+
+        def _key(args, kwargs, current_generation) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            if normalize is not None:
+                arguments = normalize(arguments)
+            if current_generation is not _NO_GENERATION:
+                arguments = {"__generation__": current_generation, **arguments}
+            return canonicalize_args(arguments)
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not Config.TOOL_CACHE_ENABLED:
+                    return await func(*args, **kwargs)
+                current_generation = _NO_GENERATION
+                if generation is not None:
+                    current_generation = generation()
+                    if inspect.isawaitable(current_generation):
+                        current_generation = await current_generation
+                    if current_generation is None:
+                        return await func(*args, **kwargs)
+
+                key = _key(args, kwargs, current_generation)
+                found, value = cache.get(key)
+                note_cache("tool", found)
+                if found:
+                    _mark_hit()
+                    return value
+                value = await func(*args, **kwargs)
+                if is_cacheable(value):
+                    cache.put(key, value)
+                return value
+
+            async_wrapper.cache = cache
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not Config.TOOL_CACHE_ENABLED:
+                return func(*args, **kwargs)
+            current_generation = _NO_GENERATION
+            if generation is not None:
+                current_generation = generation()
+                if current_generation is None:
+                    return func(*args, **kwargs)
+
+            key = _key(args, kwargs, current_generation)
+            found, value = cache.get(key)
+            note_cache("tool", found)
+            if found:
+                _mark_hit()
+                return value
+            value = func(*args, **kwargs)
+            if is_cacheable(value):
+                cache.put(key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def invalidate_tool_cache(name: Optional[str] = None) -> None:
+    """Drop cached results.
+
+    Args:
+        name: Tool name, or None to clear every tool cache
+    """
+    for cache_name, cache in _caches.items():
+        if name is None or cache_name == name:
+            cache.clear()
+
+
+def get_tool_cache_stats() -> dict:
+    """Get counters for every tool cache.
+
+    Returns:
+        Mapping of tool name to cache stats
+    """
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def _collect_metrics() -> List[str]:
+    """Export per-tool cache counters."""
+    stats = get_tool_cache_stats()
+    lookups = {}
+    for name, tool_stats in stats.items():
+        lookups[(name, "hit")] = tool_stats["hits"]
+        lookups[(name, "miss")] = tool_stats["misses"]
+    return render_samples(
+        "langgraph_tool_cache_lookups_total",
+        "counter",
+        "Tool result cache lookups by tool and result.",
+        ("tool", "result"),
+        lookups,
+    ) + render_samples(
+        "langgraph_tool_cache_entries",
+        "gauge",
+        "Cached tool results by tool.",
+        ("tool",),
+        {(name,): tool_stats["size"] for name, tool_stats in stats.items()},
+    )
+
+
+get_metrics().add_collector(_collect_metrics)
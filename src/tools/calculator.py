@@ -1,18 +1,33 @@
 """Calculator tool."""
 
+from typing import Dict, List, Optional, Union
+
 from langchain_core.tools import tool
 
+from src.tools.cache import cached_tool
+from src.utils.expression import compile_expression, format_result
+
 
 @tool
-def calculate(expression: str) -> str:
+@cached_tool(ttl=86400)
+def calculate(
+    expression: str,
+    variables: Optional[Dict[str, Union[float, List[float]]]] = None,
+) -> str:
     """Evaluate a mathematical expression.
 
+    Supports + - * / // % **, functions (sqrt, exp, log, sin, cos, tan,
+    abs, round, floor, ceil, sum, mean, median, std, min, max, prod,
+    cumsum, len) and the constants pi and e. Lists are evaluated
+    element-wise, e.g. "[1, 2, 3] * 2" or "mean(x) / max(x)".
+
     Args:
         expression: A mathematical expression to evaluate (e.g., "2 + 2")
+        variables: Optional values for names in the expression; a list
+            value is treated as a series (e.g., {"x": [1.5, 2.0, 3.2]})
     """
     try:
-        # Safe evaluation with restricted builtins
-        result = eval(expression, {"__builtins__": {}})
-        return str(result)
+        compiled = compile_expression(expression)
+        return format_result(compiled.evaluate(variables))
     except Exception as e:
         return f"Error calculating: {str(e)}"
@@ -0,0 +1,151 @@
+"""Tool registry and concurrent executor."""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool
+
+from src.config.config import Config
+from src.tools.cache import track_cache_hits
+from src.utils.metrics import measure_size, record_tool_call
+
+logger = logging.getLogger(__name__)
+
+
+class ToolRegistry:
+    """Maps tool names to tools and runs tool calls concurrently.
+
+    Built from the same tool list that is bound to the model, so a new
+    tool only needs to be added to that list.
+    """
+
+    def __init__(
+        self,
+        tools: Sequence[BaseTool],
+        default_timeout: Optional[float] = None,
+        timeouts: Optional[Dict[str, float]] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        """Initialize the registry.
+
+        Args:
+            tools: Tools available to the agent
+            default_timeout: Seconds before a tool call is abandoned
+            timeouts: Per-tool timeout overrides keyed by tool name
+            max_concurrency: Maximum number of tool calls running at once
+        """
+        self._tools: Dict[str, BaseTool] = {tool.name: tool for tool in tools}
+        self.default_timeout = default_timeout or Config.TOOL_TIMEOUT
+        self.timeouts = Config.TOOL_TIMEOUTS if timeouts is None else timeouts
+        self._semaphore = asyncio.Semaphore(max_concurrency or Config.TOOL_MAX_CONCURRENCY)
+
+    @property
+    def tools(self) -> List[BaseTool]:
+        """Registered tools."""
+        return list(self._tools.values())
+
+    def get(self, name: str) -> Optional[BaseTool]:
+        """Look up a tool by name.
+
+        Args:
+            name: Tool name
+
+        Returns:
+            The tool, or None if it is not registered
+        """
+        return self._tools.get(name)
+
+    def get_timeout(self, name: str) -> float:
+        """Get the timeout for a tool.
+
+        Args:
+            name: Tool name
+
+        Returns:
+            Timeout in seconds
+        """
+        return self.timeouts.get(name, self.default_timeout)
+
+    async def execute(self, tool_call: dict) -> ToolMessage:
+        """Run one tool call.
+
+        Errors and timeouts are reported back to the model as error
+        ToolMessages instead of failing the graph run.
+
+        Args:
+            tool_call: Tool call from an AIMessage
+
+        Returns:
+            ToolMessage answering the call
+        """
+        tool_name = tool_call["name"]
+        tool = self.get(tool_name)
+        if tool is None:
+            return ToolMessage(
+                content=f"Unknown tool: {tool_name}",
+                tool_call_id=tool_call["id"],
+                name=tool_name,
+                status="error",
+            )
+
+        timeout = self.get_timeout(tool_name)
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                with track_cache_hits() as cache_info:
+                    result = await asyncio.wait_for(tool.ainvoke(tool_call["args"]), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Tool %s timed out after %.1fs", tool_name, timeout)
+                message = ToolMessage(
+                    content=f"Error: {tool_name} timed out after {timeout:g}s",
+                    tool_call_id=tool_call["id"],
+                    name=tool_name,
+                    status="error",
+                )
+                self._record(tool_call, start, "timeout", message)
+                return message
+            except Exception as e:
+                logger.exception("Tool %s failed: %s", tool_name, e)
+                message = ToolMessage(
+                    content=f"Error running {tool_name}: {str(e)}",
+                    tool_call_id=tool_call["id"],
+                    name=tool_name,
+                    status="error",
+                )
+                self._record(tool_call, start, "error", message)
+                return message
+
+        message = ToolMessage(
+            content=str(result),
+            tool_call_id=tool_call["id"],
+            name=tool_name,
+            response_metadata={"cache_hit": cache_info.get("cache_hit", False)},
+        )
+        self._record(tool_call, start, "ok", message)
+        return message
+
+    @staticmethod
+    def _record(tool_call: dict, start: float, status: str, message: ToolMessage) -> None:
+        """Record a finished tool call in the metrics."""
+        record_tool_call(
+            tool_call["name"],
+            time.perf_counter() - start,
+            status,
+            input_size=len(str(tool_call.get("args", ""))),
+            output_size=measure_size(message.content),
+            cache_hit=message.response_metadata.get("cache_hit", False),
+        )
+
+    async def execute_all(self, tool_calls: Sequence[dict]) -> List[ToolMessage]:
+        """Run independent tool calls concurrently.
+
+        Args:
+            tool_calls: Tool calls from one AIMessage
+
+        Returns:
+            ToolMessages in the same order as the calls
+        """
+        return list(await asyncio.gather(*(self.execute(call) for call in tool_calls)))
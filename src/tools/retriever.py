@@ -1,36 +1,273 @@
 """Elasticsearch retriever tool."""
 
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-from langchain_elasticsearch import ElasticsearchStore
-from langchain_ollama import OllamaEmbeddings
 
 from src.config.config import Config
+from src.tools.cache import cached_tool
+from src.utils.clients import get_clients
+from src.utils.mmr import rerank_candidates
+from src.utils.rank_fusion import reciprocal_rank_fusion
+from src.utils.readiness import SearchUnavailableError, get_search_readiness
+
+logger = logging.getLogger(__name__)
+
+# Field names used by ElasticsearchStore when indexing
+TEXT_FIELD = "text"
+VECTOR_FIELD = "vector"
 
 
 def get_retriever():
-    """Get configured Elasticsearch vector retriever.
+    """Get a retriever over the configured vector backend.
 
-    Uses Ollama embeddings for semantic search.
+    Uses Ollama embeddings for semantic search, against Elasticsearch or
+    the local memory-mapped store depending on ``VECTOR_BACKEND``. The retriever and its
+    clients are shared process-wide, so connection pools are reused.
+    This LangChain retriever is dense-only; the graph and the
+    ``search_documents`` tool use :func:`asearch_with_scores`, which
+    honours ``RETRIEVAL_MODE``.
     """
-    # Initialize embeddings with dedicated embedding model
-    embeddings = OllamaEmbeddings(
-        model=Config.OLLAMA_EMBEDDING_MODEL,
-        base_url=Config.OLLAMA_BASE_URL
+    # Return as retriever with top 5 results
+    return get_clients().get_retriever(k=5)
+
+
+def _knn_query(query_vector: List[float], k: int, num_candidates: int) -> dict:
+    return {
+        "field": VECTOR_FIELD,
+        "query_vector": query_vector,
+        "k": k,
+        "num_candidates": max(k, num_candidates),
+    }
+
+
+def _hit_to_document(hit: dict) -> Document:
+    source = hit.get("_source", {})
+    return Document(
+        id=hit["_id"],
+        page_content=source.get(TEXT_FIELD, ""),
+        metadata=source.get("metadata", {}),
     )
 
-    # Create vector store
-    vector_store = ElasticsearchStore(
-        es_url=Config.ELASTICSEARCH_URL,
-        index_name=Config.ELASTICSEARCH_INDEX,
-        embedding=embeddings,
+
+def _unpack_hit(hit: dict, score: float) -> Tuple[Document, float, Optional[List[float]]]:
+    return _hit_to_document(hit), score, hit.get("_source", {}).get(VECTOR_FIELD)
+
+
+def get_search_options(config: Optional[RunnableConfig] = None) -> dict:
+    """Read per-request search switches from a runnable config.
+
+    Callers may set ``mmr`` (bool) and ``lexical_weight`` (float) under
+    ``configurable``; unset keys fall back to the Config defaults.
+
+    Args:
+        config: Runnable config of the current graph run
+
+    Returns:
+        Keyword arguments for :func:`asearch_with_scores`
+    """
+    configurable = (config or {}).get("configurable", {})
+    return {
+        "diversify": bool(configurable.get("mmr", Config.MMR_ENABLED)),
+        "lexical_weight": float(configurable.get("lexical_weight", Config.MMR_LEXICAL_WEIGHT)),
+    }
+
+
+def _search_local(store, query_vector: List[float], size: int, with_vectors: bool) -> list:
+    # Re-ingestion by the embedding script rewrites the store files from
+    # another process; remap them if the generation changed since the last search
+    store.refresh()
+    return store.search_by_vector(query_vector, size, with_vectors)
+
+
+async def _asearch_hits(
+    query: str,
+    query_vector: List[float],
+    size: int,
+    mode: str,
+    num_candidates: int,
+    with_vectors: bool,
+) -> List[Tuple[Document, float, Optional[List[float]]]]:
+    """Fetch ranked (document, score, vector) hits in one round-trip.
+
+    The local backend has no lexical index, so it always runs a dense
+    search; lexical signals then come only from MMR re-scoring.
+    """
+    clients = get_clients()
+    if Config.VECTOR_BACKEND == "local":
+        return await asyncio.wait_for(
+            asyncio.to_thread(_search_local, clients.get_vector_store(), query_vector, size, with_vectors),
+            timeout=Config.RETRIEVAL_SEARCH_TIMEOUT,
+        )
+
+    es_client = clients.get_async_es_client()
+    source_fields = [TEXT_FIELD, "metadata"] + ([VECTOR_FIELD] if with_vectors else [])
+
+    if mode != "hybrid":
+        response = await asyncio.wait_for(
+            es_client.search(
+                index=Config.ELASTICSEARCH_INDEX,
+                knn=_knn_query(query_vector, size, num_candidates),
+                size=size,
+                source_includes=source_fields,
+            ),
+            timeout=Config.RETRIEVAL_SEARCH_TIMEOUT,
+        )
+        return [_unpack_hit(hit, hit["_score"]) for hit in response["hits"]["hits"]]
+
+    # Fetch a deeper window per list so fusion can promote documents
+    # ranked moderately by both retrievers
+    window = max(size, Config.RETRIEVAL_RRF_WINDOW)
+    header = {"index": Config.ELASTICSEARCH_INDEX}
+    source = {"includes": source_fields}
+    response = await asyncio.wait_for(
+        es_client.msearch(
+            searches=[
+                header,
+                {"query": {"match": {TEXT_FIELD: query}}, "size": window, "_source": source},
+                header,
+                {"knn": _knn_query(query_vector, window, num_candidates), "size": window, "_source": source},
+            ],
+        ),
+        timeout=Config.RETRIEVAL_SEARCH_TIMEOUT,
     )
 
-    # Return as retriever with top 5 results
-    return vector_store.as_retriever(search_kwargs={"k": 5})
+    rankings, weights, hits_by_id = [], [], {}
+    for name, result, weight in zip(
+        ("lexical", "vector"),
+        response["responses"],
+        (Config.RETRIEVAL_LEXICAL_WEIGHT, Config.RETRIEVAL_VECTOR_WEIGHT),
+    ):
+        if "error" in result:
+            logger.warning("Hybrid search: %s query failed: %s", name, result["error"])
+            continue
+        hits = result["hits"]["hits"]
+        rankings.append([hit["_id"] for hit in hits])
+        weights.append(weight)
+        for hit in hits:
+            hits_by_id.setdefault(hit["_id"], hit)
+
+    if not rankings:
+        raise RuntimeError("Hybrid search failed: both lexical and vector queries returned errors")
+
+    fused = reciprocal_rank_fusion(rankings, weights, rank_constant=Config.RETRIEVAL_RRF_K)
+    return [_unpack_hit(hits_by_id[doc_id], score) for doc_id, score in fused[:size]]
+
+
+async def asearch_with_scores(
+    query: str,
+    k: int = 5,
+    mode: Optional[str] = None,
+    num_candidates: Optional[int] = None,
+    diversify: Optional[bool] = None,
+    lexical_weight: Optional[float] = None,
+) -> List[Tuple[Document, float]]:
+    """Run an async search without blocking the event loop.
+
+    The query embedding and the Elasticsearch search are separate stages,
+    each bounded by its own timeout. While Elasticsearch is not ready the
+    call fails immediately, before embedding the query. Cancelling the calling task (e.g. when
+    the client disconnects) aborts whichever request is in flight.
+
+    In hybrid mode a BM25 match query and a kNN query are sent in one
+    ``_msearch`` round-trip and fused client-side with weighted reciprocal
+    rank fusion, so exact terms such as product codes are found even when
+    their embeddings are not close to the query.
+
+    With ``diversify``, ``MMR_FETCH_K`` candidates are fetched together
+    with their stored vectors and narrowed to ``k`` by maximal marginal
+    relevance, optionally blending in lexical coverage of the query. In
+    hybrid mode the fused RRF scores are part of the relevance term, so the
+    lexical ranking is not lost by re-ranking.
+
+    Args:
+        query: Search query string
+        k: Number of documents to return
+        mode: "hybrid" or "dense" (defaults to ``RETRIEVAL_MODE``)
+        num_candidates: kNN candidates per shard (defaults to
+            ``RETRIEVAL_NUM_CANDIDATES``)
+        diversify: Apply MMR selection (defaults to ``MMR_ENABLED``)
+        lexical_weight: Lexical re-scoring weight for MMR (defaults to
+            ``MMR_LEXICAL_WEIGHT``)
+
+    Returns:
+        List of (document, score) pairs, best first. Scores are
+        similarities in dense mode, fused RRF scores in hybrid mode, and
+        re-scored relevance when diversified.
+
+    Raises:
+        asyncio.TimeoutError: If a stage exceeds its configured timeout
+        SearchUnavailableError: If the Elasticsearch cluster or index is not ready
+    """
+    mode = mode or Config.RETRIEVAL_MODE
+    num_candidates = num_candidates or Config.RETRIEVAL_NUM_CANDIDATES
+    diversify = Config.MMR_ENABLED if diversify is None else diversify
+    lexical_weight = Config.MMR_LEXICAL_WEIGHT if lexical_weight is None else lexical_weight
+
+    readiness = get_search_readiness()
+    await readiness.ensure_ready()
+
+    query_vector = await asyncio.wait_for(
+        get_clients().get_embeddings().aembed_query(query),
+        timeout=Config.RETRIEVAL_EMBED_TIMEOUT,
+    )
+
+    fetch_k = max(k, Config.MMR_FETCH_K) if diversify else k
+    try:
+        hits = await _asearch_hits(
+            query,
+            query_vector,
+            fetch_k,
+            mode,
+            max(num_candidates, fetch_k) if diversify else num_candidates,
+            with_vectors=diversify,
+        )
+    except Exception as e:
+        # Connection failures and search timeouts send readiness back to
+        # probing; the embedding timeout above is not a search failure
+        readiness.report_failure(e)
+        raise
+
+    if not diversify:
+        return [(doc, score) for doc, score, _ in hits]
+
+    candidates = [(doc, vector) for doc, _, vector in hits if vector]
+    if len(candidates) < len(hits):
+        # Vectors are not stored in _source; keep the engine's ranking
+        logger.debug("MMR skipped: %d of %d hits lack stored vectors", len(hits) - len(candidates), len(hits))
+        return [(doc, score) for doc, score, _ in hits[:k]]
+
+    # The local backend has no lexical index; its hits are dense-only
+    hybrid = mode == "hybrid" and Config.VECTOR_BACKEND != "local"
+    return rerank_candidates(
+        query,
+        query_vector,
+        candidates,
+        k,
+        lambda_mult=Config.MMR_LAMBDA,
+        lexical_weight=lexical_weight,
+        # Keep the BM25 signal of hybrid fusion in the relevance term
+        prior_scores=[score for _, score, _ in hits] if hybrid else None,
+        prior_weight=Config.MMR_FUSION_WEIGHT,
+    )
+
+
+def _search_cache_args(arguments: dict) -> dict:
+    # Key on the effective search options, not the whole runnable config
+    return {**arguments, "config": get_search_options(arguments.get("config"))}
 
 
 @tool
-def search_documents(query: str) -> str:
+@cached_tool(
+    ttl=300,
+    generation=lambda: get_clients().aget_index_generation(),
+    normalize=_search_cache_args,
+)
+async def search_documents(query: str, config: RunnableConfig) -> str:
     """Search documents in Elasticsearch.
 
     Args:
@@ -40,8 +277,8 @@ def search_documents(query: str) -> str:
         Retrieved documents as formatted string
     """
     try:
-        retriever = get_retriever()
-        docs = retriever.invoke(query)
+        results = await asearch_with_scores(query, k=5, **get_search_options(config))
+        docs = [doc for doc, _ in results]
 
         if not docs:
             return "No documents found."
@@ -53,5 +290,9 @@ def search_documents(query: str) -> str:
 
         return "\n\n".join(result)
 
+    except asyncio.TimeoutError:
+        return "Error searching documents: timed out"
+    except SearchUnavailableError:
+        return "Error searching documents: search index is not ready, try again shortly"
     except Exception as e:
         return f"Error searching documents: {str(e)}"
@@ -2,8 +2,11 @@
 
 from langchain_core.tools import tool
 
+from src.tools.cache import cached_tool
+
 
 @tool
+@cached_tool(ttl=600, normalize=lambda args: {"location": args["location"].strip().lower()})
 def get_weather(location: str) -> str:
     """Get the current weather for a location.
 
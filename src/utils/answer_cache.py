@@ -0,0 +1,227 @@
+"""Semantic answer cache.
+
+Reuses a previous final answer when a new query embeds close enough to a
+cached one and retrieval returned the same documents, skipping the LLM
+generation entirely. Hits and the LLM seconds they saved are exported
+through :func:`src.utils.metrics.render_metrics`.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config.config import Config
+from src.utils.metrics import get_metrics, render_samples
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedAnswer:
+    """A cached final answer and the context it was produced in."""
+
+    answer: str
+    doc_ids: Tuple[str, ...]
+    generation: str
+    llm_seconds: float
+    last_used: float
+
+
+class SemanticAnswerCache:
+    """Fixed-capacity vector index over cached queries.
+
+    Query vectors are L2-normalized and kept in one preallocated float32
+    matrix, so a lookup is a single matrix-vector product. When the cache
+    is full the least recently used slot is overwritten. All entries are
+    dropped when the index generation changes.
+    """
+
+    def __init__(self, max_entries: int = 1000, threshold: float = 0.95):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached answers
+            threshold: Minimum cosine similarity for a hit
+        """
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self._entries: List[Optional[CachedAnswer]] = [None] * max_entries
+        self._size = 0
+        self._generation: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.llm_seconds_saved = 0.0
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
+
+    def _check_generation(self, generation: str) -> None:
+        """Drop every entry if the index generation changed."""
+        if self._generation != generation:
+            if self._size:
+                self.invalidations += 1
+                logger.info("Index changed, invalidating %d cached answers", self._size)
+            self._entries = [None] * self.max_entries
+            self._size = 0
+            self._generation = generation
+
+    def lookup(
+        self,
+        vector: Sequence[float],
+        doc_ids: Sequence[str],
+        generation: str,
+    ) -> Optional[Tuple[CachedAnswer, float]]:
+        """Find a cached answer for a query.
+
+        Args:
+            vector: Query embedding
+            doc_ids: IDs of the documents retrieved for the query
+            generation: Current index generation
+
+        Returns:
+            (cached answer, similarity), or None on a miss
+        """
+        query = self._normalize(vector)
+        key = tuple(doc_ids)
+        with self._lock:
+            self._check_generation(generation)
+            if self._size == 0 or self._matrix is None or self._matrix.shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+
+            similarities = self._matrix[:self._size] @ query
+            for slot in np.argsort(-similarities):
+                similarity = float(similarities[slot])
+                if similarity < self.threshold:
+                    break
+                entry = self._entries[slot]
+                if entry is not None and entry.doc_ids == key:
+                    entry.last_used = time.time()
+                    self.hits += 1
+                    self.llm_seconds_saved += entry.llm_seconds
+                    return entry, similarity
+
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        vector: Sequence[float],
+        answer: str,
+        doc_ids: Sequence[str],
+        generation: str,
+        llm_seconds: float,
+    ) -> None:
+        """Cache a final answer.
+
+        Args:
+            vector: Query embedding
+            answer: Final answer text
+            doc_ids: IDs of the documents the answer was grounded on
+            generation: Index generation at answer time
+            llm_seconds: LLM time spent producing the answer
+        """
+        query = self._normalize(vector)
+        with self._lock:
+            self._check_generation(generation)
+            if self._matrix is None or self._matrix.shape[1] != query.shape[0]:
+                self._matrix = np.zeros((self.max_entries, query.shape[0]), dtype=np.float32)
+                self._entries = [None] * self.max_entries
+                self._size = 0
+
+            if self._size < self.max_entries:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = min(range(self._size), key=lambda i: self._entries[i].last_used)
+                self.evictions += 1
+
+            self._matrix[slot] = query
+            self._entries[slot] = CachedAnswer(
+                answer=answer,
+                doc_ids=tuple(doc_ids),
+                generation=generation,
+                llm_seconds=llm_seconds,
+                last_used=time.time(),
+            )
+            self.stores += 1
+
+    def stats(self) -> dict:
+        """Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, size and LLM seconds saved
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": self._size,
+                "llm_seconds_saved": round(self.llm_seconds_saved, 3),
+            }
+
+
+_answer_cache: Optional[SemanticAnswerCache] = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> SemanticAnswerCache:
+    """Get the process-wide answer cache.
+
+    Returns:
+        Shared SemanticAnswerCache configured from ``ANSWER_CACHE_*`` settings
+    """
+    global _answer_cache
+    with _answer_cache_lock:
+        if _answer_cache is None:
+            _answer_cache = SemanticAnswerCache(
+                max_entries=Config.ANSWER_CACHE_SIZE,
+                threshold=Config.ANSWER_CACHE_THRESHOLD,
+            )
+        return _answer_cache
+
+
+def _collect_metrics() -> List[str]:
+    """Export the answer cache counters, once the cache exists."""
+    if _answer_cache is None:
+        return []
+    stats = _answer_cache.stats()
+    events = {"hit": "hits", "miss": "misses", "store": "stores", "eviction": "evictions",
+              "invalidation": "invalidations"}
+    return (
+        render_samples(
+            "langgraph_answer_cache_events_total",
+            "counter",
+            "Semantic answer cache lookups and updates by event.",
+            ("event",),
+            {(event,): stats[key] for event, key in events.items()},
+        )
+        + render_samples(
+            "langgraph_answer_cache_llm_seconds_saved_total",
+            "counter",
+            "LLM generation seconds saved by answer cache hits.",
+            (),
+            {(): stats["llm_seconds_saved"]},
+        )
+        + render_samples(
+            "langgraph_answer_cache_entries", "gauge", "Cached answers.", (), {(): stats["size"]}
+        )
+    )
+
+
+get_metrics().add_collector(_collect_metrics)
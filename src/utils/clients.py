@@ -0,0 +1,363 @@
+"""Process-wide client registry.
+
+Embedding and Elasticsearch clients keep their own HTTP connection pools,
+so they are created once per process and shared by every node and tool
+instead of being rebuilt on each call.
+
+The Elasticsearch and Ollama client libraries are imported when the
+first client is created, so the local backend never loads them.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore, VectorStoreRetriever
+
+from src.config.config import Config
+from src.utils.embedding_cache import CachedEmbeddings, EmbeddingCache
+from src.utils.llm import get_keep_alive
+from src.utils.local_vector_store import LocalVectorStore
+
+if TYPE_CHECKING:
+    from elasticsearch import AsyncElasticsearch, Elasticsearch
+
+logger = logging.getLogger(__name__)
+
+
+def get_es_connection_params() -> dict:
+    """Build Elasticsearch connection parameters from configuration.
+
+    Returns:
+        Keyword arguments for the Elasticsearch client constructors
+    """
+    params = {"hosts": [Config.ELASTICSEARCH_URL]}
+    if Config.ELASTICSEARCH_API_KEY:
+        params["api_key"] = Config.ELASTICSEARCH_API_KEY
+    elif Config.ELASTICSEARCH_USER and Config.ELASTICSEARCH_PASSWORD:
+        params["basic_auth"] = (Config.ELASTICSEARCH_USER, Config.ELASTICSEARCH_PASSWORD)
+    return params
+
+
+def create_local_vector_store(embedding: Embeddings, index_name: Optional[str] = None) -> LocalVectorStore:
+    """Open the local vector store for an index.
+
+    Args:
+        embedding: Embeddings for texts and queries
+        index_name: Index name (defaults to ``ELASTICSEARCH_INDEX``)
+
+    Returns:
+        LocalVectorStore under ``LOCAL_INDEX_PATH``
+    """
+    return LocalVectorStore(
+        Path(Config.LOCAL_INDEX_PATH) / (index_name or Config.ELASTICSEARCH_INDEX),
+        embedding,
+        dtype=Config.LOCAL_INDEX_DTYPE,
+        ivf_min_docs=Config.LOCAL_INDEX_IVF_MIN_DOCS,
+        nprobe=Config.LOCAL_INDEX_NPROBE,
+    )
+
+
+class ClientRegistry:
+    """Lazily created clients shared across threads and the event loop.
+
+    Every getter is guarded by a single lock, so concurrent first calls
+    from worker threads still construct each client exactly once. The
+    clients themselves are thread-safe and pool their connections.
+    """
+
+    def __init__(self, embeddings: Optional[Embeddings] = None, vector_store: Optional[VectorStore] = None):
+        """Initialize the registry.
+
+        Args:
+            embeddings: Embedding model to use instead of OllamaEmbeddings
+            vector_store: Vector store to use instead of the configured one
+        """
+        self._lock = threading.RLock()
+        self._embeddings: Optional[Embeddings] = embeddings
+        self._embedding_cache: Optional[EmbeddingCache] = None
+        self._cached_embeddings: Optional[CachedEmbeddings] = None
+        self._es_client: Optional[Elasticsearch] = None
+        self._async_es_client: Optional[AsyncElasticsearch] = None
+        self._vector_store: Optional[VectorStore] = vector_store
+        self._retrievers: dict = {}
+        self._generation: Optional[str] = None
+        self._generation_checked = 0.0
+
+    def get_embeddings(self) -> Embeddings:
+        """Get the shared embedding client.
+
+        Query embeddings go through the embedding cache unless it is
+        disabled with ``EMBEDDING_CACHE_SIZE=0``.
+
+        Returns:
+            Embeddings bound to the configured embedding model
+        """
+        with self._lock:
+            if self._embeddings is None:
+                from langchain_ollama import OllamaEmbeddings
+
+                self._embeddings = OllamaEmbeddings(
+                    model=Config.OLLAMA_EMBEDDING_MODEL,
+                    base_url=Config.OLLAMA_BASE_URL,
+                    keep_alive=get_keep_alive(Config.OLLAMA_EMBEDDING_MODEL),
+                )
+            if Config.EMBEDDING_CACHE_SIZE <= 0:
+                return self._embeddings
+            if self._cached_embeddings is None:
+                self._cached_embeddings = CachedEmbeddings(
+                    self._embeddings,
+                    self.get_embedding_cache(),
+                    model=Config.OLLAMA_EMBEDDING_MODEL,
+                )
+            return self._cached_embeddings
+
+    def get_embedding_cache(self) -> EmbeddingCache:
+        """Get the shared query-embedding cache.
+
+        Returns:
+            EmbeddingCache configured from ``EMBEDDING_CACHE_*`` settings
+        """
+        with self._lock:
+            if self._embedding_cache is None:
+                self._embedding_cache = EmbeddingCache(
+                    max_size=Config.EMBEDDING_CACHE_SIZE,
+                    ttl=Config.EMBEDDING_CACHE_TTL,
+                    path=Config.EMBEDDING_CACHE_PATH,
+                )
+            return self._embedding_cache
+
+    def get_es_client(self) -> Elasticsearch:
+        """Get the shared synchronous Elasticsearch client.
+
+        Returns:
+            Elasticsearch client with a pooled transport
+        """
+        with self._lock:
+            if self._es_client is None:
+                from elasticsearch import Elasticsearch
+
+                self._es_client = Elasticsearch(**get_es_connection_params())
+            return self._es_client
+
+    def get_async_es_client(self) -> AsyncElasticsearch:
+        """Get the shared asynchronous Elasticsearch client.
+
+        Returns:
+            AsyncElasticsearch client with a pooled transport
+        """
+        with self._lock:
+            if self._async_es_client is None:
+                from elasticsearch import AsyncElasticsearch
+
+                self._async_es_client = AsyncElasticsearch(**get_es_connection_params())
+            return self._async_es_client
+
+    def get_vector_store(self) -> VectorStore:
+        """Get the shared vector store for the configured index.
+
+        Returns:
+            LocalVectorStore when ``VECTOR_BACKEND`` is "local", otherwise
+            an ElasticsearchStore reusing the shared client and embeddings
+        """
+        with self._lock:
+            if self._vector_store is None and Config.VECTOR_BACKEND == "local":
+                self._vector_store = create_local_vector_store(self.get_embeddings())
+            elif self._vector_store is None:
+                from langchain_elasticsearch import ElasticsearchStore
+
+                self._vector_store = ElasticsearchStore(
+                    index_name=Config.ELASTICSEARCH_INDEX,
+                    embedding=self.get_embeddings(),
+                    client=self.get_es_client(),
+                )
+            return self._vector_store
+
+    def get_retriever(self, k: int = 5) -> VectorStoreRetriever:
+        """Get a shared retriever over the vector store.
+
+        Args:
+            k: Number of documents to return
+
+        Returns:
+            Retriever returning the top ``k`` documents
+        """
+        with self._lock:
+            if k not in self._retrievers:
+                self._retrievers[k] = self.get_vector_store().as_retriever(
+                    search_kwargs={"k": k}
+                )
+            return self._retrievers[k]
+
+    async def aget_index_generation(self) -> Optional[str]:
+        """Get a fingerprint that changes whenever the index is modified.
+
+        Built from the index UUID and its document and indexing counters,
+        so re-ingestion or index re-creation yields a new value. Results
+        are reused for ``INDEX_GENERATION_TTL`` seconds.
+
+        Returns:
+            Generation string, or None if Elasticsearch is unreachable
+        """
+        now = time.monotonic()
+        if self._generation is not None and now - self._generation_checked < Config.INDEX_GENERATION_TTL:
+            return self._generation
+
+        if Config.VECTOR_BACKEND == "local":
+            self._generation = self.get_vector_store().generation()
+            self._generation_checked = now
+            return self._generation
+
+        # Skip the round-trip while the cluster is known to be down, so
+        # cache lookups do not wait on it
+        from src.utils.readiness import search_ready
+
+        if not search_ready():
+            return None
+
+        try:
+            response = await self.get_async_es_client().indices.stats(
+                index=Config.ELASTICSEARCH_INDEX,
+                metric=["docs", "indexing"],
+            )
+        except Exception as e:
+            logger.warning("Failed to read index stats: %s", e)
+            return None
+
+        parts = []
+        for name, index_stats in sorted(response.get("indices", {}).items()):
+            primaries = index_stats.get("primaries", {})
+            docs = primaries.get("docs", {})
+            indexing = primaries.get("indexing", {})
+            parts.append(
+                f"{name}/{index_stats.get('uuid')}/{docs.get('count')}/{docs.get('deleted')}"
+                f"/{indexing.get('index_total')}/{indexing.get('delete_total')}"
+            )
+
+        self._generation = ";".join(parts)
+        self._generation_checked = now
+        return self._generation
+
+    def close(self) -> None:
+        """Close all pooled connections held by the registry."""
+        with self._lock:
+            if self._es_client is not None:
+                try:
+                    self._es_client.close()
+                except Exception as e:
+                    logger.warning("Failed to close Elasticsearch client: %s", e)
+            ollama_client = getattr(self._embeddings, "_client", None)
+            if ollama_client is not None:
+                try:
+                    ollama_client.close()
+                except Exception as e:
+                    logger.warning("Failed to close Ollama client: %s", e)
+
+            # The async transport is bound to its event loop and cannot be
+            # closed from here; use aclose() while the loop is running.
+            self._embeddings = None
+            self._cached_embeddings = None
+            self._es_client = None
+            self._async_es_client = None
+            self._vector_store = None
+            self._retrievers = {}
+
+    async def aclose(self) -> None:
+        """Close async connections, then the synchronous ones."""
+        with self._lock:
+            async_es_client = self._async_es_client
+            embeddings = self._embeddings
+            self._async_es_client = None
+
+        if async_es_client is not None:
+            try:
+                await async_es_client.close()
+            except Exception as e:
+                logger.warning("Failed to close async Elasticsearch client: %s", e)
+        ollama_async_client = getattr(embeddings, "_async_client", None)
+        if ollama_async_client is not None:
+            try:
+                await ollama_async_client.close()
+            except Exception as e:
+                logger.warning("Failed to close async Ollama client: %s", e)
+
+        self.close()
+
+
+_registry: Optional[ClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_clients() -> ClientRegistry:
+    """Get the process-wide client registry, creating it on first use.
+
+    Returns:
+        Shared ClientRegistry instance
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ClientRegistry()
+        return _registry
+
+
+def set_clients(registry: ClientRegistry) -> None:
+    """Install a client registry, e.g. one built around fake models.
+
+    Args:
+        registry: Registry returned by later get_clients() calls
+    """
+    global _registry
+    with _registry_lock:
+        _registry = registry
+
+
+def init_clients() -> ClientRegistry:
+    """Eagerly create the shared clients.
+
+    Called once during graph initialization so the first request does not
+    pay for client construction.
+
+    Returns:
+        Shared ClientRegistry instance
+    """
+    registry = get_clients()
+    registry.get_vector_store()
+    if Config.VECTOR_BACKEND != "local":
+        registry.get_async_es_client()
+    logger.info("Shared clients initialized.")
+    return registry
+
+
+def close_clients() -> None:
+    """Close the shared clients, if they were created."""
+    global _registry
+    with _registry_lock:
+        registry = _registry
+        _registry = None
+    if registry is not None:
+        registry.close()
+        logger.info("Shared clients closed.")
+
+
+async def aclose_clients() -> None:
+    """Close the shared clients from within the running event loop.
+
+    Called from the lifespan of the HTTP app in :mod:`src.webapp`.
+    """
+    global _registry
+    with _registry_lock:
+        registry = _registry
+        _registry = None
+    if registry is not None:
+        await registry.aclose()
+        logger.info("Shared clients closed.")
+
+
+atexit.register(close_clients)
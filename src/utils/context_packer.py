@@ -0,0 +1,210 @@
+"""Token-aware packing of retrieved chunks into prompt context.
+
+Ingestion splits files into overlapping chunks, so the top hits for a
+query often repeat the same text. The packer merges overlapping chunks
+from the same source, drops near-duplicates, and fills a token budget
+best-first so the most relevant passages survive truncation.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from src.utils.tokens import estimate_tokens
+
+# Shortest suffix/prefix match treated as chunk overlap
+MIN_OVERLAP_CHARS = 20
+# Longest overlap searched for (ingestion default overlap is 200)
+MAX_OVERLAP_CHARS = 400
+# Character shingle size, and the share of a passage's shingles already
+# present in a selected passage above which it counts as a duplicate
+SHINGLE_SIZE = 5
+DUPLICATE_THRESHOLD = 0.8
+# Do not add a truncated passage smaller than this
+MIN_PASSAGE_TOKENS = 40
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+@dataclass
+class Passage:
+    """A contiguous piece of text from one source."""
+
+    text: str
+    score: float
+    source: Optional[str]
+    doc_ids: List[str] = field(default_factory=list)
+
+
+def merge_overlap(first: str, second: str) -> Optional[str]:
+    """Join two chunks if the end of one is the start of the other.
+
+    Args:
+        first: Chunk expected to come first
+        second: Chunk expected to come second
+
+    Returns:
+        Merged text, or None if the chunks do not overlap
+    """
+    if second in first:
+        return first
+    tail = first[-MAX_OVERLAP_CHARS:]
+    probe = second[:MIN_OVERLAP_CHARS]
+    if len(probe) < MIN_OVERLAP_CHARS:
+        return None
+
+    start = tail.find(probe)
+    while start != -1:
+        overlap = tail[start:]
+        if second.startswith(overlap):
+            return first + second[len(overlap):]
+        start = tail.find(probe, start + 1)
+    return None
+
+
+def _shingles(text: str) -> set:
+    text = " ".join(text.split()).lower()
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def _containment(candidate: set, selected: set) -> float:
+    if not candidate:
+        return 0.0
+    return len(candidate & selected) / len(candidate)
+
+
+def _merge_source_passages(passages: List[Passage]) -> List[Passage]:
+    """Repeatedly merge overlapping passages until none overlap."""
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(passages)):
+            for j in range(len(passages)):
+                if i == j:
+                    continue
+                text = merge_overlap(passages[i].text, passages[j].text)
+                if text is None:
+                    continue
+                passages[i] = Passage(
+                    text=text,
+                    score=max(passages[i].score, passages[j].score),
+                    source=passages[i].source,
+                    doc_ids=passages[i].doc_ids + passages[j].doc_ids,
+                )
+                del passages[j]
+                merged = True
+                break
+            if merged:
+                break
+    return passages
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Cut text to a token budget, preferring sentence boundaries.
+
+    Args:
+        text: Text to cut
+        budget: Maximum number of tokens
+
+    Returns:
+        Truncated text
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+
+    kept, used = [], 0
+    for sentence in _SENTENCE_END.split(text):
+        tokens = estimate_tokens(sentence) + 1
+        if used + tokens > budget:
+            break
+        kept.append(sentence)
+        used += tokens
+    if kept:
+        return " ".join(kept)
+
+    # First sentence alone is too long; binary-search a character cut
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
+
+
+def pack_documents(
+    scored_docs: Sequence[Tuple[Document, float]],
+    token_budget: int,
+) -> List[Passage]:
+    """Select passages that fit a token budget.
+
+    Args:
+        scored_docs: Retrieved (document, score) pairs
+        token_budget: Maximum number of tokens across all passages
+
+    Returns:
+        Passages ordered best first
+    """
+    by_source: dict = {}
+    for doc, score in scored_docs:
+        source = doc.metadata.get("source")
+        passage = Passage(
+            text=doc.page_content.strip(),
+            score=score,
+            source=source,
+            doc_ids=[doc.id] if doc.id else [],
+        )
+        if passage.text:
+            by_source.setdefault(source, []).append(passage)
+
+    candidates = []
+    for source, passages in by_source.items():
+        if source is None:
+            candidates.extend(passages)
+        else:
+            candidates.extend(_merge_source_passages(passages))
+    candidates.sort(key=lambda p: p.score, reverse=True)
+
+    selected, selected_shingles, used = [], [], 0
+    for passage in candidates:
+        shingles = _shingles(passage.text)
+        if any(_containment(shingles, other) >= DUPLICATE_THRESHOLD for other in selected_shingles):
+            continue
+
+        remaining = token_budget - used
+        tokens = estimate_tokens(passage.text)
+        if tokens > remaining:
+            if remaining < MIN_PASSAGE_TOKENS:
+                break
+            passage.text = truncate_to_tokens(passage.text, remaining)
+            tokens = estimate_tokens(passage.text)
+
+        selected.append(passage)
+        selected_shingles.append(shingles)
+        used += tokens
+    return selected
+
+
+def format_passages(passages: Sequence[Passage]) -> str:
+    """Format packed passages as prompt context.
+
+    Args:
+        passages: Passages from :func:`pack_documents`
+
+    Returns:
+        Numbered context block, or an empty string if there are none
+    """
+    if not passages:
+        return ""
+
+    context_parts = ["Retrieved Documents:\n"]
+    for i, passage in enumerate(passages, 1):
+        label = f" (source: {Path(passage.source).name})" if passage.source else ""
+        context_parts.append(f"{i}.{label} {passage.text}\n")
+    return "\n".join(context_parts)
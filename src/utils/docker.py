@@ -1,9 +1,18 @@
-"""Docker container management utilities."""
+"""Docker container management utilities.
 
+Waiting for the cluster uses the async readiness probe from
+:mod:`src.utils.readiness` against ``ELASTICSEARCH_URL``.
+"""
+
+import asyncio
 import logging
 import subprocess
-import time
 from pathlib import Path
+from typing import Optional
+
+from src.config.config import Config
+from src.utils.clients import get_es_connection_params
+from src.utils.readiness import SearchReadiness
 
 logger = logging.getLogger(__name__)
 
@@ -43,11 +52,33 @@ def is_elasticsearch_running() -> bool:
         return False
 
 
-def start_elasticsearch() -> bool:
-    """Start Elasticsearch using docker-compose.
+async def await_elasticsearch(timeout: Optional[float] = None) -> bool:
+    """Wait until the configured cluster reaches ``ELASTICSEARCH_WAIT_FOR_STATUS``.
+
+    Probes ``ELASTICSEARCH_URL`` with jittered exponential backoff using a
+    dedicated client, so the shared client is not bound to this event loop.
+
+    Args:
+        timeout: Seconds to wait (defaults to ``ELASTICSEARCH_READY_TIMEOUT``)
+
+    Returns:
+        True if the cluster became healthy in time
+    """
+    from elasticsearch import AsyncElasticsearch
+
+    client = AsyncElasticsearch(**get_es_connection_params())
+    try:
+        readiness = SearchReadiness(require_index=False, client=client)
+        return await readiness.wait(Config.ELASTICSEARCH_READY_TIMEOUT if timeout is None else timeout)
+    finally:
+        await client.close()
+
+
+async def astart_elasticsearch() -> bool:
+    """Start Elasticsearch using docker-compose and wait until it is healthy.
 
     Returns:
-        True if started successfully
+        True if started and healthy within ``ELASTICSEARCH_READY_TIMEOUT``
     """
     project_root = Path(__file__).parent.parent.parent
     compose_file = project_root / "docker-compose.yml"
@@ -58,53 +89,60 @@ def start_elasticsearch() -> bool:
 
     try:
         logger.info("Starting Elasticsearch containers...")
-        result = subprocess.run(
-            ["docker-compose", "up", "-d"],
+        process = await asyncio.create_subprocess_exec(
+            "docker-compose",
+            "up",
+            "-d",
             cwd=project_root,
-            capture_output=True,
-            text=True,
-            timeout=60,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout=60)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            logger.error("Docker compose command timed out")
+            return False
 
-        if result.returncode != 0:
-            logger.error("Failed to start containers: %s", result.stderr)
+        if process.returncode != 0:
+            logger.error("Failed to start containers: %s", stderr.decode(errors="replace"))
             return False
 
-        logger.info("Waiting for Elasticsearch to be healthy...")
-        max_retries = 30
-        for i in range(max_retries):
-            if is_elasticsearch_healthy():
-                logger.info("Elasticsearch is ready.")
-                logger.info("Kibana available at: http://localhost:5601")
-                return True
-            time.sleep(2)
-            if i % 5 == 0:
-                logger.info("Still waiting... (%s/%s)", i, max_retries)
-
-        logger.warning("Elasticsearch started but health check timed out")
-        return True
-
-    except subprocess.TimeoutExpired:
-        logger.error("Docker compose command timed out")
-        return False
     except FileNotFoundError:
         logger.error("docker-compose command not found. Please install Docker Compose.")
         return False
 
+    logger.info("Waiting for Elasticsearch to be %s...", Config.ELASTICSEARCH_WAIT_FOR_STATUS)
+    if not await await_elasticsearch():
+        logger.error(
+            "Elasticsearch did not become %s within %ss",
+            Config.ELASTICSEARCH_WAIT_FOR_STATUS,
+            Config.ELASTICSEARCH_READY_TIMEOUT,
+        )
+        return False
+
+    logger.info("Elasticsearch is ready.")
+    logger.info("Kibana available at: http://localhost:5601")
+    return True
 
-def is_elasticsearch_healthy() -> bool:
-    """Check if Elasticsearch is healthy and responding.
+
+def start_elasticsearch() -> bool:
+    """Start Elasticsearch using docker-compose.
 
     Returns:
-        True if Elasticsearch is healthy
+        True if started and healthy within ``ELASTICSEARCH_READY_TIMEOUT``
     """
-    try:
-        import requests
+    return asyncio.run(astart_elasticsearch())
 
-        response = requests.get("http://localhost:9200/_cluster/health", timeout=2)
-        return response.status_code == 200
-    except Exception:
-        return False
+
+def is_elasticsearch_healthy() -> bool:
+    """Check if the configured Elasticsearch cluster is healthy.
+
+    Returns:
+        True if the cluster health is at least ``ELASTICSEARCH_WAIT_FOR_STATUS``
+    """
+    return asyncio.run(await_elasticsearch(timeout=0))
 
 
 def ensure_elasticsearch_running() -> bool:
@@ -119,7 +157,8 @@ def ensure_elasticsearch_running() -> bool:
 
     if is_elasticsearch_running():
         logger.info("Elasticsearch container is already running")
-        return True
+        # The container may still be starting up
+        return asyncio.run(await_elasticsearch())
 
     logger.info("Elasticsearch not running, starting automatically...")
     return start_elasticsearch()
@@ -0,0 +1,246 @@
+"""Query-embedding cache.
+
+Sits in front of the embedding client so repeated queries (FAQ traffic,
+the agent re-running ``search_documents`` with a query it already used)
+skip the Ollama round-trip.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from src.utils.metrics import note_cache
+from src.utils.vector_file import VectorFile
+
+logger = logging.getLogger(__name__)
+
+# Pruning the disk store leaves this share of max_size free, so it runs
+# once per batch of new entries rather than on every put
+_DISK_PRUNE_SLACK = 0.1
+# Rewrite the disk store once removed and shadowed rows exceed this share
+_COMPACT_DEAD_FRACTION = 0.5
+
+
+def normalize_query(text: str) -> str:
+    """Normalize query text so trivially different spellings share a key.
+
+    Applies NFKC normalization, case folding and whitespace collapsing.
+
+    Args:
+        text: Raw query text
+
+    Returns:
+        Normalized text
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(text.split())
+
+
+def make_cache_key(model: str, text: str) -> str:
+    """Build a cache key from the model name and normalized text.
+
+    Args:
+        model: Embedding model name
+        text: Query text
+
+    Returns:
+        Hex digest identifying the (model, text) pair
+    """
+    payload = f"{model}\0{normalize_query(text)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class EmbeddingCache:
+    """Bounded LRU cache of embeddings with a TTL.
+
+    When ``path`` is given, entries are also written to a memory-mapped
+    :class:`VectorFile` and served from it after a restart. The disk store
+    is bounded by the same ``max_size`` and ``ttl``: expired and oldest
+    entries are pruned, and the files are compacted when mostly dead.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 86400, path: Optional[str] = None):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries, in memory and on disk
+            ttl: Entry lifetime in seconds (0 disables expiry)
+            path: Optional base path of the on-disk store
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = VectorFile(path) if path else None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        if self._disk is not None:
+            self._prune_disk(self.max_size)
+
+    def _expired(self, written_at: float, now: float) -> bool:
+        return self.ttl > 0 and now - written_at > self.ttl
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Look up an embedding.
+
+        Args:
+            key: Cache key from :func:`make_cache_key`
+
+        Returns:
+            Cached vector, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                vector, written_at = entry
+                if not self._expired(written_at, now):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return vector
+                del self._entries[key]
+
+        if self._disk is not None:
+            stored = self._disk.get(key)
+            if stored is not None and not self._expired(stored[1], now):
+                with self._lock:
+                    self._insert(key, stored[0], stored[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                return stored[0]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    @property
+    def persistent(self) -> bool:
+        """Whether entries are also written to disk."""
+        return self._disk is not None
+
+    def put(self, key: str, vector: List[float], persist: bool = True) -> None:
+        """Store an embedding.
+
+        Args:
+            key: Cache key from :func:`make_cache_key`
+            vector: Embedding vector
+            persist: Also write it to disk; async callers pass False and
+                run :meth:`persist` in a thread instead
+        """
+        with self._lock:
+            self._insert(key, vector, time.time())
+        if persist:
+            self.persist(key, vector)
+
+    def persist(self, key: str, vector: List[float]) -> None:
+        """Write an embedding to the disk store, pruning it when full.
+
+        Blocking: appends to the file and may compact it.
+
+        Args:
+            key: Cache key from :func:`make_cache_key`
+            vector: Embedding vector
+        """
+        if self._disk is None:
+            return
+        try:
+            self._disk.append(key, vector)
+            if len(self._disk) > self.max_size:
+                self._prune_disk(int(self.max_size * (1 - _DISK_PRUNE_SLACK)))
+        except Exception as e:
+            logger.warning("Failed to persist embedding: %s", e)
+
+    def _prune_disk(self, max_entries: int) -> None:
+        """Drop expired and oldest disk entries, compacting if mostly dead."""
+        removed = self._disk.prune(max_entries=max_entries, max_age=self.ttl)
+        with self._lock:
+            self.disk_evictions += removed
+        if self._disk.dead_fraction > _COMPACT_DEAD_FRACTION:
+            self._disk.compact()
+
+    def _insert(self, key: str, vector: List[float], written_at: float) -> None:
+        self._entries[key] = (vector, written_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all in-memory entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, disk hits, evictions and sizes
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "size": len(self._entries),
+                "disk_size": len(self._disk) if self._disk is not None else 0,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that serves query embeddings from a cache.
+
+    Document embedding is passed through unchanged.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model: str):
+        """Wrap an embedding client.
+
+        Args:
+            embeddings: Underlying embedding client
+            cache: Cache to consult
+            model: Model name used in cache keys
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model = model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        key = make_cache_key(self.model, text)
+        vector = self.cache.get(key)
+        note_cache("embedding", vector is not None)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self.cache.put(key, vector)
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = make_cache_key(self.model, text)
+        vector = self.cache.get(key)
+        note_cache("embedding", vector is not None)
+        if vector is None:
+            vector = await self.embeddings.aembed_query(text)
+            # The disk write may prune and compact, so keep it off the loop
+            self.cache.put(key, vector, persist=False)
+            if self.cache.persistent:
+                await asyncio.to_thread(self.cache.persist, key, vector)
+        return vector
@@ -0,0 +1,284 @@
+"""Safe arithmetic expression engine.
+
+Expressions are parsed once into a Python AST, checked against a
+whitelist of operators and functions, and compiled into a tree of
+closures that is cached by source text. Evaluation enforces limits on
+the number of operations and on the size of numbers, so inputs like
+``9**9**9`` are rejected instead of pinning a CPU.
+
+Scalars follow Python semantics. List literals and list-valued variables
+become NumPy arrays and are evaluated element-wise, so one call can
+compute over a whole series (e.g. ``mean([3, 5, 8]) * 2``).
+"""
+
+import ast
+import math
+import operator
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+MAX_EXPRESSION_LENGTH = 1000
+MAX_NODES = 300
+MAX_OPERATIONS = 100_000
+MAX_INT_BITS = 4096
+MAX_ARRAY_SIZE = 10_000
+
+
+class ExpressionError(ValueError):
+    """Raised for invalid expressions or exceeded evaluation limits."""
+
+
+def _reduce(func: Callable) -> Callable:
+    """Wrap a reduction so it accepts one array or several scalars."""
+    def reduced(*args):
+        if not args:
+            raise ExpressionError("Function requires at least one argument")
+        values = args[0] if len(args) == 1 else np.asarray(args, dtype=float)
+        return func(values)
+    return reduced
+
+
+FUNCTIONS: Dict[str, Callable] = {
+    "abs": np.abs,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "log2": np.log2,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "floor": np.floor,
+    "ceil": np.ceil,
+    "round": np.round,
+    "sum": _reduce(np.sum),
+    "prod": _reduce(np.prod),
+    "mean": _reduce(np.mean),
+    "median": _reduce(np.median),
+    "std": _reduce(np.std),
+    "var": _reduce(np.var),
+    "min": _reduce(np.min),
+    "max": _reduce(np.max),
+    "cumsum": np.cumsum,
+    "len": lambda values: np.size(values),
+}
+
+CONSTANTS: Dict[str, float] = {"pi": math.pi, "e": math.e}
+
+_BINARY_OPERATORS: Dict[type, Callable] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+_UNARY_OPERATORS: Dict[type, Callable] = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+class _Budget:
+    """Counts operations during one evaluation."""
+
+    def __init__(self):
+        self.operations = 0
+
+    def spend(self, value) -> None:
+        self.operations += int(np.size(value)) if isinstance(value, np.ndarray) else 1
+        if self.operations > MAX_OPERATIONS:
+            raise ExpressionError("Expression is too expensive to evaluate")
+
+
+def _check_value(value):
+    """Reject numbers and arrays beyond the size limits."""
+    if isinstance(value, bool):
+        raise ExpressionError("Boolean values are not supported")
+    if isinstance(value, complex):
+        raise ExpressionError("Complex results are not supported")
+    if isinstance(value, int):
+        if value.bit_length() > MAX_INT_BITS:
+            raise ExpressionError("Result is too large")
+    elif isinstance(value, float):
+        if not math.isfinite(value):
+            raise ExpressionError("Result is not a finite number")
+    elif isinstance(value, np.ndarray):
+        if value.size > MAX_ARRAY_SIZE:
+            raise ExpressionError("Array is too large")
+        if not np.all(np.isfinite(value)):
+            raise ExpressionError("Result is not a finite number")
+    elif isinstance(value, np.generic):
+        return _check_value(value.item())
+    return value
+
+
+def _check_power(base, exponent) -> None:
+    """Reject integer powers whose result would exceed the size limit."""
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and abs(base) > 1:
+        if (abs(base).bit_length() - 1) * exponent > MAX_INT_BITS:
+            raise ExpressionError("Result is too large")
+
+
+def _apply(func: Callable, *args):
+    """Run a numeric operation with NumPy errors raised, not warned."""
+    try:
+        with np.errstate(all="raise"):
+            return func(*args)
+    except (FloatingPointError, OverflowError, ZeroDivisionError) as e:
+        raise ExpressionError(str(e) or "Arithmetic error") from e
+
+
+def _compile_node(node: ast.AST) -> Callable:
+    """Compile one validated AST node into an evaluator closure."""
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ExpressionError(f"Unsupported constant: {node.value!r}")
+        value = node.value
+        return lambda env, budget: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            return lambda env, budget: value
+
+        def load(env, budget):
+            if name not in env:
+                raise ExpressionError(f"Unknown name: {name}")
+            return env[name]
+        return load
+
+    if isinstance(node, (ast.List, ast.Tuple)):
+        items = [_compile_node(item) for item in node.elts]
+        if len(items) > MAX_ARRAY_SIZE:
+            raise ExpressionError("Array is too large")
+
+        def build(env, budget):
+            values = [item(env, budget) for item in items]
+            if any(isinstance(v, np.ndarray) for v in values):
+                raise ExpressionError("Nested arrays are not supported")
+            array = np.asarray(values, dtype=float)
+            budget.spend(array)
+            return array
+        return build
+
+    if isinstance(node, ast.BinOp):
+        op = _BINARY_OPERATORS.get(type(node.op))
+        if op is None:
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        left, right = _compile_node(node.left), _compile_node(node.right)
+        is_pow = isinstance(node.op, ast.Pow)
+
+        def binary(env, budget):
+            a, b = left(env, budget), right(env, budget)
+            if is_pow:
+                _check_power(a, b)
+            result = _check_value(_apply(op, a, b))
+            budget.spend(result)
+            return result
+        return binary
+
+    if isinstance(node, ast.UnaryOp):
+        op = _UNARY_OPERATORS.get(type(node.op))
+        if op is None:
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        operand = _compile_node(node.operand)
+
+        def unary(env, budget):
+            result = op(operand(env, budget))
+            budget.spend(result)
+            return result
+        return unary
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ExpressionError("Unsupported function call")
+        if node.keywords:
+            raise ExpressionError("Keyword arguments are not supported")
+        func = FUNCTIONS[node.func.id]
+        args = [_compile_node(arg) for arg in node.args]
+
+        def call(env, budget):
+            values = [arg(env, budget) for arg in args]
+            result = _apply(func, *values)
+            if isinstance(result, np.generic):
+                result = result.item()
+            result = _check_value(result)
+            budget.spend(result)
+            return result
+        return call
+
+    raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+
+
+class CompiledExpression:
+    """A validated expression, ready to evaluate repeatedly."""
+
+    def __init__(self, source: str, evaluator: Callable):
+        self.source = source
+        self._evaluator = evaluator
+
+    def evaluate(self, variables: Optional[dict] = None):
+        """Evaluate the expression.
+
+        Args:
+            variables: Optional mapping of names to numbers or lists
+
+        Returns:
+            Python number or NumPy array
+
+        Raises:
+            ExpressionError: If evaluation fails or exceeds a limit
+        """
+        env = {}
+        for name, value in (variables or {}).items():
+            if isinstance(value, (list, tuple)):
+                value = np.asarray(value, dtype=float)
+            env[name] = _check_value(value)
+        return self._evaluator(env, _Budget())
+
+
+@lru_cache(maxsize=512)
+def compile_expression(source: str) -> CompiledExpression:
+    """Parse, validate and compile an expression (cached by source).
+
+    Args:
+        source: Expression text
+
+    Returns:
+        CompiledExpression
+
+    Raises:
+        ExpressionError: If the expression is too long or not allowed
+    """
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError("Expression is too long")
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid syntax: {e.msg}") from e
+
+    if sum(1 for _ in ast.walk(tree)) > MAX_NODES:
+        raise ExpressionError("Expression is too complex")
+    return CompiledExpression(source, _compile_node(tree.body))
+
+
+def format_result(value) -> str:
+    """Format an evaluation result for the agent.
+
+    Args:
+        value: Result of :meth:`CompiledExpression.evaluate`
+
+    Returns:
+        String form (arrays as lists)
+    """
+    if isinstance(value, np.ndarray):
+        return str(value.tolist())
+    if isinstance(value, np.generic):
+        return str(value.item())
+    return str(value)
@@ -1,12 +1,94 @@
 """LLM initialization utilities."""
 
+from __future__ import annotations
+
+import asyncio
 import logging
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, List, Union
 
-from langchain_ollama import ChatOllama
 from src.config.config import Config
+from src.utils.metrics import get_metrics, render_samples
+
+if TYPE_CHECKING:
+    from langchain_ollama import ChatOllama
 
 logger = logging.getLogger(__name__)
 
+LLM_TEMPERATURE = 0.7
+
+# A request whose model load takes longer than this counts as a cold start
+COLD_START_LOAD_SECONDS = 0.5
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+def parse_keep_alive(value: Union[str, int]) -> int:
+    """Convert an Ollama keep-alive setting to seconds.
+
+    Args:
+        value: Seconds (``"300"``, ``-1``) or a duration (``"30m"``, ``"1h"``)
+
+    Returns:
+        Keep-alive in seconds; negative keeps the model loaded indefinitely
+    """
+    if isinstance(value, int):
+        return value
+    value = value.strip().lower()
+    match = re.fullmatch(r"(-?\d+)([smh]?)", value)
+    if not match:
+        raise ValueError(f"Invalid keep-alive value: {value!r}")
+    amount, unit = match.groups()
+    return int(amount) * _DURATION_UNITS.get(unit or "s", 1)
+
+
+def get_keep_alive(model: str) -> int:
+    """Get how long Ollama should keep a model loaded after a request.
+
+    Args:
+        model: Ollama model name
+
+    Returns:
+        Keep-alive in seconds (-1 for pinned models)
+    """
+    if model in Config.OLLAMA_PINNED_MODELS:
+        return -1
+    return parse_keep_alive(Config.OLLAMA_KEEP_ALIVE)
+
+
+def select_num_ctx(prompt_tokens: int) -> int:
+    """Choose a context window for a prompt.
+
+    Sizes are powers of two between ``OLLAMA_NUM_CTX_MIN`` and
+    ``OLLAMA_NUM_CTX_MAX``. Ollama reloads the model whenever ``num_ctx``
+    changes, so a few coarse sizes keep reloads rare.
+
+    Args:
+        prompt_tokens: Estimated prompt size in tokens
+
+    Returns:
+        Context window size in tokens
+    """
+    needed = prompt_tokens + Config.OLLAMA_NUM_PREDICT_RESERVE
+    num_ctx = Config.OLLAMA_NUM_CTX_MIN
+    while num_ctx < needed and num_ctx < Config.OLLAMA_NUM_CTX_MAX:
+        num_ctx *= 2
+    return min(num_ctx, Config.OLLAMA_NUM_CTX_MAX)
+
+
+def get_chat_options(num_ctx: int) -> dict:
+    """Build Ollama request options for a chat call.
+
+    Args:
+        num_ctx: Context window size
+
+    Returns:
+        Options dictionary (replaces the model's default options)
+    """
+    return {"temperature": LLM_TEMPERATURE, "num_ctx": num_ctx}
+
 
 def get_local_llm() -> ChatOllama:
     """Initialize local Ollama model.
@@ -14,6 +96,9 @@ def get_local_llm() -> ChatOllama:
     Returns:
         ChatOllama: Initialized chat language model
     """
+    # Deferred so importing the graph does not load the Ollama client
+    from langchain_ollama import ChatOllama
+
     model_id = Config.OLLAMA_MODEL
     base_url = Config.OLLAMA_BASE_URL
 
@@ -22,10 +107,161 @@ def get_local_llm() -> ChatOllama:
     chat_model = ChatOllama(
         model=model_id,
         base_url=base_url,
-        temperature=0.7,
-        keep_alive=0,
-        num_ctx=2048,
+        temperature=LLM_TEMPERATURE,
+        keep_alive=get_keep_alive(model_id),
+        num_ctx=Config.OLLAMA_NUM_CTX_MIN,
     )
     logger.info("Model connected successfully.")
 
     return chat_model
+
+
+class ResidencyStats:
+    """Separates cold-start from steady-state model latency.
+
+    A response counts as a cold start when Ollama reports a significant
+    ``load_duration``, i.e. the model had to be (re)loaded for it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.cold_starts = 0
+        self.cold_seconds = 0.0
+        self.steady_requests = 0
+        self.steady_seconds = 0.0
+        self.warmup_seconds: dict = {}
+
+    def record(self, response_metadata: dict) -> None:
+        """Record one Ollama response.
+
+        Args:
+            response_metadata: Response metadata with Ollama durations (ns)
+        """
+        total = response_metadata.get("total_duration")
+        if total is None:
+            return
+        load = response_metadata.get("load_duration") or 0
+        with self._lock:
+            if load / 1e9 > COLD_START_LOAD_SECONDS:
+                self.cold_starts += 1
+                self.cold_seconds += total / 1e9
+            else:
+                self.steady_requests += 1
+                self.steady_seconds += total / 1e9
+
+    def record_warmup(self, model: str, seconds: float) -> None:
+        """Record the time taken to preload a model.
+
+        Args:
+            model: Ollama model name
+            seconds: Warm-up duration
+        """
+        with self._lock:
+            self.warmup_seconds[model] = seconds
+
+    def stats(self) -> dict:
+        """Get latency counters.
+
+        Returns:
+            Dictionary with cold-start and steady-state counts, totals and averages
+        """
+        with self._lock:
+            return {
+                "warmup_seconds": dict(self.warmup_seconds),
+                "cold_starts": self.cold_starts,
+                "cold_seconds": self.cold_seconds,
+                "cold_avg_seconds": self.cold_seconds / self.cold_starts if self.cold_starts else 0.0,
+                "steady_requests": self.steady_requests,
+                "steady_seconds": self.steady_seconds,
+                "steady_avg_seconds": (
+                    self.steady_seconds / self.steady_requests if self.steady_requests else 0.0
+                ),
+            }
+
+
+_residency_stats = ResidencyStats()
+
+
+def _collect_metrics() -> List[str]:
+    """Export cold-start and steady-state latency separately."""
+    stats = _residency_stats.stats()
+    return (
+        render_samples(
+            "ollama_responses_total",
+            "counter",
+            "Ollama chat responses by start type (cold: the model had to be loaded).",
+            ("start",),
+            {("cold",): stats["cold_starts"], ("steady",): stats["steady_requests"]},
+        )
+        + render_samples(
+            "ollama_response_seconds_total",
+            "counter",
+            "Total Ollama response time by start type.",
+            ("start",),
+            {("cold",): stats["cold_seconds"], ("steady",): stats["steady_seconds"]},
+        )
+        + render_samples(
+            "ollama_warmup_seconds",
+            "gauge",
+            "Time taken to preload each model at startup.",
+            ("model",),
+            {(model,): seconds for model, seconds in stats["warmup_seconds"].items()},
+        )
+    )
+
+
+get_metrics().add_collector(_collect_metrics)
+
+
+def get_residency_stats() -> ResidencyStats:
+    """Get the process-wide model residency statistics.
+
+    Returns:
+        Shared ResidencyStats instance
+    """
+    return _residency_stats
+
+
+async def warm_up_models() -> dict:
+    """Preload the chat and embedding models into Ollama.
+
+    The chat model is loaded with the smallest context window, which is
+    what short prompts use, so the first request does not trigger a reload.
+    Failures are logged and do not prevent startup.
+
+    Returns:
+        Mapping of model name to warm-up seconds (None if it failed)
+    """
+    from ollama import AsyncClient
+
+    client = AsyncClient(host=Config.OLLAMA_BASE_URL)
+
+    async def _timed(model: str, request) -> tuple:
+        start = time.perf_counter()
+        try:
+            await request
+        except Exception as e:
+            logger.warning("Warm-up failed for %s: %s", model, e)
+            return model, None
+        elapsed = time.perf_counter() - start
+        _residency_stats.record_warmup(model, elapsed)
+        logger.info("Warmed up %s in %.2fs (cold start)", model, elapsed)
+        return model, elapsed
+
+    chat_model = Config.OLLAMA_MODEL
+    embedding_model = Config.OLLAMA_EMBEDDING_MODEL
+    results = await asyncio.gather(
+        _timed(chat_model, client.generate(
+            model=chat_model,
+            prompt="",
+            keep_alive=get_keep_alive(chat_model),
+            options=get_chat_options(Config.OLLAMA_NUM_CTX_MIN),
+        )),
+        _timed(embedding_model, client.embed(
+            model=embedding_model,
+            input="warm-up",
+            keep_alive=get_keep_alive(embedding_model),
+        )),
+    )
+    await client.close()
+    return dict(results)
@@ -0,0 +1,601 @@
+"""In-process vector store backed by memory-mapped files.
+
+An alternative to Elasticsearch for edge deployments and CI, where a few
+thousand chunks do not justify a search cluster. Layout of a store
+directory::
+
+    meta.json      dimension, storage dtype and IVF parameters
+    vectors.bin    unit-normalized rows, float32 or int8
+    scales.f32     per-row dequantization scale (int8 only)
+    docs.jsonl     one {"id", "text", "metadata"} record per row
+    offsets.i64    (start, length) of each row's record in docs.jsonl
+    deleted.i64    row numbers of deleted or replaced documents
+    ivf_*.bin      inverted-file index over the first ``ivf.rows`` rows
+
+Opening a store only maps these files; nothing is parsed until a search
+reads the records it returns. Files are append-only and offsets.i64 is
+written last, so a torn write leaves the previous rows intact.
+
+Deleted and replaced rows are only masked. :meth:`LocalVectorStore.compact`
+reclaims them by writing the live rows to a new set of files (named with
+the ``epoch`` from meta.json, e.g. ``vectors.2.bin``) and then switching
+meta.json to that epoch, so readers see either the old or the new store.
+
+Small stores are searched exactly. Once a store reaches
+``ivf_min_docs`` rows, :meth:`LocalVectorStore.build_index` clusters the
+rows with k-means and searches then probe only the ``nprobe`` nearest
+clusters, plus any rows appended since the index was built.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+logger = logging.getLogger(__name__)
+
+_META = "meta.json"
+_VECTORS = "vectors.bin"
+_SCALES = "scales.f32"
+_DOCS = "docs.jsonl"
+_OFFSETS = "offsets.i64"
+_DELETED = "deleted.i64"
+_IVF_CENTROIDS = "ivf_centroids.bin"
+_IVF_ORDER = "ivf_order.i64"
+_IVF_BOUNDS = "ivf_bounds.i64"
+_DATA_FILES = (_VECTORS, _SCALES, _DOCS, _OFFSETS, _DELETED, _IVF_CENTROIDS, _IVF_ORDER, _IVF_BOUNDS)
+# Any epoch's data file, e.g. vectors.bin or vectors.3.bin
+_DATA_FILE_PATTERN = re.compile(
+    "|".join(r"{}(\.\d+)?\.{}$".format(*map(re.escape, name.split(".", 1))) for name in _DATA_FILES)
+)
+
+# Rows scored per matrix multiplication during exact search
+_SEARCH_BLOCK = 16384
+_KMEANS_ITERATIONS = 10
+# Training rows sampled per cluster when building the IVF index
+_KMEANS_SAMPLES_PER_LIST = 64
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _map(path: Path, dtype, shape: tuple) -> Optional[np.memmap]:
+    if shape[0] == 0:
+        return None
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+def _fsync(path: Path) -> None:
+    with open(path, "rb+") as f:
+        os.fsync(f.fileno())
+
+
+def _append(path: Path, data: bytes, valid_bytes: int) -> None:
+    """Append after cutting anything past the last committed row."""
+    with open(path, "ab") as f:
+        if f.tell() != valid_bytes:
+            f.truncate(valid_bytes)
+        f.write(data)
+
+
+class LocalVectorStore(VectorStore):
+    """Memory-mapped vector store with exact and IVF search.
+
+    Returns the same ``Document`` objects (id, page_content, metadata) as
+    the Elasticsearch path, with scores on the same ``(1 + cosine) / 2``
+    scale that Elasticsearch uses for cosine kNN.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        embedding: Embeddings,
+        dtype: str = "float32",
+        ivf_min_docs: int = 20000,
+        nprobe: int = 8,
+    ):
+        """Open (or create) a store.
+
+        Args:
+            path: Store directory
+            embedding: Embeddings used for texts and queries
+            dtype: Storage type for new stores, "float32" or "int8"
+            ivf_min_docs: Row count from which build_index creates an IVF index
+            nprobe: Clusters searched per query once the IVF index exists
+        """
+        if dtype not in ("float32", "int8"):
+            raise ValueError(f"Unsupported dtype: {dtype}")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._embedding = embedding
+        self.ivf_min_docs = ivf_min_docs
+        self.nprobe = nprobe
+        self._lock = threading.RLock()
+        self._ids: Optional[Dict[str, int]] = None
+        self._docs = None
+
+        meta_path = self.path / _META
+        if meta_path.exists():
+            self._meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        else:
+            self._meta = {"dim": None, "dtype": dtype, "ivf": None}
+        self._load()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    @property
+    def dim(self) -> Optional[int]:
+        """Vector dimension, or None while the store is empty."""
+        return self._meta["dim"]
+
+    @property
+    def _quantized(self) -> bool:
+        return self._meta["dtype"] == "int8"
+
+    def __len__(self) -> int:
+        return self._count - len(self._deleted)
+
+    @property
+    def dead_fraction(self) -> float:
+        """Share of stored rows that are deleted or replaced."""
+        with self._lock:
+            return len(self._deleted) / self._count if self._count else 0.0
+
+    def _file(self, name: str, epoch: Optional[int] = None) -> Path:
+        """Path of a data file in the current (or the given) epoch."""
+        epoch = self._meta.get("epoch", 0) if epoch is None else epoch
+        if not epoch:
+            return self.path / name
+        stem, suffix = name.split(".", 1)
+        return self.path / f"{stem}.{epoch}.{suffix}"
+
+    def _load(self) -> None:
+        """Map the store files; cheap enough to call after every write."""
+        offsets_path = self._file(_OFFSETS)
+        count = offsets_path.stat().st_size // 16 if offsets_path.exists() else 0
+        dim = self._meta["dim"]
+        if dim is not None and count:
+            row_bytes = dim * (1 if self._quantized else 4)
+            count = min(count, self._file(_VECTORS).stat().st_size // row_bytes)
+            if self._quantized:
+                count = min(count, self._file(_SCALES).stat().st_size // 4)
+        self._count = count
+
+        self._offsets = _map(offsets_path, np.int64, (count, 2))
+        if dim is None or count == 0:
+            self._vectors = None
+            self._scales = None
+        else:
+            dtype = np.int8 if self._quantized else np.float32
+            self._vectors = _map(self._file(_VECTORS), dtype, (count, dim))
+            self._scales = _map(self._file(_SCALES), np.float32, (count,)) if self._quantized else None
+
+        deleted_path = self._file(_DELETED)
+        if deleted_path.exists():
+            rows = np.fromfile(deleted_path, dtype=np.int64)
+            self._deleted = set(int(row) for row in rows if row < count)
+        else:
+            self._deleted = set()
+
+        ivf = self._meta.get("ivf")
+        if ivf and ivf["rows"] <= count:
+            self._centroids = np.fromfile(self._file(_IVF_CENTROIDS), dtype=np.float32).reshape(-1, dim)
+            self._ivf_order = _map(self._file(_IVF_ORDER), np.int64, (ivf["rows"],))
+            self._ivf_bounds = np.fromfile(self._file(_IVF_BOUNDS), dtype=np.int64)
+            self._ivf_rows = ivf["rows"]
+        else:
+            self._centroids = None
+            self._ivf_order = None
+            self._ivf_bounds = None
+            self._ivf_rows = 0
+
+        # Records are read through this handle, so a compaction by another
+        # process cannot swap docs.jsonl under the offsets mapped above
+        if self._docs is not None:
+            self._docs.close()
+        docs_path = self._file(_DOCS)
+        self._docs = open(docs_path, "rb") if count and docs_path.exists() else None
+        self._stamps = self._file_stamps()
+
+    def _write_meta(self) -> None:
+        tmp_path = self.path / (_META + ".tmp")
+        tmp_path.write_text(json.dumps(self._meta), encoding="utf-8")
+        os.replace(tmp_path, self.path / _META)
+
+    def _file_stamps(self) -> tuple:
+        """Size, mtime and inode of the files every write touches.
+
+        The inode catches files that were replaced rather than appended to.
+        """
+        stamps = []
+        for path in (self.path / _META, self._file(_OFFSETS), self._file(_DELETED)):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                stamps.append(None)
+                continue
+            stamps.append((stat.st_size, stat.st_mtime_ns, stat.st_ino))
+        return tuple(stamps)
+
+    def refresh(self) -> bool:
+        """Pick up rows written by another process (e.g. the ingestion script).
+
+        Returns:
+            True if the store changed on disk
+        """
+        with self._lock:
+            if self._file_stamps() == self._stamps:
+                return False
+            meta_path = self.path / _META
+            if meta_path.exists():
+                self._meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            self._ids = None
+            self._load()
+            return True
+
+    def generation(self) -> str:
+        """Fingerprint that changes whenever the store is modified.
+
+        Returns:
+            String built from the row, deletion and IVF counters and the
+            modification time of the store files
+        """
+        with self._lock:
+            self.refresh()
+            modified = max((stamp[1] for stamp in self._stamps if stamp), default=0)
+            return f"local/{self.path.name}/{self._count}/{len(self._deleted)}/{self._ivf_rows}/{modified}"
+
+    def _id_map(self) -> Dict[str, int]:
+        """Map live document IDs to rows, scanning records on first use."""
+        if self._ids is None:
+            ids = {}
+            records = self._read_records(range(self._count)) if self._count else []
+            for row, record in enumerate(records):
+                if row not in self._deleted:
+                    ids[record["id"]] = row
+            self._ids = ids
+        return self._ids
+
+    def add_vectors(
+        self,
+        texts: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+        metadatas: Optional[Sequence[dict]] = None,
+        ids: Optional[Sequence[Optional[str]]] = None,
+    ) -> List[str]:
+        """Add pre-computed embeddings.
+
+        Documents whose ID already exists replace the stored version.
+
+        Args:
+            texts: Document texts
+            vectors: One embedding per text
+            metadatas: Optional metadata per text
+            ids: Optional document IDs (generated when missing)
+
+        Returns:
+            IDs of the added documents
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        metadatas = list(metadatas) if metadatas is not None else [{} for _ in texts]
+        ids = [doc_id or uuid.uuid4().hex for doc_id in (ids or [None] * len(texts))]
+        matrix = _normalize(np.asarray(vectors, dtype=np.float32))
+        if matrix.shape[0] != len(texts):
+            raise ValueError("Number of vectors does not match number of texts")
+
+        with self._lock:
+            if self._meta["dim"] is None:
+                self._meta["dim"] = int(matrix.shape[1])
+                self._write_meta()
+            dim = self._meta["dim"]
+            if matrix.shape[1] != dim:
+                raise ValueError(f"Vector dimension {matrix.shape[1]} does not match store dimension {dim}")
+
+            id_map = self._id_map()
+            replaced = [id_map[doc_id] for doc_id in ids if doc_id in id_map]
+
+            docs_path = self._file(_DOCS)
+            start = docs_path.stat().st_size if docs_path.exists() else 0
+            records, offsets = [], []
+            for doc_id, text, metadata in zip(ids, texts, metadatas):
+                line = (json.dumps({"id": doc_id, "text": text, "metadata": metadata}, ensure_ascii=False) + "\n").encode("utf-8")
+                offsets.append((start, len(line)))
+                records.append(line)
+                start += len(line)
+            with open(docs_path, "ab") as f:
+                f.write(b"".join(records))
+
+            count = self._count
+            if self._quantized:
+                scales = np.abs(matrix).max(axis=1) / 127.0
+                scales[scales == 0] = 1.0
+                quantized = np.round(matrix / scales[:, None]).astype(np.int8)
+                _append(self._file(_VECTORS), quantized.tobytes(), count * dim)
+                _append(self._file(_SCALES), scales.astype(np.float32).tobytes(), count * 4)
+            else:
+                _append(self._file(_VECTORS), matrix.tobytes(), count * dim * 4)
+            if replaced:
+                with open(self._file(_DELETED), "ab") as f:
+                    f.write(np.asarray(replaced, dtype=np.int64).tobytes())
+            # Offsets commit the rows, so they are written last
+            _append(self._file(_OFFSETS), np.asarray(offsets, dtype=np.int64).tobytes(), count * 16)
+
+            for offset, doc_id in enumerate(ids):
+                id_map[doc_id] = count + offset
+            self._load()
+        return ids
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Embed and add texts.
+
+        Args:
+            texts: Document texts
+            metadatas: Optional metadata per text
+            ids: Optional document IDs
+
+        Returns:
+            IDs of the added documents
+        """
+        texts = list(texts)
+        vectors = self._embedding.embed_documents(texts)
+        return self.add_vectors(texts, vectors, metadatas, ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Delete documents by ID.
+
+        Args:
+            ids: Document IDs
+
+        Returns:
+            True if any document was deleted
+        """
+        if not ids:
+            return False
+        with self._lock:
+            id_map = self._id_map()
+            rows = [id_map.pop(doc_id) for doc_id in ids if doc_id in id_map]
+            if not rows:
+                return False
+            with open(self._file(_DELETED), "ab") as f:
+                f.write(np.asarray(rows, dtype=np.int64).tobytes())
+            self._deleted.update(rows)
+        return True
+
+    def build_index(self, nlist: Optional[int] = None) -> bool:
+        """Build the IVF index if the store is large enough.
+
+        Args:
+            nlist: Number of clusters (defaults to about sqrt(rows))
+
+        Returns:
+            True if an index was built
+        """
+        with self._lock:
+            count, dim = self._count, self._meta["dim"]
+            if count < self.ivf_min_docs or dim is None:
+                return False
+            nlist = nlist or max(1, int(math.sqrt(count)))
+
+            rng = np.random.default_rng(0)
+            sample_rows = np.sort(rng.choice(count, size=min(count, nlist * _KMEANS_SAMPLES_PER_LIST), replace=False))
+            sample = self._dense_rows(sample_rows)
+            centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+            for _ in range(_KMEANS_ITERATIONS):
+                assignment = np.argmax(sample @ centroids.T, axis=1)
+                for cluster in range(nlist):
+                    members = sample[assignment == cluster]
+                    if len(members):
+                        centroids[cluster] = members.mean(axis=0)
+                centroids = _normalize(centroids)
+
+            assignment = np.empty(count, dtype=np.int64)
+            for start in range(0, count, _SEARCH_BLOCK):
+                block = self._dense_rows(np.arange(start, min(count, start + _SEARCH_BLOCK)))
+                assignment[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+            order = np.argsort(assignment, kind="stable").astype(np.int64)
+            bounds = np.searchsorted(assignment[order], np.arange(nlist + 1)).astype(np.int64)
+
+            centroids.astype(np.float32).tofile(self._file(_IVF_CENTROIDS))
+            order.tofile(self._file(_IVF_ORDER))
+            bounds.tofile(self._file(_IVF_BOUNDS))
+            self._meta["ivf"] = {"rows": count, "nlist": nlist}
+            self._write_meta()
+            self._load()
+        logger.info("Built IVF index over %d rows with %d lists", count, nlist)
+        return True
+
+    def compact(self) -> bool:
+        """Rewrite the store without its deleted and replaced rows.
+
+        The live rows are written to the files of a new epoch, which
+        meta.json then switches to; the old files are removed afterwards.
+        A crash before the switch leaves the old store untouched. Other
+        processes keep reading their mapped files until :meth:`refresh`.
+        The IVF index is rebuilt over the compacted rows.
+
+        Returns:
+            True if any rows were reclaimed
+        """
+        with self._lock:
+            if not self._deleted:
+                return False
+            before = self._count
+            live = np.asarray(sorted(set(range(before)) - self._deleted), dtype=np.int64)
+            epoch = self._meta.get("epoch", 0) + 1
+            names = [_VECTORS, _OFFSETS, _DOCS] + ([_SCALES] if self._quantized else [])
+            new_files = {name: self._file(name, epoch) for name in names}
+            self._remove_stale_files()
+
+            offsets, position = [], 0
+            with open(new_files[_VECTORS], "wb") as vectors, open(new_files[_DOCS], "wb") as docs:
+                for start in range(0, len(live), _SEARCH_BLOCK):
+                    block = live[start:start + _SEARCH_BLOCK]
+                    vectors.write(np.ascontiguousarray(self._vectors[block]).tobytes())
+                    for row in block:
+                        record_start, length = self._offsets[row]
+                        self._docs.seek(int(record_start))
+                        docs.write(self._docs.read(int(length)))
+                        offsets.append((position, int(length)))
+                        position += int(length)
+            if self._quantized:
+                np.asarray(self._scales[live], dtype=np.float32).tofile(new_files[_SCALES])
+            np.asarray(offsets, dtype=np.int64).reshape(-1, 2).tofile(new_files[_OFFSETS])
+            for path in new_files.values():
+                _fsync(path)
+
+            self._meta = {**self._meta, "epoch": epoch, "ivf": None}
+            self._write_meta()
+            self._ids = None
+            self._load()
+            self._remove_stale_files()
+            logger.info("Compacted %s from %d to %d rows", self.path, before, self._count)
+            self.build_index()
+        return True
+
+    def _remove_stale_files(self) -> None:
+        """Delete data files of other epochs (old or half-written ones)."""
+        current = {self._file(name).name for name in _DATA_FILES}
+        for path in self.path.iterdir():
+            if path.name not in current and _DATA_FILE_PATTERN.match(path.name):
+                try:
+                    path.unlink()
+                except OSError as e:
+                    logger.debug("Could not remove %s: %s", path, e)
+
+    def _dense_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Read rows as float32 unit vectors."""
+        vectors = np.asarray(self._vectors[rows], dtype=np.float32)
+        if self._quantized:
+            vectors *= self._scales[rows][:, None]
+        return vectors
+
+    def _candidate_rows(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """Rows to score exactly, or None to scan every row."""
+        if self._centroids is None:
+            return None
+        nprobe = min(self.nprobe, len(self._centroids))
+        lists = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+        parts = [self._ivf_order[self._ivf_bounds[i]:self._ivf_bounds[i + 1]] for i in lists]
+        # Rows appended after the index was built are scanned exactly
+        parts.append(np.arange(self._ivf_rows, self._count, dtype=np.int64))
+        return np.sort(np.concatenate(parts))
+
+    def _score(self, query: np.ndarray, rows: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        if rows is None:
+            rows = np.arange(self._count, dtype=np.int64)
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), _SEARCH_BLOCK):
+            block = rows[start:start + _SEARCH_BLOCK]
+            if self._quantized:
+                scores[start:start + len(block)] = (
+                    np.asarray(self._vectors[block], dtype=np.float32) @ query
+                ) * self._scales[block]
+            else:
+                scores[start:start + len(block)] = self._vectors[block] @ query
+        return rows, scores
+
+    def _read_records(self, rows: Iterable[int]) -> List[dict]:
+        records = []
+        for row in rows:
+            start, length = self._offsets[row]
+            self._docs.seek(int(start))
+            records.append(json.loads(self._docs.read(int(length))))
+        return records
+
+    def search_by_vector(
+        self,
+        embedding: Sequence[float],
+        k: int = 4,
+        with_vectors: bool = False,
+    ) -> List[Tuple[Document, float, Optional[List[float]]]]:
+        """Find the documents nearest to an embedding.
+
+        Args:
+            embedding: Query embedding
+            k: Number of documents to return
+            with_vectors: Also return the stored (dequantized) vectors
+
+        Returns:
+            (document, score, vector or None) triples, best first
+        """
+        with self._lock:
+            if self._count == 0 or k <= 0:
+                return []
+            query = _normalize(np.asarray(embedding, dtype=np.float32)[None, :])[0]
+            rows, scores = self._score(query, self._candidate_rows(query))
+            if self._deleted:
+                scores[np.isin(rows, list(self._deleted))] = -np.inf
+
+            k = min(k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            top = top[np.isfinite(scores[top])]
+            top_rows = rows[top]
+            records = self._read_records(top_rows)
+            vectors = self._dense_rows(np.sort(top_rows)) if with_vectors and len(top_rows) else None
+            if vectors is not None:
+                by_row = dict(zip(np.sort(top_rows).tolist(), vectors))
+
+        results = []
+        for row, index, record in zip(top_rows.tolist(), top, records):
+            doc = Document(id=record["id"], page_content=record["text"], metadata=record["metadata"])
+            vector = by_row[row].tolist() if vectors is not None else None
+            results.append((doc, float((1.0 + scores[index]) / 2.0), vector))
+        return results
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return [(doc, score) for doc, score, _ in self.search_by_vector(embedding, k)]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _, _ in self.search_by_vector(embedding, k)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self._embedding.embed_query(query), k)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self):
+        # Scores are already in [0, 1]
+        return lambda score: score
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        path: Union[str, os.PathLike] = ".cache/local_index",
+        **kwargs: Any,
+    ) -> "LocalVectorStore":
+        store = cls(path, embedding, **kwargs)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
@@ -0,0 +1,489 @@
+"""Spans and latency histograms for graph nodes and tools.
+
+:func:`instrument_node` wraps a graph node and the tool registry records
+every tool call. Each run becomes a :class:`Span` (duration, input and
+output sizes, Ollama token metadata, cache hit flags) that is passed to
+span listeners and aggregated into histograms. :func:`render_metrics`
+returns them in the Prometheus text exposition format, together with the
+samples of registered collectors (cache and model residency counters that
+their owners keep themselves).
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.config.config import Config
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+TOKEN_BUCKETS = (16, 64, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+# Cache hit flags of the span being recorded in this context
+_span_cache: ContextVar[Optional[dict]] = ContextVar("span_cache", default=None)
+
+
+@dataclass
+class Span:
+    """One timed node run or tool call."""
+
+    kind: str  # "node" or "tool"
+    name: str
+    duration: float = 0.0
+    status: str = "ok"  # "ok", "error" or "timeout"
+    input_size: int = 0
+    output_size: int = 0
+    # Ollama response metadata summed over the span's model responses
+    prompt_tokens: Optional[int] = None
+    eval_tokens: Optional[int] = None
+    load_duration: Optional[float] = None
+    prompt_eval_duration: Optional[float] = None
+    cache: Dict[str, bool] = field(default_factory=dict)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [
+        f'{name}="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def render_samples(
+    name: str,
+    kind: str,
+    documentation: str,
+    labelnames: Sequence[str],
+    samples: Dict[Tuple[str, ...], float],
+) -> List[str]:
+    """Render precomputed samples of one metric for a collector.
+
+    Args:
+        name: Metric name
+        kind: "counter" or "gauge"
+        documentation: HELP text
+        labelnames: Label names, in the order of each sample's label values
+        samples: Mapping of label values to the sample value
+
+    Returns:
+        Exposition lines
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in sorted(samples.items()):
+        lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+    return lines
+
+
+class Histogram:
+    """Prometheus-style histogram with fixed buckets and labels."""
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], labelnames: Sequence[str]):
+        """Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            buckets: Upper bucket bounds, ascending
+            labelnames: Label names, in the order values are passed
+        """
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        # label values -> (per-bucket counts incl. +Inf, sum)
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation.
+
+        Args:
+            value: Observed value
+            labels: Label values matching ``labelnames``
+        """
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        """Render the histogram in the text exposition format.
+
+        Returns:
+            Exposition lines
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+        for labels, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            plain = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{plain} {_format_value(total)}")
+            lines.append(f"{self.name}_count{plain} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Prometheus-style counter with labels."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        """Initialize the counter.
+
+        Args:
+            name: Metric name, ending in ``_total``
+            documentation: HELP text
+            labelnames: Label names, in the order values are passed
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Increment the counter.
+
+        Args:
+            labels: Label values matching ``labelnames``
+            amount: Increment
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        """Render the counter in the text exposition format.
+
+        Returns:
+            Exposition lines
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Aggregates spans into the graph's histograms and counters."""
+
+    def __init__(self):
+        self.node_duration = Histogram(
+            "langgraph_node_duration_seconds", "Graph node run time.", DURATION_BUCKETS, ("node", "status")
+        )
+        self.node_input = Histogram(
+            "langgraph_node_input_chars", "Characters of state passed to a node.", SIZE_BUCKETS, ("node",)
+        )
+        self.node_output = Histogram(
+            "langgraph_node_output_chars", "Characters of state returned by a node.", SIZE_BUCKETS, ("node",)
+        )
+        self.tool_duration = Histogram(
+            "langgraph_tool_duration_seconds", "Tool call run time.", DURATION_BUCKETS, ("tool", "status")
+        )
+        self.tool_input = Histogram(
+            "langgraph_tool_input_chars", "Characters of tool call arguments.", SIZE_BUCKETS, ("tool",)
+        )
+        self.tool_output = Histogram(
+            "langgraph_tool_output_chars", "Characters returned by a tool call.", SIZE_BUCKETS, ("tool",)
+        )
+        self.prompt_tokens = Histogram(
+            "ollama_prompt_eval_tokens", "Prompt tokens evaluated per response.", TOKEN_BUCKETS, ("node",)
+        )
+        self.eval_tokens = Histogram(
+            "ollama_eval_tokens", "Tokens generated per response.", TOKEN_BUCKETS, ("node",)
+        )
+        self.load_duration = Histogram(
+            "ollama_load_duration_seconds", "Model load time per response.", DURATION_BUCKETS, ("node",)
+        )
+        self.prompt_eval_duration = Histogram(
+            "ollama_prompt_eval_duration_seconds", "Prompt evaluation time per response.", DURATION_BUCKETS,
+            ("node",),
+        )
+        self.cache_lookups = Counter(
+            "langgraph_cache_lookups_total", "Cache lookups by cache and result.", ("cache", "result")
+        )
+        self._listeners: List[Callable[[Span], None]] = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def add_listener(self, listener: Callable[[Span], None]) -> None:
+        """Receive every recorded span, e.g. to export traces.
+
+        Args:
+            listener: Callable invoked with each span; must not block
+        """
+        self._listeners.append(listener)
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        """Add exposition lines computed at scrape time.
+
+        Args:
+            collector: Callable returning lines, e.g. from :func:`render_samples`
+        """
+        self._collectors.append(collector)
+
+    def record(self, span: Span) -> None:
+        """Aggregate a span and pass it to the listeners.
+
+        Args:
+            span: Finished span
+        """
+        if span.kind == "tool":
+            self.tool_duration.observe(span.duration, span.name, span.status)
+            self.tool_input.observe(span.input_size, span.name)
+            self.tool_output.observe(span.output_size, span.name)
+        else:
+            self.node_duration.observe(span.duration, span.name, span.status)
+            self.node_input.observe(span.input_size, span.name)
+            self.node_output.observe(span.output_size, span.name)
+            if span.prompt_tokens is not None:
+                self.prompt_tokens.observe(span.prompt_tokens, span.name)
+            if span.eval_tokens is not None:
+                self.eval_tokens.observe(span.eval_tokens, span.name)
+            if span.load_duration is not None:
+                self.load_duration.observe(span.load_duration, span.name)
+            if span.prompt_eval_duration is not None:
+                self.prompt_eval_duration.observe(span.prompt_eval_duration, span.name)
+
+        logger.debug("span %s", span)
+        for listener in self._listeners:
+            try:
+                listener(span)
+            except Exception as e:
+                logger.warning("Span listener failed: %s", e)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            Exposition text
+        """
+        metrics = [
+            self.node_duration,
+            self.node_input,
+            self.node_output,
+            self.tool_duration,
+            self.tool_input,
+            self.tool_output,
+            self.prompt_tokens,
+            self.eval_tokens,
+            self.load_duration,
+            self.prompt_eval_duration,
+            self.cache_lookups,
+        ]
+        lines: List[str] = []
+        for metric in metrics:
+            lines += metric.render()
+        for collector in self._collectors:
+            try:
+                lines += collector()
+            except Exception as e:
+                logger.warning("Metrics collector failed: %s", e)
+        return "\n".join(lines) + "\n"
+
+
+_metrics = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry.
+
+    Returns:
+        Shared MetricsRegistry instance
+    """
+    return _metrics
+
+
+def render_metrics() -> str:
+    """Render the process-wide metrics for a Prometheus scrape.
+
+    Returns:
+        Exposition text
+    """
+    return _metrics.render()
+
+
+def note_cache(cache: str, hit: bool) -> None:
+    """Record a cache lookup on the counters and the current span.
+
+    Args:
+        cache: Cache name, e.g. "embedding", "tool" or "answer"
+        hit: Whether the lookup was served from the cache
+    """
+    if not Config.METRICS_ENABLED:
+        return
+    _metrics.cache_lookups.inc(cache, "hit" if hit else "miss")
+    flags = _span_cache.get()
+    if flags is not None:
+        # A span counts as a hit for a cache if any of its lookups hit
+        flags[cache] = flags.get(cache, False) or hit
+
+
+def measure_size(value: Any) -> int:
+    """Estimate the size of state values in characters.
+
+    Args:
+        value: State dict, message list, message or plain value
+
+    Returns:
+        Character count of message contents, tool-call arguments and strings
+    """
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(measure_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(measure_size(item) for item in value)
+    if hasattr(value, "content"):
+        size = measure_size(value.content)
+        for call in getattr(value, "tool_calls", None) or ():
+            size += len(str(call.get("args", "")))
+        return size
+    if isinstance(value, (bool, int, float)):
+        return 0
+    return len(str(value))
+
+
+def _collect_model_metadata(span: Span, output: Any) -> None:
+    """Sum Ollama token and timing metadata of returned messages into a span."""
+    if not isinstance(output, dict):
+        return
+    messages = output.get("messages") or []
+    for message in messages if isinstance(messages, list) else [messages]:
+        metadata = getattr(message, "response_metadata", None) or {}
+        if "prompt_eval_count" in metadata:
+            span.prompt_tokens = (span.prompt_tokens or 0) + (metadata.get("prompt_eval_count") or 0)
+        if "eval_count" in metadata:
+            span.eval_tokens = (span.eval_tokens or 0) + (metadata.get("eval_count") or 0)
+        # Ollama reports durations in nanoseconds
+        if "load_duration" in metadata:
+            span.load_duration = (span.load_duration or 0.0) + (metadata.get("load_duration") or 0) / 1e9
+        if "prompt_eval_duration" in metadata:
+            span.prompt_eval_duration = (
+                (span.prompt_eval_duration or 0.0) + (metadata.get("prompt_eval_duration") or 0) / 1e9
+            )
+
+
+def _start(name: str, state: Any) -> Tuple[Span, Any, float]:
+    span = Span(kind="node", name=name, input_size=measure_size(state))
+    token = _span_cache.set(span.cache)
+    return span, token, time.perf_counter()
+
+
+def _finish(span: Span, token: Any, start: float, output: Any, status: str) -> None:
+    span.duration = time.perf_counter() - start
+    span.status = status
+    _span_cache.reset(token)
+    if output is not None:
+        span.output_size = measure_size(output)
+        _collect_model_metadata(span, output)
+    _metrics.record(span)
+
+
+def instrument_node(name: str, node: Callable) -> Callable:
+    """Wrap a graph node so every run is recorded as a span.
+
+    The wrapper keeps the node's signature, so LangGraph still passes
+    ``config`` to nodes that accept it.
+
+    Args:
+        name: Node name used as the metric label
+        node: Sync or async node function (or partial)
+
+    Returns:
+        Instrumented node, or the node itself if metrics are disabled
+    """
+    if not Config.METRICS_ENABLED:
+        return node
+
+    if asyncio.iscoroutinefunction(node):
+        @wraps(node)
+        async def async_wrapper(state, *args, **kwargs):
+            span, token, start = _start(name, state)
+            try:
+                output = await node(state, *args, **kwargs)
+            except asyncio.TimeoutError:
+                _finish(span, token, start, None, "timeout")
+                raise
+            except BaseException:
+                _finish(span, token, start, None, "error")
+                raise
+            _finish(span, token, start, output, "ok")
+            return output
+
+        return async_wrapper
+
+    @wraps(node)
+    def wrapper(state, *args, **kwargs):
+        span, token, start = _start(name, state)
+        try:
+            output = node(state, *args, **kwargs)
+        except BaseException:
+            _finish(span, token, start, None, "error")
+            raise
+        _finish(span, token, start, output, "ok")
+        return output
+
+    return wrapper
+
+
+def record_tool_call(
+    name: str,
+    duration: float,
+    status: str,
+    input_size: int,
+    output_size: int,
+    cache_hit: bool,
+) -> None:
+    """Record one tool call as a span.
+
+    Args:
+        name: Tool name
+        duration: Seconds spent in the call
+        status: "ok", "error" or "timeout"
+        input_size: Characters of the call arguments
+        output_size: Characters of the result
+        cache_hit: Whether the result came from the tool cache
+    """
+    if not Config.METRICS_ENABLED:
+        return
+    _metrics.record(
+        Span(
+            kind="tool",
+            name=name,
+            duration=duration,
+            status=status,
+            input_size=input_size,
+            output_size=output_size,
+            cache={"tool": cache_hit},
+        )
+    )
@@ -0,0 +1,157 @@
+"""Cheap classifier deciding whether a query needs document retrieval.
+
+Greetings, arithmetic and weather questions are answered from the base
+prompt or tools, so embedding them and running a kNN search only adds
+latency and prompt tokens. Rules catch the clear cases; a small
+hand-weighted logistic model scores the rest. Ambiguous queries default
+to retrieval: short queries, product codes and dates are exactly the
+lookups the index exists for, so they are never skipped by score.
+"""
+
+import math
+import re
+from dataclasses import asdict, dataclass
+
+from src.utils.expression import ExpressionError, compile_expression
+
+_SMALLTALK = re.compile(
+    r"^\s*(hi|hello|hey|yo|good (morning|afternoon|evening)|thanks?( you)?|thx|ok(ay)?|bye|"
+    r"see you|안녕(하세요)?|반가워(요)?|반갑습니다|고마워(요)?|감사(합니다|해요)|ㅎㅇ|ㅋ+|ㅎ+|"
+    r"잘 ?가|수고(하셨습니다|했어요)?|좋아(요)?|네|응|알겠(어|습니다))[\s!.?~^]*$",
+    re.IGNORECASE,
+)
+_ARITHMETIC = re.compile(r"^[\d\s.+\-*/%^()x×÷]+$")
+_TIMES = re.compile(r"(?<=[\d)\s])x(?=[\d(\s])")
+# Dates parse as subtraction ("2024-1-1") but are lookups, not sums
+_DATE = re.compile(r"\d{4}\s*[-./]\s*\d{1,2}\s*[-./]\s*\d{1,2}")
+# Product codes, model numbers, years and other numeric identifiers
+_IDENTIFIER = re.compile(
+    r"\b[A-Za-z]+[-_]?\d+[A-Za-z0-9-]*\b|\b\d+[A-Za-z]+\d*\b|\d{4}\s*년|\d+\s*(월|일|분기|호|번)|\b(19|20)\d{2}\b"
+)
+_MATH_PREFIX = re.compile(
+    r"^\s*(what('s| is)|calculate|compute|evaluate|계산(해줘|해 줘|하면)?|)\s*",
+    re.IGNORECASE,
+)
+_MATH_SUFFIX = re.compile(r"\s*(\?|은\??|는\??|=\s*\??|계산해\s*줘|얼마(야|예요|인가요)?\??)\s*$")
+_WEATHER = re.compile(r"weather|forecast|temperature|날씨|기온|비 ?와|눈 ?와", re.IGNORECASE)
+_DOCUMENT_HINTS = re.compile(
+    r"document|docs?\b|file|according|policy|guide|manual|spec|report|section|"
+    r"문서|자료|파일|규정|정책|가이드|매뉴얼|보고서|내용|설명|절차|방법",
+    re.IGNORECASE,
+)
+_QUESTION_WORDS = re.compile(
+    r"\b(what|why|how|which|who|when|where|explain|describe)\b|무엇|뭐|왜|어떻게|어떤|누가|언제|어디",
+    re.IGNORECASE,
+)
+
+# Queries this short are retrieved unless a rule says otherwise
+_SHORT_QUERY_TOKENS = 3
+
+# Hand-tuned logistic weights over the features below
+_WEIGHTS = {
+    "bias": -0.5,
+    "log_tokens": 0.9,
+    "question": 0.8,
+    "document_hint": 2.0,
+    "identifier": 1.5,
+    "weather": -2.5,
+}
+
+
+@dataclass
+class RetrievalDecision:
+    """Outcome of the retrieval gate."""
+
+    retrieve: bool
+    reason: str
+    score: float
+
+    def to_dict(self) -> dict:
+        """Convert to a plain dict for graph state."""
+        return asdict(self)
+
+
+def _features(query: str) -> dict:
+    tokens = query.split()
+    return {
+        "bias": 1.0,
+        "log_tokens": math.log1p(len(tokens)),
+        "question": 1.0 if _QUESTION_WORDS.search(query) else 0.0,
+        "document_hint": 1.0 if _DOCUMENT_HINTS.search(query) else 0.0,
+        "identifier": 1.0 if _IDENTIFIER.search(query) or _DATE.search(query) else 0.0,
+        "weather": 1.0 if _WEATHER.search(query) else 0.0,
+    }
+
+
+def retrieval_probability(query: str) -> float:
+    """Score how likely a query benefits from retrieval.
+
+    Args:
+        query: User query
+
+    Returns:
+        Probability in [0, 1]
+    """
+    features = _features(query)
+    z = sum(_WEIGHTS[name] * value for name, value in features.items())
+    return 1.0 / (1.0 + math.exp(-z))
+
+
+def is_arithmetic(query: str) -> bool:
+    """Check whether a query is a bare arithmetic expression.
+
+    The remainder after stripping question words must parse with the
+    calculator's expression engine, so dates ("2024-01-01") and codes
+    ("A-123") are not mistaken for subtraction.
+
+    Args:
+        query: User query
+
+    Returns:
+        True for inputs like "12 * (3 + 4)" or "what is 2^10?"
+    """
+    expression = _MATH_SUFFIX.sub("", _MATH_PREFIX.sub("", query, count=1)).strip()
+    if (
+        not expression
+        or not _ARITHMETIC.match(expression)
+        or _DATE.search(expression)
+        or not any(ch.isdigit() for ch in expression)
+        or not any(op in expression for op in "+-*/%^x×÷")
+    ):
+        return False
+    source = _TIMES.sub("*", expression).replace("×", "*").replace("÷", "/").replace("^", "**")
+    try:
+        compile_expression(source)
+    except ExpressionError:
+        return False
+    return True
+
+
+def classify_query(query: str, threshold: float = 0.35) -> RetrievalDecision:
+    """Decide whether to retrieve documents for a query.
+
+    Args:
+        query: User query
+        threshold: Minimum retrieval probability for longer queries that
+            no rule matched
+
+    Returns:
+        RetrievalDecision with the reason and classifier score
+    """
+    text = query.strip()
+    if not text:
+        return RetrievalDecision(retrieve=False, reason="empty", score=0.0)
+    if _SMALLTALK.match(text):
+        return RetrievalDecision(retrieve=False, reason="smalltalk", score=0.0)
+    if is_arithmetic(text):
+        return RetrievalDecision(retrieve=False, reason="arithmetic", score=0.0)
+
+    score = retrieval_probability(text)
+    if _WEATHER.search(text) and not _DOCUMENT_HINTS.search(text) and len(text.split()) <= 12:
+        return RetrievalDecision(retrieve=False, reason="weather", score=score)
+    if len(text.split()) <= _SHORT_QUERY_TOKENS:
+        # Too little text to judge; a wasted search is cheaper than a missed one
+        return RetrievalDecision(retrieve=True, reason="short", score=score)
+    if score < threshold and not _IDENTIFIER.search(text):
+        return RetrievalDecision(retrieve=False, reason="classifier", score=score)
+    return RetrievalDecision(retrieve=True, reason="classifier", score=score)
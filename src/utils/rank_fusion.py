@@ -0,0 +1,36 @@
+"""Reciprocal rank fusion of ranked result lists."""
+
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    weights: Optional[Sequence[float]] = None,
+    rank_constant: int = 60,
+) -> List[Tuple[Hashable, float]]:
+    """Fuse ranked lists by weighted reciprocal rank.
+
+    Each item scores ``sum(weight / (rank_constant + rank))`` over the
+    lists it appears in (ranks start at 1). Only ranks are used, so lists
+    with incomparable scores (BM25 and cosine similarity) fuse cleanly.
+
+    Args:
+        rankings: Ranked lists of item keys, best first
+        weights: Per-list weights (defaults to 1.0 each)
+        rank_constant: Smoothing constant; larger values flatten the
+            advantage of top ranks
+
+    Returns:
+        (key, fused score) pairs, best first
+    """
+    if weights is None:
+        weights = [1.0] * len(rankings)
+    if len(weights) != len(rankings):
+        raise ValueError("weights must match the number of rankings")
+
+    scores: Dict[Hashable, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, key in enumerate(ranking, 1):
+            scores[key] = scores.get(key, 0.0) + weight / (rank_constant + rank)
+    # sorted() is stable, so ties keep first-seen order
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,256 @@
+"""Elasticsearch readiness tracking.
+
+The cluster is probed asynchronously with jittered exponential backoff
+until it reports at least ``ELASTICSEARCH_WAIT_FOR_STATUS`` and the index
+exists. Until then retrieval fails fast with :class:`SearchUnavailableError`
+instead of waiting for request timeouts, and the retrieval gate skips
+retrieval. Connection failures and search timeouts after the cluster
+was ready put it back into the waiting state and restart probing.
+
+The local vector backend is always ready.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+from src.config.config import Config
+from src.utils.clients import get_clients
+
+if TYPE_CHECKING:
+    from elasticsearch import AsyncElasticsearch
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN = "unknown"  # not probed yet
+WAITING = "waiting"  # probed, cluster or index not ready
+READY = "ready"
+
+_HEALTH_RANK = {"red": 0, "yellow": 1, "green": 2}
+
+
+class SearchUnavailableError(RuntimeError):
+    """Raised when retrieval is attempted while the search index is not ready."""
+
+
+class SearchReadiness:
+    """Readiness state of the Elasticsearch cluster and index."""
+
+    def __init__(
+        self,
+        index_name: Optional[str] = None,
+        wait_for_status: Optional[str] = None,
+        probe_timeout: Optional[float] = None,
+        backoff: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+        require_index: bool = True,
+        client: Optional[AsyncElasticsearch] = None,
+    ):
+        """Initialize the readiness tracker.
+
+        Args:
+            index_name: Index that must exist (defaults to ``ELASTICSEARCH_INDEX``)
+            wait_for_status: Minimum cluster health, "yellow" or "green"
+                (defaults to ``ELASTICSEARCH_WAIT_FOR_STATUS``)
+            probe_timeout: Seconds per probe request
+            backoff: Initial seconds between probes
+            backoff_max: Upper bound of the probe interval
+            require_index: Also wait for the index to exist; ingestion
+                creates it, so bootstrapping waits for the cluster only
+            client: Client to probe with (defaults to the shared client)
+        """
+        self.index_name = index_name or Config.ELASTICSEARCH_INDEX
+        self.wait_for_status = (wait_for_status or Config.ELASTICSEARCH_WAIT_FOR_STATUS).lower()
+        if self.wait_for_status not in _HEALTH_RANK:
+            raise ValueError(f"Unknown cluster health status: {self.wait_for_status!r}")
+        self.probe_timeout = probe_timeout or Config.ELASTICSEARCH_PROBE_TIMEOUT
+        self.backoff = backoff or Config.ELASTICSEARCH_PROBE_BACKOFF
+        self.backoff_max = backoff_max or Config.ELASTICSEARCH_PROBE_BACKOFF_MAX
+        self.require_index = require_index
+        self._client = client
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.status = UNKNOWN
+        self.detail = "not probed yet"
+        self.cluster_status: Optional[str] = None
+        self.probes = 0
+        self.changed_at = time.time()
+
+    @property
+    def ready(self) -> bool:
+        """Whether retrieval may use Elasticsearch."""
+        return self.status == READY
+
+    def _set(self, status: str, detail: str, cluster_status: Optional[str] = None) -> None:
+        with self._lock:
+            if status != self.status:
+                self.changed_at = time.time()
+                log = logger.info if status == READY else logger.warning
+                log("Elasticsearch %s: %s", status, detail)
+            self.status = status
+            self.detail = detail
+            self.cluster_status = cluster_status
+
+    async def probe(self) -> bool:
+        """Check cluster health and the index once.
+
+        Returns:
+            True if the cluster and index are ready
+        """
+        self.probes += 1
+        client = (self._client or get_clients().get_async_es_client()).options(
+            request_timeout=self.probe_timeout + 1, max_retries=0
+        )
+        try:
+            health = await client.cluster.health(
+                wait_for_status=self.wait_for_status,
+                timeout=f"{self.probe_timeout:g}s",
+            )
+            cluster_status = health.get("status")
+            if health.get("timed_out") or _HEALTH_RANK.get(cluster_status, -1) < _HEALTH_RANK[self.wait_for_status]:
+                self._set(WAITING, f"cluster health is {cluster_status}, waiting for {self.wait_for_status}",
+                          cluster_status)
+                return False
+            if self.require_index and not await client.indices.exists(index=self.index_name):
+                self._set(WAITING, f"index {self.index_name} does not exist", cluster_status)
+                return False
+        except Exception as e:
+            self._set(WAITING, f"{type(e).__name__}: {e}")
+            return False
+        self._set(READY, f"cluster health is {cluster_status}", cluster_status)
+        return True
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Probe with jittered exponential backoff until ready.
+
+        Args:
+            timeout: Seconds to wait in total, or None to wait indefinitely
+
+        Returns:
+            True if ready, False if the timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = self.backoff
+        while not await self.probe():
+            # Jitter spreads the probes of many workers starting together
+            wait = delay + random.uniform(0, delay / 2)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            await asyncio.sleep(wait)
+            delay = min(delay * 2, self.backoff_max)
+        return True
+
+    def start(self) -> None:
+        """Probe in the background of the running event loop, if not already."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            task = self._task
+            if task is not None and not task.done() and task.get_loop() is loop:
+                return
+            self._task = loop.create_task(self.wait())
+
+    async def ensure_ready(self) -> None:
+        """Fail fast unless retrieval can use the search backend.
+
+        The first call probes once inline; afterwards a not-ready cluster
+        is probed in the background and calls return immediately.
+
+        Raises:
+            SearchUnavailableError: If the cluster or index is not ready
+        """
+        if Config.VECTOR_BACKEND == "local" or self.ready:
+            return
+        if self.status == UNKNOWN and await self.probe():
+            return
+        self.start()
+        raise SearchUnavailableError(f"Search index is not ready ({self.detail})")
+
+    def report_failure(self, error: BaseException) -> None:
+        """Return to the waiting state after a connection-level failure.
+
+        Timeouts count as unavailability, so only pass errors of the search
+        stage here (not the query-embedding timeout). Query errors (bad
+        requests, script failures) do not change readiness.
+
+        Args:
+            error: Exception raised by a search request
+        """
+        if Config.VECTOR_BACKEND == "local" or not _is_unavailable(error):
+            return
+        self._set(WAITING, f"{type(error).__name__}: {str(error) or 'search timed out'}")
+        try:
+            self.start()
+        except RuntimeError:
+            pass  # no running loop; the next ensure_ready() restarts probing
+
+    def snapshot(self) -> dict:
+        """Get the readiness state.
+
+        Returns:
+            Dictionary with backend, status, detail, cluster health, probe
+            count and seconds since the last change
+        """
+        if Config.VECTOR_BACKEND == "local":
+            return {"backend": "local", "status": READY}
+        with self._lock:
+            return {
+                "backend": "elasticsearch",
+                "status": self.status,
+                "detail": self.detail,
+                "cluster_status": self.cluster_status,
+                "wait_for_status": self.wait_for_status,
+                "index": self.index_name,
+                "probes": self.probes,
+                "seconds_in_status": round(time.time() - self.changed_at, 1),
+            }
+
+
+def _is_unavailable(error: BaseException) -> bool:
+    """Whether an Elasticsearch error means the cluster or index is unavailable."""
+    from elastic_transport import ConnectionError, ConnectionTimeout
+    from elasticsearch import ApiError
+
+    # asyncio.TimeoutError comes from the search stage timeout: a hung or
+    # overloaded cluster that accepts connections but does not answer
+    if isinstance(error, (ConnectionError, ConnectionTimeout, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, ApiError):
+        return error.meta.status == 503 or (error.meta.status == 404 and "index_not_found" in str(error))
+    return False
+
+
+_readiness: Optional[SearchReadiness] = None
+_readiness_lock = threading.Lock()
+
+
+def get_search_readiness() -> SearchReadiness:
+    """Get the process-wide readiness tracker.
+
+    Returns:
+        Shared SearchReadiness instance
+    """
+    global _readiness
+    with _readiness_lock:
+        if _readiness is None:
+            _readiness = SearchReadiness()
+        return _readiness
+
+
+def search_ready() -> bool:
+    """Whether retrieval can currently use the search backend.
+
+    Returns:
+        True for the local backend or a ready Elasticsearch index; an
+        unprobed cluster counts as ready so the first query probes it
+    """
+    if Config.VECTOR_BACKEND == "local":
+        return True
+    return get_search_readiness().status != WAITING
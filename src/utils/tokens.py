@@ -0,0 +1,76 @@
+"""Token count estimation.
+
+Ollama does not expose a tokenizer endpoint, so prompt sizes are estimated
+locally. ASCII text averages about four characters per token; Hangul, CJK
+and other non-ASCII characters are counted as roughly one token each,
+which errs on the side of a larger estimate for Korean text.
+"""
+
+from typing import Iterable
+
+# Fixed per-message cost for role markers and chat-template tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    ascii_chars = len(text) - non_ascii
+    return non_ascii + (ascii_chars + 3) // 4
+
+
+def _content_text(content) -> str:
+    """Flatten message content (string or content blocks) to text."""
+    if isinstance(content, str):
+        return content
+    parts = []
+    for block in content or []:
+        if isinstance(block, str):
+            parts.append(block)
+        elif isinstance(block, dict) and block.get("type") == "text":
+            parts.append(block.get("text", ""))
+    return "".join(parts)
+
+
+def estimate_message_tokens(message) -> int:
+    """Estimate the prompt tokens used by one chat message.
+
+    Args:
+        message: LangChain message or ``{"role", "content"}`` dict
+
+    Returns:
+        Estimated token count including tool calls
+    """
+    if isinstance(message, dict):
+        content = message.get("content", "")
+        tool_calls = message.get("tool_calls") or []
+    else:
+        content = getattr(message, "content", "")
+        tool_calls = getattr(message, "tool_calls", None) or []
+
+    tokens = MESSAGE_OVERHEAD_TOKENS + estimate_tokens(_content_text(content))
+    for tool_call in tool_calls:
+        tokens += estimate_tokens(str(tool_call.get("name", "")))
+        tokens += estimate_tokens(str(tool_call.get("args", "")))
+    return tokens
+
+
+def estimate_messages_tokens(messages: Iterable) -> int:
+    """Estimate the prompt tokens used by a list of chat messages.
+
+    Args:
+        messages: LangChain messages or dicts
+
+    Returns:
+        Estimated total token count
+    """
+    return sum(estimate_message_tokens(message) for message in messages)
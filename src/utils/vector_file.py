@@ -0,0 +1,286 @@
+"""Append-only, memory-mapped vector file.
+
+Vectors are stored as raw float32 rows in ``<path>.vec`` and read back
+through a memory map, so opening a large store costs almost nothing.
+A sidecar ``<path>.idx`` text file maps each key to its row and write
+time; both files are only appended to, which keeps writes crash-safe
+(a torn trailing record is ignored on the next open). Removed keys are
+recorded as tombstones, and :meth:`VectorFile.compact` rewrites the live
+rows once removed and shadowed rows take up too much of the file.
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_DTYPE = np.float32
+_HEADER_PREFIX = "#dim\t"
+_TOMBSTONE_ROW = -1
+
+
+class VectorFile:
+    """Persistent key → vector mapping backed by a memory-mapped file.
+
+    Thread-safe. Later appends for the same key shadow earlier ones, and
+    :meth:`remove_many` hides a key until it is appended again.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        """Open (or create) a vector file.
+
+        Args:
+            path: Base path; ``.vec`` and ``.idx`` suffixes are added
+        """
+        base = Path(path)
+        base.parent.mkdir(parents=True, exist_ok=True)
+        self._vec_path = base.with_name(base.name + ".vec")
+        self._idx_path = base.with_name(base.name + ".idx")
+        self._lock = threading.Lock()
+        self._dim: Optional[int] = None
+        self._rows = 0
+        self._index: Dict[str, Tuple[int, float]] = {}
+        self._mmap: Optional[np.memmap] = None
+        self._load()
+
+    @property
+    def dim(self) -> Optional[int]:
+        """Vector dimension, or None while the file is empty."""
+        return self._dim
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def dead_fraction(self) -> float:
+        """Share of stored rows that are shadowed or removed."""
+        with self._lock:
+            return 1.0 - len(self._index) / self._rows if self._rows else 0.0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def keys(self) -> Iterator[str]:
+        """Iterate over stored keys."""
+        return iter(list(self._index))
+
+    def get(self, key: str) -> Optional[Tuple[List[float], float]]:
+        """Read a vector.
+
+        Args:
+            key: Vector key
+
+        Returns:
+            (vector, write timestamp), or None if the key is unknown
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            row, written_at = entry
+            if self._mmap is None or self._mmap.shape[0] <= row:
+                self._remap()
+            return self._mmap[row].tolist(), written_at
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Read several vectors at once.
+
+        Args:
+            keys: Vector keys
+
+        Returns:
+            Mapping of found keys to float32 vectors
+        """
+        with self._lock:
+            rows = {key: self._index[key][0] for key in keys if key in self._index}
+            if not rows:
+                return {}
+            if self._mmap is None or self._mmap.shape[0] <= max(rows.values()):
+                self._remap()
+            return {key: np.array(self._mmap[row]) for key, row in rows.items()}
+
+    def append(self, key: str, vector, written_at: Optional[float] = None) -> None:
+        """Append a vector.
+
+        Args:
+            key: Vector key
+            vector: Sequence of floats
+            written_at: Write timestamp (defaults to now)
+        """
+        self.append_many([(key, vector)], written_at=written_at)
+
+    def append_many(self, items, written_at: Optional[float] = None) -> None:
+        """Append several vectors in one write.
+
+        Args:
+            items: Iterable of (key, vector) pairs
+            written_at: Write timestamp (defaults to now)
+        """
+        items = list(items)
+        if not items:
+            return
+        written_at = time.time() if written_at is None else written_at
+        matrix = np.asarray([vector for _, vector in items], dtype=_DTYPE)
+
+        with self._lock:
+            if self._dim is None:
+                self._dim = int(matrix.shape[1])
+                with open(self._idx_path, "a", encoding="utf-8") as f:
+                    f.write(f"{_HEADER_PREFIX}{self._dim}\n")
+            if matrix.shape[1] != self._dim:
+                raise ValueError(
+                    f"Vector dimension {matrix.shape[1]} does not match store dimension {self._dim}"
+                )
+
+            first_row = self._rows
+            with open(self._vec_path, "ab") as f:
+                f.write(matrix.tobytes())
+            lines = []
+            for offset, (key, _) in enumerate(items):
+                row = first_row + offset
+                self._index[key] = (row, written_at)
+                lines.append(f"{key}\t{row}\t{written_at:.3f}\n")
+            with open(self._idx_path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+            self._rows += len(items)
+
+    def remove_many(self, keys) -> int:
+        """Remove keys; their rows stay on disk until :meth:`compact`.
+
+        Args:
+            keys: Keys to remove
+
+        Returns:
+            Number of keys that were present
+        """
+        with self._lock:
+            present = [key for key in keys if key in self._index]
+            if not present:
+                return 0
+            now = time.time()
+            for key in present:
+                del self._index[key]
+            with open(self._idx_path, "a", encoding="utf-8") as f:
+                f.writelines(f"{key}\t{_TOMBSTONE_ROW}\t{now:.3f}\n" for key in present)
+            return len(present)
+
+    def prune(self, max_entries: Optional[int] = None, max_age: float = 0) -> int:
+        """Remove expired entries, then the oldest ones beyond a size cap.
+
+        Args:
+            max_entries: Maximum number of keys to keep, or None for no cap
+            max_age: Remove entries written more than this many seconds
+                ago (0 disables expiry)
+
+        Returns:
+            Number of removed keys
+        """
+        now = time.time()
+        with self._lock:
+            by_age = sorted(self._index.items(), key=lambda item: item[1][1])
+        expired = [key for key, (_, written_at) in by_age if max_age > 0 and now - written_at > max_age]
+        live = len(by_age) - len(expired)
+        oldest = []
+        if max_entries is not None and live > max_entries:
+            expired_keys = set(expired)
+            oldest = [key for key, _ in by_age if key not in expired_keys][:live - max_entries]
+        return self.remove_many(expired + oldest)
+
+    def compact(self) -> None:
+        """Rewrite the files with only the live rows.
+
+        New files are written next to the old ones and swapped in. The old
+        index is removed before the vector file is replaced, so a crash
+        mid-swap leaves an empty store rather than a mismatched one.
+        """
+        with self._lock:
+            if self._dim is None:
+                return
+            vec_tmp = self._vec_path.with_name(self._vec_path.name + ".tmp")
+            idx_tmp = self._idx_path.with_name(self._idx_path.name + ".tmp")
+            items = sorted(self._index.items(), key=lambda item: item[1][0])
+            if items and (self._mmap is None or self._mmap.shape[0] < self._rows):
+                self._remap()
+
+            with open(vec_tmp, "wb") as vec, open(idx_tmp, "w", encoding="utf-8") as idx:
+                idx.write(f"{_HEADER_PREFIX}{self._dim}\n")
+                index = {}
+                for row, (key, (old_row, written_at)) in enumerate(items):
+                    vec.write(np.asarray(self._mmap[old_row], dtype=_DTYPE).tobytes())
+                    idx.write(f"{key}\t{row}\t{written_at:.3f}\n")
+                    index[key] = (row, written_at)
+                vec.flush()
+                idx.flush()
+                os.fsync(vec.fileno())
+                os.fsync(idx.fileno())
+
+            before = self._rows
+            self._mmap = None
+            self._idx_path.unlink(missing_ok=True)
+            os.replace(vec_tmp, self._vec_path)
+            os.replace(idx_tmp, self._idx_path)
+            self._index = index
+            self._rows = len(items)
+            self._remap()
+            logger.info("Compacted %s from %d to %d rows", self._vec_path, before, self._rows)
+
+    def _load(self) -> None:
+        """Read the sidecar index and map the vector file."""
+        for leftover in (self._vec_path, self._idx_path):
+            # Temporary files of an interrupted compaction
+            leftover.with_name(leftover.name + ".tmp").unlink(missing_ok=True)
+        if not self._idx_path.exists():
+            # Rows without an index cannot be attributed to keys
+            self._vec_path.unlink(missing_ok=True)
+            return
+
+        with open(self._idx_path, encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(_HEADER_PREFIX):
+                    self._dim = int(line[len(_HEADER_PREFIX):])
+                    continue
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) != 3:
+                    continue
+                try:
+                    row, written_at = int(parts[1]), float(parts[2])
+                except ValueError:
+                    continue
+                if row == _TOMBSTONE_ROW:
+                    self._index.pop(parts[0], None)
+                else:
+                    self._index[parts[0]] = (row, written_at)
+
+        if self._dim is None or not self._vec_path.exists():
+            self._index.clear()
+            return
+
+        row_bytes = self._dim * np.dtype(_DTYPE).itemsize
+        size = self._vec_path.stat().st_size
+        self._rows = size // row_bytes
+        if size % row_bytes:
+            # Cut a torn trailing row so later appends stay aligned
+            with open(self._vec_path, "r+b") as f:
+                f.truncate(self._rows * row_bytes)
+        # Drop index entries whose vector write never completed
+        stale = [key for key, (row, _) in self._index.items() if row >= self._rows]
+        for key in stale:
+            del self._index[key]
+        if stale:
+            logger.warning("Ignored %d incomplete records in %s", len(stale), self._vec_path)
+        self._remap()
+
+    def _remap(self) -> None:
+        """Refresh the memory map to cover every written row."""
+        if self._dim is None or self._rows == 0:
+            self._mmap = None
+            return
+        self._mmap = np.memmap(
+            self._vec_path, dtype=_DTYPE, mode="r", shape=(self._rows, self._dim)
+        )
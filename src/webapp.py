@@ -0,0 +1,54 @@
+"""Custom HTTP routes served by the LangGraph server.
+
+Mounted through ``http.app`` in langgraph.json, next to the LangGraph API.
+Its lifespan closes the shared clients when the server shuts down.
+"""
+
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from src.config.config import Config
+from src.utils.clients import aclose_clients
+from src.utils.metrics import render_metrics
+from src.utils.readiness import READY, UNKNOWN, get_search_readiness
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def metrics(request: Request) -> PlainTextResponse:
+    """Serve node/tool latency histograms for a Prometheus scrape."""
+    return PlainTextResponse(render_metrics(), headers={"Content-Type": PROMETHEUS_CONTENT_TYPE})
+
+
+async def ready(request: Request) -> JSONResponse:
+    """Report search readiness; 503 while Elasticsearch or the index is not ready."""
+    readiness = get_search_readiness()
+    if Config.VECTOR_BACKEND != "local" and readiness.status == UNKNOWN:
+        await readiness.probe()
+    state = readiness.snapshot()
+    return JSONResponse(state, status_code=200 if state["status"] == READY else 503)
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    """Close the pooled clients inside the server's event loop on shutdown.
+
+    The async Elasticsearch and Ollama transports are bound to this loop,
+    so the ``atexit`` fallback in :mod:`src.utils.clients` cannot close them.
+    """
+    yield
+    await aclose_clients()
+
+
+app = Starlette(
+    lifespan=lifespan,
+    routes=[
+        Route("/metrics", metrics, methods=["GET"]),
+        Route("/ready", ready, methods=["GET"]),
+    ]
+)
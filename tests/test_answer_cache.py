@@ -0,0 +1,75 @@
+"""Tests for the semantic answer cache."""
+
+import time
+
+import pytest
+
+from src.utils import answer_cache
+from src.utils.answer_cache import SemanticAnswerCache
+
+
+def test_close_query_with_same_documents_hits():
+    cache = SemanticAnswerCache(threshold=0.95)
+    cache.store([1.0, 0.0], "answer", ["d1", "d2"], "g1", llm_seconds=2.5)
+
+    found = cache.lookup([1.0, 0.05], ["d1", "d2"], "g1")
+    assert found is not None
+    entry, similarity = found
+    assert entry.answer == "answer"
+    assert similarity > 0.95
+    assert cache.stats()["llm_seconds_saved"] == pytest.approx(2.5)
+
+
+def test_misses():
+    cache = SemanticAnswerCache(threshold=0.95)
+    assert cache.lookup([1.0, 0.0], ["d1"], "g1") is None
+    cache.store([1.0, 0.0], "answer", ["d1"], "g1", llm_seconds=1.0)
+
+    # Same query, different retrieved documents
+    assert cache.lookup([1.0, 0.0], ["d2"], "g1") is None
+    # Same documents, dissimilar query
+    assert cache.lookup([0.0, 1.0], ["d1"], "g1") is None
+    # Different embedding dimension
+    assert cache.lookup([1.0, 0.0, 0.0], ["d1"], "g1") is None
+    stats = cache.stats()
+    assert stats["hits"] == 0 and stats["misses"] == 4
+
+
+def test_generation_change_invalidates():
+    cache = SemanticAnswerCache()
+    cache.store([1.0, 0.0], "old", ["d1"], "g1", llm_seconds=1.0)
+    assert cache.lookup([1.0, 0.0], ["d1"], "g2") is None
+    stats = cache.stats()
+    assert stats["invalidations"] == 1 and stats["size"] == 0
+
+
+def test_least_recently_used_entry_is_overwritten(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = SemanticAnswerCache(max_entries=2)
+    cache.store([1.0, 0.0], "a", ["d"], "g", llm_seconds=1.0)
+    now[0] += 1
+    cache.store([0.0, 1.0], "b", ["d"], "g", llm_seconds=1.0)
+    now[0] += 1
+    assert cache.lookup([1.0, 0.0], ["d"], "g")[0].answer == "a"
+    now[0] += 1
+    cache.store([-1.0, 0.0], "c", ["d"], "g", llm_seconds=1.0)
+
+    assert cache.lookup([0.0, 1.0], ["d"], "g") is None
+    assert cache.lookup([1.0, 0.0], ["d"], "g")[0].answer == "a"
+    assert cache.lookup([-1.0, 0.0], ["d"], "g")[0].answer == "c"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_metrics_export(monkeypatch):
+    monkeypatch.setattr(answer_cache, "_answer_cache", None)
+    assert answer_cache._collect_metrics() == []
+
+    cache = SemanticAnswerCache()
+    cache.store([1.0], "a", ["d"], "g", llm_seconds=1.5)
+    cache.lookup([1.0], ["d"], "g")
+    monkeypatch.setattr(answer_cache, "_answer_cache", cache)
+    lines = answer_cache._collect_metrics()
+    assert 'langgraph_answer_cache_events_total{event="hit"} 1' in lines
+    assert "langgraph_answer_cache_llm_seconds_saved_total 1.5" in lines
+    assert "langgraph_answer_cache_entries 1" in lines
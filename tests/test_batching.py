@@ -0,0 +1,117 @@
+"""Tests for adaptive embedding batch sizing."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.ingestion.batching import AdaptiveBatcher
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, "perf_counter", clock)
+    return clock
+
+
+def warmed_up(**kwargs):
+    batcher = AdaptiveBatcher(**kwargs)
+    # The first request pays for model loading and is not used for tuning
+    batcher.record(batcher.batch_size, 30.0)
+    return batcher
+
+
+def test_batch_size_moves_towards_the_target_latency():
+    batcher = warmed_up(batch_size=50, target_latency=2.0, concurrency=8)
+    assert batcher.batch_size == 50
+
+    sizes = []
+    for _ in range(3):
+        # 10 ms per chunk: 200 chunks fit the target, reached in 2x steps
+        batcher.record(batcher.batch_size, batcher.batch_size * 0.01)
+        sizes.append(batcher.batch_size)
+    assert sizes == [100, 200, 200]
+
+
+def test_batch_size_shrinks_by_at_most_half_and_respects_bounds():
+    batcher = warmed_up(batch_size=50, target_latency=2.0, min_batch_size=20, max_batch_size=80, concurrency=8)
+    batcher.record(50, 10.0)
+    assert batcher.batch_size == 25
+    batcher.record(25, 10.0)
+    assert batcher.batch_size == 20
+
+    fast = warmed_up(batch_size=50, target_latency=2.0, max_batch_size=80, concurrency=8)
+    fast.record(50, 0.01)
+    assert fast.batch_size == 80
+
+
+def test_concurrency_climbs_while_throughput_rises(clock):
+    batcher = warmed_up(concurrency=1, max_concurrency=3)
+    trajectory = []
+    # Chunks per second reached in each measurement window
+    for throughput in [20, 40, 60, 60, 30]:
+        requests = 2 * batcher.concurrency
+        for _ in range(requests):
+            clock.now += 1.0 / requests
+            batcher.record(throughput // requests, 0.1)
+        trajectory.append(batcher.concurrency)
+
+    # Up to the bound, then probe down; a throughput drop reverses again
+    assert trajectory == [2, 3, 3, 2, 3]
+    assert batcher.summary()["best_concurrency"] == 3
+
+
+def test_errors_halve_both_knobs_down_to_the_bounds():
+    batcher = warmed_up(batch_size=64, concurrency=8, min_batch_size=10)
+    trajectory = []
+    for _ in range(4):
+        batcher.record_failure()
+        trajectory.append((batcher.batch_size, batcher.concurrency))
+    assert trajectory == [(32, 4), (16, 2), (10, 1), (10, 1)]
+    assert batcher.errors == 4
+
+
+def test_initial_values_are_clamped():
+    batcher = AdaptiveBatcher(batch_size=1000, concurrency=20, max_batch_size=256, max_concurrency=8)
+    assert (batcher.batch_size, batcher.concurrency) == (256, 8)
+    assert batcher.workers == 8
+
+
+def test_fixed_mode_only_measures():
+    batcher = AdaptiveBatcher(batch_size=1000, concurrency=20, adaptive=False)
+    for _ in range(5):
+        batcher.record(1000, 9.0)
+    batcher.record_failure()
+    assert (batcher.batch_size, batcher.concurrency, batcher.workers) == (1000, 20, 20)
+
+    summary = batcher.summary()
+    assert summary["requests"] == 5 and summary["errors"] == 1
+    assert summary["latency_p50"] == 9.0
+
+
+def test_slots_limit_requests_in_flight():
+    batcher = AdaptiveBatcher(concurrency=2)
+    running, peak = 0, 0
+
+    async def request():
+        nonlocal running, peak
+        async with batcher.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    async def run():
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
@@ -0,0 +1,71 @@
+"""Tests for lazily resolved configuration settings."""
+
+import pytest
+
+from src.config import config
+from src.config.config import Config, _Setting
+
+
+@pytest.fixture(autouse=True)
+def fresh_config(monkeypatch):
+    # Keep a developer's .env out of the tests
+    monkeypatch.setattr(config, "_env_loaded", True)
+    Config.reload()
+    yield
+    Config.reload()
+
+
+def test_settings_resolve_on_first_access(monkeypatch):
+    assert isinstance(vars(Config)["RETRIEVAL_K"], _Setting)
+    monkeypatch.setenv("RETRIEVAL_K", "12")
+
+    assert Config.RETRIEVAL_K == 12
+    # The value is now cached on the class
+    assert vars(Config)["RETRIEVAL_K"] == 12
+    monkeypatch.setenv("RETRIEVAL_K", "3")
+    assert Config.RETRIEVAL_K == 12
+
+
+def test_values_are_coerced(monkeypatch):
+    monkeypatch.setenv("MMR_LAMBDA", "0.25")
+    monkeypatch.setenv("MMR_ENABLED", "TRUE")
+    monkeypatch.setenv("OLLAMA_WARMUP", "yes")
+    monkeypatch.setenv("VECTOR_BACKEND", "Local")
+    monkeypatch.setenv("TOOL_TIMEOUTS", "search_documents=15, get_weather=5,bogus")
+    monkeypatch.setenv("OLLAMA_PINNED_MODELS", "a, b,,")
+    monkeypatch.delenv("ELASTICSEARCH_API_KEY", raising=False)
+
+    assert Config.MMR_LAMBDA == 0.25
+    assert Config.MMR_ENABLED is True
+    assert Config.OLLAMA_WARMUP is False
+    assert Config.VECTOR_BACKEND == "local"
+    assert Config.TOOL_TIMEOUTS == {"search_documents": 15.0, "get_weather": 5.0}
+    assert Config.OLLAMA_PINNED_MODELS == ["a", "b"]
+    assert Config.ELASTICSEARCH_API_KEY is None
+
+
+def test_defaults_apply_without_the_environment(monkeypatch):
+    monkeypatch.delenv("TOOL_MAX_CONCURRENCY", raising=False)
+    assert Config.TOOL_MAX_CONCURRENCY == 8
+
+
+def test_reload_picks_up_a_changed_environment(monkeypatch):
+    monkeypatch.setenv("HISTORY_TOKEN_BUDGET", "500")
+    assert Config.HISTORY_TOKEN_BUDGET == 500
+    monkeypatch.delenv("MMR_FETCH_K", raising=False)
+    Config.MMR_FETCH_K = 99
+
+    monkeypatch.setenv("HISTORY_TOKEN_BUDGET", "900")
+    Config.reload()
+    assert Config.HISTORY_TOKEN_BUDGET == 900
+    # Overrides are forgotten too
+    assert Config.MMR_FETCH_K == 40
+
+
+def test_resolve_reads_every_setting(monkeypatch):
+    monkeypatch.setenv("RETRIEVAL_RRF_K", "30")
+    values = Config.resolve()
+
+    assert values["RETRIEVAL_RRF_K"] == 30
+    assert set(values) == set(config._SETTINGS)
+    assert not any(isinstance(value, _Setting) for value in vars(Config).values())
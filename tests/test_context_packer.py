@@ -0,0 +1,105 @@
+"""Tests for packing retrieved chunks into a token budget."""
+
+import random
+import string
+
+from langchain_core.documents import Document
+
+from src.utils.context_packer import (
+    format_passages,
+    merge_overlap,
+    pack_documents,
+    truncate_to_tokens,
+)
+from src.utils.tokens import estimate_tokens
+
+
+def sentences(topic, count):
+    """Non-repetitive text, so unrelated passages share few shingles."""
+    rng = random.Random(topic)
+
+    def words(n):
+        return " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8))) for _ in range(n))
+
+    return " ".join(f"The {topic} {words(6)} detail." for _ in range(count))
+
+
+def doc(text, source="manual.txt", doc_id=None):
+    return Document(id=doc_id, page_content=text, metadata={"source": source} if source else {})
+
+
+def test_merge_overlap():
+    text = sentences("router", 6)
+    first, second = text[:200], text[150:]
+    assert merge_overlap(first, second) == text
+    assert merge_overlap(text, text[40:120]) == text
+    assert merge_overlap(first, sentences("printer", 3)) is None
+    # Overlaps shorter than MIN_OVERLAP_CHARS are not merged
+    assert merge_overlap("abcdefghij", "fghijklmno") is None
+
+
+def test_overlapping_chunks_from_one_source_are_merged():
+    text = sentences("router", 8)
+    chunks = [(doc(text[250:], doc_id="c2"), 0.9), (doc(text[:300], doc_id="c1"), 0.7)]
+
+    passages = pack_documents(chunks, token_budget=1000)
+    assert len(passages) == 1
+    assert passages[0].text == text
+    assert passages[0].score == 0.9
+    assert sorted(passages[0].doc_ids) == ["c1", "c2"]
+
+
+def test_chunks_from_different_sources_are_not_merged():
+    text = sentences("router", 8)
+    chunks = [(doc(text[:300], "a.txt"), 0.9), (doc(text[250:], "b.txt"), 0.8)]
+    assert len(pack_documents(chunks, token_budget=1000)) == 2
+
+
+def test_near_duplicates_are_dropped():
+    text = sentences("warranty", 5)
+    chunks = [
+        (doc(text, "a.txt", "a"), 0.9),
+        (doc(text.replace("detail", "details", 1), "b.txt", "b"), 0.8),
+        (doc(sentences("shipping", 5), "c.txt", "c"), 0.7),
+    ]
+    passages = pack_documents(chunks, token_budget=1000)
+    assert [p.doc_ids for p in passages] == [["a"], ["c"]]
+
+
+def test_budget_is_filled_best_first():
+    chunks = [(doc(sentences(topic, 4), f"{topic}.txt", topic), score)
+              for topic, score in [("low", 0.1), ("high", 0.9), ("mid", 0.5)]]
+    one_passage = estimate_tokens(sentences("high", 4))
+
+    passages = pack_documents(chunks, token_budget=one_passage + 10)
+    # The remainder is below MIN_PASSAGE_TOKENS, so nothing else is added
+    assert [p.doc_ids for p in passages] == [["high"]]
+    assert pack_documents(chunks, token_budget=0) == []
+
+
+def test_last_passage_is_truncated_at_a_sentence_end():
+    long_text = sentences("manual", 20)
+    chunks = [(doc(sentences("intro", 2), "a.txt"), 0.9), (doc(long_text, "b.txt"), 0.8)]
+    budget = 150
+
+    passages = pack_documents(chunks, token_budget=budget)
+    assert len(passages) == 2
+    truncated = passages[1].text
+    assert long_text.startswith(truncated)
+    assert truncated.endswith("detail.")
+    assert sum(estimate_tokens(p.text) for p in passages) <= budget
+
+
+def test_truncate_to_tokens():
+    text = "First sentence here. Second sentence here. Third one."
+    assert truncate_to_tokens(text, 100) == text
+    assert truncate_to_tokens(text, 13) == "First sentence here. Second sentence here."
+    # A single over-long sentence is cut by characters
+    cut = truncate_to_tokens("x" * 100, 5)
+    assert cut == "x" * 20
+
+
+def test_format_passages():
+    passages = pack_documents([(doc("Reset with the pin.", "/data/manual.txt"), 1.0)], token_budget=100)
+    assert format_passages(passages) == "Retrieved Documents:\n\n1. (source: manual.txt) Reset with the pin.\n"
+    assert format_passages([]) == ""
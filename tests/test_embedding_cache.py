@@ -0,0 +1,179 @@
+"""Tests for the query-embedding cache and its disk store."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.utils.embedding_cache import CachedEmbeddings, EmbeddingCache, make_cache_key, normalize_query
+from src.utils.vector_file import VectorFile
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, "time", clock)
+    return clock
+
+
+def test_normalize_query_and_keys():
+    assert normalize_query("  Ｈｅｌｌｏ\tWORLD ") == "hello world"
+    assert make_cache_key("m", "Hello  world") == make_cache_key("m", "hello world")
+    assert make_cache_key("m", "hello") != make_cache_key("other", "hello")
+
+
+def test_lru_eviction():
+    cache = EmbeddingCache(max_size=2)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    assert cache.get("a") == [1.0]
+    cache.put("c", [3.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0] and cache.get("c") == [3.0]
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["size"] == 2
+    assert stats["hits"] == 3 and stats["misses"] == 1
+
+
+def test_ttl_expiry(clock):
+    cache = EmbeddingCache(ttl=60)
+    cache.put("a", [1.0])
+    clock.now += 59
+    assert cache.get("a") == [1.0]
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_disk_entries_survive_a_restart(tmp_path):
+    path = tmp_path / "embeddings"
+    EmbeddingCache(path=str(path)).put("a", [1.0, 2.0])
+
+    cache = EmbeddingCache(path=str(path))
+    assert cache.get("a") == pytest.approx([1.0, 2.0])
+    assert cache.stats()["disk_hits"] == 1
+    # The disk hit is promoted to memory
+    cache.get("a")
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_expired_disk_entries_are_pruned_on_open(tmp_path, clock):
+    path = tmp_path / "embeddings"
+    EmbeddingCache(ttl=60, path=str(path)).put("a", [1.0])
+    clock.now += 61
+
+    cache = EmbeddingCache(ttl=60, path=str(path))
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["disk_evictions"] == 1 and stats["disk_size"] == 0
+
+
+def test_disk_store_is_capped_and_compacted(tmp_path, clock):
+    path = tmp_path / "embeddings"
+    cache = EmbeddingCache(max_size=10, path=str(path))
+    for i in range(30):
+        clock.now += 1
+        cache.put(f"k{i}", [float(i)])
+
+    stats = cache.stats()
+    assert stats["disk_size"] <= 10
+    assert stats["disk_evictions"] == 30 - stats["disk_size"]
+    # Oldest entries go first
+    disk = VectorFile(path)
+    assert "k29" in disk and "k0" not in disk
+    assert (tmp_path / "embeddings.vec").stat().st_size < 30 * 4
+
+
+def test_cached_embeddings_only_cache_queries():
+    class Counting:
+        calls = 0
+
+        def embed_query(self, text):
+            self.calls += 1
+            return [float(len(text))]
+
+        def embed_documents(self, texts):
+            self.calls += 1
+            return [[0.0] for _ in texts]
+
+    inner = Counting()
+    embeddings = CachedEmbeddings(inner, EmbeddingCache(), model="m")
+    assert embeddings.embed_query("Hi") == [2.0]
+    assert embeddings.embed_query("  hi ") == [2.0]
+    embeddings.embed_documents(["x"])
+    embeddings.embed_documents(["x"])
+    assert inner.calls == 3
+
+
+def test_vector_file_shadowing_and_tombstones(tmp_path):
+    path = tmp_path / "store"
+    store = VectorFile(path)
+    store.append_many([("a", [1.0, 0.0]), ("b", [0.0, 1.0])], written_at=100.0)
+    store.append("a", [2.0, 0.0], written_at=200.0)
+    assert store.get("a") == ([2.0, 0.0], 200.0)
+    assert store.remove_many(["b", "missing"]) == 1
+    assert store.dead_fraction == pytest.approx(2 / 3)
+    with pytest.raises(ValueError):
+        store.append("c", [1.0])
+
+    reopened = VectorFile(path)
+    assert list(reopened.keys()) == ["a"]
+    assert reopened.get("a") == ([2.0, 0.0], 200.0)
+    assert reopened.get_many(["a", "b"]).keys() == {"a"}
+
+
+def test_vector_file_prune_and_compact(tmp_path, clock):
+    path = tmp_path / "store"
+    store = VectorFile(path)
+    for i in range(5):
+        store.append(f"k{i}", [float(i)], written_at=clock.now - 100 + i)
+    store.append("fresh", [9.0], written_at=clock.now)
+
+    # k0..k4 are older than max_age; no size cap beyond that
+    assert store.prune(max_age=50) == 5
+    assert list(store.keys()) == ["fresh"]
+    store.append_many([("x", [1.0]), ("y", [2.0])], written_at=clock.now)
+    assert store.prune(max_entries=2) == 1
+
+    store.compact()
+    assert store.dead_fraction == 0.0
+    assert not list(tmp_path.glob("*.tmp"))
+    reopened = VectorFile(path)
+    assert sorted(reopened.keys()) == ["x", "y"]
+    assert reopened.get("y")[0] == [2.0]
+
+
+def test_async_queries_persist_off_the_event_loop(tmp_path):
+    class Inner:
+        async def aembed_query(self, text):
+            return [1.0, 0.0]
+
+    cache = EmbeddingCache(path=str(tmp_path / "embeddings"))
+    threads = []
+    persist = cache.persist
+
+    def recording_persist(key, vector):
+        threads.append(threading.get_ident())
+        persist(key, vector)
+
+    cache.persist = recording_persist
+    embeddings = CachedEmbeddings(Inner(), cache, model="m")
+
+    async def run():
+        vector = await embeddings.aembed_query("q")
+        return vector, threading.get_ident()
+
+    vector, loop_thread = asyncio.run(run())
+    assert vector == [1.0, 0.0]
+    assert threads and threads[0] != loop_thread
+    assert make_cache_key("m", "q") in VectorFile(tmp_path / "embeddings")
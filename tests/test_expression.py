@@ -0,0 +1,84 @@
+"""Tests for the safe expression engine."""
+
+import math
+
+import numpy as np
+import pytest
+
+from src.utils.expression import ExpressionError, compile_expression, format_result
+
+
+def evaluate(source, variables=None):
+    return compile_expression(source).evaluate(variables)
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("2 + 2", 4),
+        ("12 * (3 + 4)", 84),
+        ("7 // 2", 3),
+        ("7 % 4", 3),
+        ("2 ** 10", 1024),
+        ("-3 + +1", -2),
+        ("sqrt(16)", 4.0),
+        ("round(pi, 2)", 3.14),
+        ("max(3, 9, 4)", 9.0),
+    ],
+)
+def test_scalar_arithmetic(source, expected):
+    assert evaluate(source) == pytest.approx(expected)
+
+
+def test_lists_evaluate_element_wise():
+    assert format_result(evaluate("[1, 2, 3] * 2")) == "[2.0, 4.0, 6.0]"
+    assert evaluate("mean([3, 5, 8]) * 2") == pytest.approx(32 / 3)
+
+
+def test_variables():
+    assert evaluate("x * 2 + y", {"x": 3, "y": 1}) == 7
+    assert evaluate("mean(x) / max(x)", {"x": [1, 2, 3]}) == pytest.approx(2 / 3)
+    with pytest.raises(ExpressionError, match="Unknown name"):
+        evaluate("z + 1")
+
+
+def test_compiled_expressions_are_cached_by_source():
+    assert compile_expression("1 + 1") is compile_expression("1 + 1")
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "__import__('os')",
+        "open('x')",
+        "(1).real",
+        "x if 1 else 2",
+        "[i for i in range(3)]",
+        "True + 1",
+        "'a' * 3",
+        "sqrt(x=4)",
+        "lambda: 1",
+    ],
+)
+def test_disallowed_syntax_is_rejected(source):
+    with pytest.raises(ExpressionError):
+        evaluate(source)
+
+
+@pytest.mark.parametrize("source", ["9 ** 9 ** 9", "10.0 ** 400", "1 / 0", "log(0)", "sqrt(-1)"])
+def test_limits_and_arithmetic_errors(source):
+    with pytest.raises(ExpressionError):
+        evaluate(source)
+
+
+def test_invalid_syntax_and_length():
+    with pytest.raises(ExpressionError, match="Invalid syntax"):
+        compile_expression("2024-01-01")
+    with pytest.raises(ExpressionError, match="too long"):
+        compile_expression("1+" * 600 + "1")
+
+
+def test_format_result():
+    assert format_result(np.float64(1.5)) == "1.5"
+    assert format_result(np.array([1.0, 2.0])) == "[1.0, 2.0]"
+    assert format_result(math.e) == str(math.e)
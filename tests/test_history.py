@@ -0,0 +1,105 @@
+"""Tests for conversation history compaction."""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.graph.message import add_messages
+
+from src.config.config import Config
+from src.nodes.history import compact_history, find_compaction_cut
+
+# About 100 tokens per message with the four-characters-per-token estimate
+LONG = "x" * 400
+
+
+class FakeSummarizer:
+    """Chat model stand-in that records prompts and numbers its summaries."""
+
+    def __init__(self, fail=False):
+        self.prompts = []
+        self.fail = fail
+
+    def bind(self, **kwargs):
+        return self
+
+    async def ainvoke(self, messages):
+        if self.fail:
+            raise ConnectionError("ollama down")
+        self.prompts.append(messages[0].content)
+        return AIMessage(content=f"<think>plan</think>summary {len(self.prompts)}")
+
+
+def conversation():
+    return [
+        HumanMessage(id="h1", content=LONG),
+        AIMessage(id="a1", content="", tool_calls=[{"name": "search_documents", "args": {"query": "q"}, "id": "c1"}]),
+        ToolMessage(id="t1", content=LONG, tool_call_id="c1", name="search_documents"),
+        AIMessage(id="a1b", content=LONG),
+        HumanMessage(id="h2", content=LONG),
+        AIMessage(id="a2", content=LONG),
+        HumanMessage(id="h3", content="short question"),
+    ]
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    monkeypatch.setattr(Config, "HISTORY_TOKEN_BUDGET", 300)
+    monkeypatch.setattr(Config, "HISTORY_SUMMARY_TOKENS", 60)
+    # One message per summarization batch
+    monkeypatch.setattr(Config, "OLLAMA_NUM_CTX_MAX", 256)
+
+
+def test_cuts_only_at_user_messages():
+    messages = conversation()
+    # A budget that would fit from the ToolMessage onwards still cuts at a turn start
+    cut = find_compaction_cut(messages, budget=450)
+    assert messages[cut].type == "human"
+    assert cut == 4
+    assert find_compaction_cut(messages, budget=10_000) == 0
+    # The latest turn is kept even when it alone exceeds the budget
+    assert find_compaction_cut(messages, budget=1) == 6
+    assert find_compaction_cut([AIMessage(content=LONG)], budget=1) == 0
+
+
+def test_history_under_budget_is_untouched(budget):
+    state = {"messages": [HumanMessage(id="h1", content="hi")], "summary": "earlier"}
+    summarizer = FakeSummarizer()
+    assert asyncio.run(compact_history(state, summarizer)) == {}
+    assert summarizer.prompts == []
+
+
+def test_folded_turns_are_summarized_and_removed(budget):
+    messages = conversation()
+    summarizer = FakeSummarizer()
+    update = asyncio.run(compact_history({"messages": messages, "summary": "earlier facts"}, summarizer))
+
+    # h1's turn with its tool call is folded; the two recent turns stay
+    remaining = add_messages(messages, update["messages"])
+    assert [msg.id for msg in remaining] == ["h2", "a2", "h3"]
+    assert update["summary"] == f"summary {len(summarizer.prompts)}"
+
+    # Batches fold in order, each on top of the previous summary
+    assert len(summarizer.prompts) > 1
+    assert "Current summary:\nearlier facts" in summarizer.prompts[0]
+    assert "Current summary:\nsummary 1" in summarizer.prompts[1]
+    assert "[called search_documents" in "".join(summarizer.prompts)
+
+
+def test_tool_call_and_result_stay_together(budget, monkeypatch):
+    # The verbatim budget fits everything from the ToolMessage onwards
+    monkeypatch.setattr(Config, "HISTORY_TOKEN_BUDGET", 510)
+    messages = conversation()
+    update = asyncio.run(compact_history({"messages": messages}, FakeSummarizer()))
+    removed = {msg.id for msg in update["messages"]}
+    assert removed == {"h1", "a1", "t1", "a1b"}
+
+
+def test_summary_length_follows_the_config(budget):
+    summarizer = FakeSummarizer()
+    asyncio.run(compact_history({"messages": conversation()}, summarizer))
+    assert "at most 40 words" in summarizer.prompts[0]
+
+
+def test_failed_summarization_keeps_history(budget):
+    assert asyncio.run(compact_history({"messages": conversation()}, FakeSummarizer(fail=True))) == {}
@@ -0,0 +1,58 @@
+"""Tests for the ingestion checkpoint journal."""
+
+from src.ingestion.journal import IngestJournal
+
+
+def write_run(path, settings):
+    journal = IngestJournal(path, settings=settings)
+    journal.open()
+    journal.record_chunks({"a.txt": ["a1", "a2"], "b.txt": ["b1"]})
+    journal.record_file("a.txt", ["a1", "a2"], sha256="h")
+    journal.close()
+
+
+def test_resume_recovers_progress(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    write_run(path, {"model": "m"})
+    # A torn trailing line from a crash is ignored
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"chunks": {"b.txt": ["b2"')
+
+    state = IngestJournal(path, settings={"model": "m"}).load()
+    assert state.chunks == {"a.txt": {"a1", "a2"}, "b.txt": {"b1"}}
+    assert state.files == {"a.txt": (["a1", "a2"], "h")}
+
+
+def test_resume_appends_to_a_matching_journal(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    write_run(path, {"model": "m"})
+
+    journal = IngestJournal(path, settings={"model": "m"})
+    journal.open(resume=True)
+    journal.record_chunks({"b.txt": ["b2"]})
+    journal.close()
+    assert journal.load().chunks["b.txt"] == {"b1", "b2"}
+
+
+def test_resume_with_other_settings_starts_a_new_journal(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    write_run(path, {"model": "old"})
+
+    journal = IngestJournal(path, settings={"model": "new"})
+    assert journal.load().chunks == {}
+    journal.open(resume=True)
+    journal.record_chunks({"c.txt": ["c1"]})
+    journal.close()
+
+    # This run's progress survives the next resume
+    state = IngestJournal(path, settings={"model": "new"}).load()
+    assert state.chunks == {"c.txt": {"c1"}}
+    assert state.files == {}
+
+
+def test_discard(tmp_path):
+    journal = IngestJournal(tmp_path / "journal.jsonl", settings={})
+    journal.open()
+    assert journal.exists()
+    journal.discard()
+    assert not journal.exists()
@@ -0,0 +1,227 @@
+"""Tests for the memory-mapped local vector store."""
+
+import asyncio
+import zlib
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from src.ingestion.sinks import LocalSink
+from src.utils.local_vector_store import LocalVectorStore
+
+
+class HashEmbeddings(Embeddings):
+    """Deterministic embeddings seeded by the text."""
+
+    def embed_documents(self, texts):
+        return [np.random.default_rng(zlib.crc32(text.encode())).normal(size=8).tolist() for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def open_store(path, **kwargs):
+    return LocalVectorStore(path, HashEmbeddings(), **kwargs)
+
+
+def basis(index, dim=4):
+    vector = [0.0] * dim
+    vector[index] = 1.0
+    return vector
+
+
+def test_search_returns_nearest_first(tmp_path):
+    store = open_store(tmp_path)
+    store.add_vectors(["a", "b", "c"], [basis(0), basis(1), [0.9, 0.1, 0, 0]], [{"n": 1}, {}, {}], ids=["a", "b", "c"])
+
+    results = store.search_by_vector(basis(0), k=2)
+    assert [doc.id for doc, _, _ in results] == ["a", "c"]
+    assert results[0][0].page_content == "a"
+    assert results[0][0].metadata == {"n": 1}
+    # Cosine 1.0 maps to 1.0 on the Elasticsearch (1 + cos) / 2 scale
+    assert results[0][1] == pytest.approx(1.0)
+    assert len(store) == 3 and store.dim == 4
+
+
+def test_with_vectors_returns_unit_vectors(tmp_path):
+    store = open_store(tmp_path)
+    store.add_vectors(["a"], [[3.0, 0, 0, 0]], ids=["a"])
+    (_, _, vector), = store.search_by_vector(basis(0), k=1, with_vectors=True)
+    assert vector == pytest.approx(basis(0))
+
+
+def test_add_texts_embeds_and_generates_ids(tmp_path):
+    store = open_store(tmp_path)
+    ids = store.add_texts(["first text", "second text"])
+    assert len(set(ids)) == 2
+    docs = store.similarity_search("first text", k=1)
+    assert docs[0].page_content == "first text"
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    store = open_store(tmp_path)
+    store.add_vectors(["a"], [basis(0)])
+    with pytest.raises(ValueError):
+        store.add_vectors(["b"], [[1.0, 0.0]])
+
+
+def test_delete_and_replace(tmp_path):
+    store = open_store(tmp_path)
+    store.add_vectors(["a", "b"], [basis(0), basis(1)], ids=["a", "b"])
+
+    assert store.delete(["a"])
+    assert not store.delete(["missing"])
+    assert [doc.id for doc, _, _ in store.search_by_vector(basis(0), k=2)] == ["b"]
+
+    # Re-adding an ID hides the previous version
+    store.add_vectors(["b v2"], [basis(2)], ids=["b"])
+    results = store.search_by_vector(basis(2), k=5)
+    assert [(doc.id, doc.page_content) for doc, _, _ in results] == [("b", "b v2")]
+
+
+def test_reopen_keeps_rows_and_deletions(tmp_path):
+    store = open_store(tmp_path)
+    store.add_vectors(["a", "b"], [basis(0), basis(1)], ids=["a", "b"])
+    store.delete(["b"])
+
+    reopened = open_store(tmp_path)
+    assert [doc.id for doc, _, _ in reopened.search_by_vector(basis(1), k=5)] == ["a"]
+
+
+def test_refresh_picks_up_writes_from_another_instance(tmp_path):
+    reader = open_store(tmp_path)
+    writer = open_store(tmp_path)
+    writer.add_vectors(["a"], [basis(0)], ids=["a"])
+    before = reader.generation()
+
+    writer.add_vectors(["b"], [basis(1)], ids=["b"])
+    assert reader.refresh()
+    assert not reader.refresh()
+    assert [doc.id for doc, _, _ in reader.search_by_vector(basis(1), k=1)] == ["b"]
+
+    writer.delete(["a"])
+    assert reader.generation() != before
+    assert [doc.id for doc, _, _ in reader.search_by_vector(basis(0), k=5)] == ["b"]
+
+
+def test_int8_storage_keeps_ranking(tmp_path):
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(50, 16)).astype(np.float32)
+    store = open_store(tmp_path, dtype="int8")
+    store.add_vectors([str(i) for i in range(50)], vectors, ids=[str(i) for i in range(50)])
+
+    results = store.search_by_vector(vectors[7], k=3)
+    assert results[0][0].id == "7"
+    assert results[0][1] == pytest.approx(1.0, abs=1e-3)
+    # The dtype of an existing store comes from its metadata
+    assert open_store(tmp_path)._quantized
+
+
+def test_unsupported_dtype(tmp_path):
+    with pytest.raises(ValueError):
+        open_store(tmp_path, dtype="float16")
+
+
+def test_ivf_index_finds_exact_neighbours(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(200, 8)).astype(np.float32)
+    store = open_store(tmp_path, ivf_min_docs=100, nprobe=16)
+    store.add_vectors([str(i) for i in range(200)], vectors, ids=[str(i) for i in range(200)])
+
+    assert store.build_index(nlist=16)
+    # Rows appended after the build are still searched exactly
+    store.add_vectors(["new"], [vectors[3] + 0.01], ids=["new"])
+    found = {doc.id for doc, _, _ in store.search_by_vector(vectors[3], k=2)}
+    assert found == {"3", "new"}
+
+
+def test_build_index_skips_small_stores(tmp_path):
+    store = open_store(tmp_path, ivf_min_docs=100)
+    store.add_vectors(["a"], [basis(0)])
+    assert not store.build_index()
+    assert open_store(tmp_path).search_by_vector(basis(0), k=0) == []
+
+
+def fill(store, count, dim=8, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+    ids = [str(i) for i in range(count)]
+    store.add_vectors([f"text {i}" for i in ids], vectors, [{"n": int(i)} for i in ids], ids=ids)
+    return vectors
+
+
+def test_compact_reclaims_deleted_and_replaced_rows(tmp_path):
+    store = open_store(tmp_path)
+    vectors = fill(store, 10)
+    store.delete(["1", "2", "3"])
+    store.add_vectors(["text 4 v2"], [vectors[4]], [{"n": 4}], ids=["4"])
+    assert store.dead_fraction == pytest.approx(4 / 11)
+
+    assert store.compact()
+    assert store.dead_fraction == 0.0 and len(store) == 7
+    assert not store.compact()
+    # Only the new epoch's files are left
+    assert not (tmp_path / "vectors.bin").exists() and not (tmp_path / "deleted.i64").exists()
+    assert (tmp_path / "vectors.1.bin").stat().st_size == 7 * 8 * 4
+
+    doc, score, _ = store.search_by_vector(vectors[4], k=1)[0]
+    assert (doc.id, doc.page_content, doc.metadata) == ("4", "text 4 v2", {"n": 4})
+    assert score == pytest.approx(1.0)
+    reopened = open_store(tmp_path)
+    found = sorted(doc.id for doc, _, _ in reopened.search_by_vector(vectors[0], k=10))
+    assert found == ["0", "4", "5", "6", "7", "8", "9"]
+
+    # Writes after compaction go to the new epoch
+    reopened.add_vectors(["text 1"], [vectors[1]], ids=["1"])
+    assert open_store(tmp_path).search_by_vector(vectors[1], k=1)[0][0].id == "1"
+
+
+def test_readers_keep_their_view_until_refresh(tmp_path):
+    writer = open_store(tmp_path)
+    vectors = fill(writer, 10)
+    reader = open_store(tmp_path)
+    writer.delete([str(i) for i in range(5)])
+    writer.compact()
+
+    # The reader's mapped rows and record handle still belong to the old files
+    assert reader.search_by_vector(vectors[7], k=1)[0][0].page_content == "text 7"
+    assert reader.refresh()
+    assert len(reader) == 5
+    assert reader.search_by_vector(vectors[7], k=1)[0][0].page_content == "text 7"
+
+
+def test_compact_int8_store_and_rebuild_ivf(tmp_path):
+    store = open_store(tmp_path, dtype="int8", ivf_min_docs=50, nprobe=16)
+    vectors = fill(store, 200, dim=16)
+    assert store.build_index(nlist=8)
+    store.delete([str(i) for i in range(0, 200, 2)])
+
+    assert store.compact()
+    assert store._meta["ivf"]["rows"] == 100
+    assert store.search_by_vector(vectors[51], k=1)[0][0].id == "51"
+    ivf_files = {path.name for path in tmp_path.glob("ivf_*")}
+    assert ivf_files == {"ivf_centroids.1.bin", "ivf_order.1.i64", "ivf_bounds.1.i64"}
+
+
+def test_interrupted_compaction_leaves_the_store_intact(tmp_path):
+    store = open_store(tmp_path)
+    vectors = fill(store, 4)
+    store.delete(["0"])
+    # Files of a compaction that crashed before switching meta.json
+    (tmp_path / "vectors.1.bin").write_bytes(b"partial")
+
+    reopened = open_store(tmp_path)
+    assert reopened.search_by_vector(vectors[2], k=1)[0][0].id == "2"
+    assert reopened.compact()
+    assert reopened.search_by_vector(vectors[2], k=1)[0][0].id == "2"
+
+
+def test_local_sink_compacts_past_the_dead_fraction(tmp_path):
+    store = open_store(tmp_path)
+    fill(store, 10)
+    sink = LocalSink(store)
+
+    asyncio.run(sink.delete(["0", "1"]))
+    assert store.dead_fraction == pytest.approx(0.2)
+    asyncio.run(sink.delete(["2", "3"]))
+    assert store.dead_fraction == 0.0 and len(store) == 6
@@ -0,0 +1,102 @@
+"""Tests for the incremental ingestion manifest."""
+
+import os
+
+from langchain_core.documents import Document
+
+from src.ingestion.loaders import create_splitter, load_and_split
+from src.ingestion.manifest import IngestManifest, assign_chunk_ids, make_chunk_id
+
+SETTINGS = {"embedding_model": "m", "chunk_size": 200, "chunk_overlap": 0}
+
+
+def paragraph(n):
+    # Each paragraph is its own chunk: two do not fit into 200 characters
+    return f"Paragraph {n}: " + " ".join(f"word{n}x{i}" for i in range(15))
+
+
+def test_chunk_ids_survive_an_insert_near_the_top(tmp_path):
+    path = tmp_path / "doc.txt"
+    splitter = create_splitter(chunk_size=200, chunk_overlap=0)
+    path.write_text("\n\n".join(paragraph(n) for n in range(6)), encoding="utf-8")
+    before = [chunk.id for chunk in load_and_split(path, splitter)]
+
+    path.write_text("\n\n".join(paragraph(n) for n in [0, 99, 1, 2, 3, 4, 5]), encoding="utf-8")
+    after = [chunk.id for chunk in load_and_split(path, splitter)]
+
+    assert len(before) == 6
+    assert set(after) - set(before) == {after[1]}
+    assert set(before) <= set(after)
+
+
+def test_repeated_texts_get_distinct_ids():
+    chunks = [Document(page_content=text, metadata={"source": "a.txt"}) for text in ["header", "body", "header"]]
+    ids = assign_chunk_ids(chunks)
+    assert len(set(ids)) == 3
+    assert ids[0] == make_chunk_id("a.txt", "header") == chunks[0].id
+    assert ids[2] == make_chunk_id("a.txt", "header", occurrence=1)
+    assert make_chunk_id("b.txt", "header") != ids[0]
+
+
+def ingest(manifest, paths):
+    for path in paths:
+        manifest.record(str(path), [f"{path.name}-chunk"])
+    manifest.save()
+
+
+def test_plan_sorts_files_into_unchanged_changed_and_deleted(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    same, touched, edited, removed = (docs / name for name in ["same.txt", "touched.txt", "edited.txt", "removed.txt"])
+    for path in (same, touched, edited, removed):
+        path.write_text(path.name, encoding="utf-8")
+    manifest_path = tmp_path / "manifest.json"
+    ingest(IngestManifest(manifest_path, SETTINGS), [same, touched, edited, removed])
+
+    stat = touched.stat()
+    os.utime(touched, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    edited.write_text("new content", encoding="utf-8")
+    removed.unlink()
+    new = docs / "new.txt"
+    new.write_text("new", encoding="utf-8")
+
+    manifest = IngestManifest(manifest_path, SETTINGS)
+    plan = manifest.plan([same, touched, edited, new], docs)
+    assert sorted(p.name for p in plan.unchanged) == ["same.txt", "touched.txt"]
+    assert sorted(p.name for p in plan.changed) == ["edited.txt", "new.txt"]
+    assert plan.deleted == [str(removed)]
+    assert set(plan.hashes) == {str(edited)}
+    assert manifest.get(str(removed)).chunk_ids == ["removed.txt-chunk"]
+    # A touched but identical file has its stat refreshed, so it is not hashed again
+    assert manifest.get(str(touched)).mtime_ns == touched.stat().st_mtime_ns
+
+
+def test_files_outside_the_root_are_not_deleted(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    outside = tmp_path / "b" / "x.txt"
+    outside.write_text("x", encoding="utf-8")
+    manifest = IngestManifest(tmp_path / "manifest.json", SETTINGS)
+    ingest(manifest, [outside])
+    outside.unlink()
+    assert manifest.plan([], tmp_path / "a").deleted == []
+
+
+def test_changed_settings_or_force_reindex_everything(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_text("text", encoding="utf-8")
+    manifest_path = tmp_path / "manifest.json"
+    ingest(IngestManifest(manifest_path, SETTINGS), [path])
+
+    assert IngestManifest(manifest_path, SETTINGS).plan([path], tmp_path).unchanged == [path]
+    assert IngestManifest(manifest_path, SETTINGS).plan([path], tmp_path, force=True).changed == [path]
+    changed = IngestManifest(manifest_path, {**SETTINGS, "chunk_size": 500})
+    assert changed.settings_changed
+    assert changed.plan([path], tmp_path).changed == [path]
+
+
+def test_unreadable_manifest_starts_empty(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text("{not json", encoding="utf-8")
+    manifest = IngestManifest(manifest_path, SETTINGS)
+    assert manifest.files == {} and not manifest.settings_changed
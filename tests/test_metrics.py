@@ -0,0 +1,124 @@
+"""Tests for spans, histograms and the Prometheus text output."""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.config.config import Config
+from src.utils import metrics
+from src.utils.metrics import Counter, Histogram, MetricsRegistry, instrument_node, render_samples
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics, "_metrics", registry)
+    monkeypatch.setattr(Config, "METRICS_ENABLED", True)
+    return registry
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    histogram = Histogram("op_seconds", "Op time.", (0.1, 1.0), ("op",))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "read")
+
+    assert histogram.render() == [
+        "# HELP op_seconds Op time.",
+        "# TYPE op_seconds histogram",
+        'op_seconds_bucket{op="read",le="0.1"} 2',
+        'op_seconds_bucket{op="read",le="1"} 3',
+        'op_seconds_bucket{op="read",le="+Inf"} 4',
+        'op_seconds_sum{op="read"} 3.65',
+        'op_seconds_count{op="read"} 4',
+    ]
+
+
+def test_counter_escapes_label_values():
+    counter = Counter("lookups_total", "Lookups.", ("cache", "result"))
+    counter.inc('say "hi"\\\n', "hit")
+    counter.inc('say "hi"\\\n', "hit", amount=2)
+
+    assert counter.render()[2] == 'lookups_total{cache="say \\"hi\\"\\\\\\n",result="hit"} 3'
+
+
+def test_render_samples_sorts_by_labels():
+    lines = render_samples("entries", "gauge", "Entries.", ("cache",), {("tool",): 2.5, ("answer",): 4.0})
+    assert lines == [
+        "# HELP entries Entries.",
+        "# TYPE entries gauge",
+        'entries{cache="answer"} 4',
+        'entries{cache="tool"} 2.5',
+    ]
+    assert render_samples("up", "gauge", "Up.", (), {(): 1})[-1] == "up 1"
+
+
+def test_instrument_node_records_spans(registry, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, "perf_counter", clock)
+    spans = []
+    registry.add_listener(spans.append)
+
+    async def agent(state):
+        clock.now += 0.3
+        metrics.note_cache("answer", True)
+        message = AIMessage(content="hello", response_metadata={"prompt_eval_count": 40, "eval_count": 5})
+        return {"messages": [message]}
+
+    async def failing(state):
+        clock.now += 0.02
+        raise asyncio.TimeoutError
+
+    asyncio.run(instrument_node("agent", agent)({"messages": [AIMessage(content="question")]}))
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(instrument_node("agent", failing)({}))
+
+    ok, timeout = spans
+    assert (ok.duration, ok.status, ok.input_size, ok.output_size) == (pytest.approx(0.3), "ok", 8, 5)
+    assert (ok.prompt_tokens, ok.eval_tokens, ok.cache) == (40, 5, {"answer": True})
+    assert timeout.status == "timeout"
+
+    text = registry.render()
+    assert 'langgraph_node_duration_seconds_bucket{node="agent",status="ok",le="0.25"} 0' in text
+    assert 'langgraph_node_duration_seconds_bucket{node="agent",status="ok",le="0.5"} 1' in text
+    assert 'langgraph_node_duration_seconds_count{node="agent",status="timeout"} 1' in text
+    assert 'ollama_prompt_eval_tokens_sum{node="agent"} 40' in text
+    assert 'langgraph_cache_lookups_total{cache="answer",result="hit"} 1' in text
+
+
+def test_sync_nodes_record_errors(registry):
+    def broken(state):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        instrument_node("broken", broken)({})
+    assert 'langgraph_node_duration_seconds_count{node="broken",status="error"} 1' in registry.render()
+
+
+def test_collectors_are_rendered_and_failures_skipped(registry):
+    registry.add_collector(lambda: render_samples("entries", "gauge", "Entries.", ("cache",), {("tool",): 3}))
+    registry.add_collector(lambda: 1 / 0)
+    assert registry.render().endswith('entries{cache="tool"} 3\n')
+
+
+def test_disabled_metrics_record_nothing(registry, monkeypatch):
+    monkeypatch.setattr(Config, "METRICS_ENABLED", False)
+
+    def node(state):
+        return state
+
+    assert instrument_node("node", node) is node
+    metrics.note_cache("tool", True)
+    metrics.record_tool_call("search", 0.1, "ok", 10, 20, cache_hit=False)
+
+    text = registry.render()
+    assert "_bucket" not in text and "langgraph_cache_lookups_total{" not in text
@@ -0,0 +1,67 @@
+"""Tests for maximal-marginal-relevance selection."""
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from src.utils.mmr import lexical_scores, mmr_select, rerank_candidates
+
+
+def test_relevance_only_ranks_by_similarity():
+    vectors = [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]]
+    selected, relevance = mmr_select([1.0, 0.0], vectors, k=3, lambda_mult=1.0)
+    assert selected == [0, 1, 2]
+    assert relevance[0] == pytest.approx(1.0)
+
+
+def test_diversity_skips_near_duplicates():
+    # Two copies of the best chunk and one different, still relevant chunk
+    vectors = [[1.0, 0.0], [1.0, 0.0], [0.7, 0.7]]
+    selected, _ = mmr_select([1.0, 0.1], vectors, k=2, lambda_mult=0.5)
+    assert selected == [0, 2]
+
+
+def test_k_larger_than_candidates_and_empty_input():
+    selected, _ = mmr_select([1.0, 0.0], [[1.0, 0.0]], k=5)
+    assert selected == [0]
+    selected, relevance = mmr_select([1.0, 0.0], np.zeros((0, 2)), k=3)
+    assert selected == [] and relevance.size == 0
+
+
+def test_lexical_scores_weight_rare_terms():
+    scores = lexical_scores("XJ-200 manual", ["the xj-200 manual", "another manual", "unrelated"])
+    assert scores[0] == pytest.approx(1.0)
+    assert scores[0] > scores[1] > scores[2] == 0.0
+    assert lexical_scores("", ["text"]).tolist() == [0.0]
+
+
+def test_lexical_scores_match_korean_particles():
+    scores = lexical_scores("서울 날씨", ["서울의 날씨는 맑음", "부산"])
+    assert scores[0] == pytest.approx(1.0)
+    assert scores[1] == 0.0
+
+
+def _candidates():
+    return [
+        (Document(id="bm25-top", page_content="exact product code"), [0.2, 1.0]),
+        (Document(id="dense-top", page_content="similar wording"), [1.0, 0.0]),
+    ]
+
+
+def test_rerank_uses_embedding_relevance():
+    ranked = rerank_candidates("q", [1.0, 0.0], _candidates(), k=1)
+    assert [doc.id for doc, _ in ranked] == ["dense-top"]
+    assert rerank_candidates("q", [1.0, 0.0], [], k=3) == []
+
+
+def test_rerank_keeps_fused_ranking_signal():
+    # Fused RRF scores put the lexical match first
+    ranked = rerank_candidates(
+        "q", [1.0, 0.0], _candidates(), k=1, prior_scores=[0.032, 0.016], prior_weight=0.7
+    )
+    assert [doc.id for doc, _ in ranked] == ["bm25-top"]
+
+
+def test_rerank_ignores_prior_when_weight_is_zero():
+    ranked = rerank_candidates("q", [1.0, 0.0], _candidates(), k=1, prior_scores=[0.032, 0.016])
+    assert [doc.id for doc, _ in ranked] == ["dense-top"]
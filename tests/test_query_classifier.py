@@ -0,0 +1,54 @@
+"""Tests for the retrieval gate classifier."""
+
+import pytest
+
+from src.utils.query_classifier import classify_query, is_arithmetic
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "XJ-200",
+        "A-123",
+        "LG-4821 제품",
+        "2024년 매출",
+        "what is 2024-01-01?",
+        "2024-1-1",
+        "refund",
+        "How do I reset the XJ-200 router to factory settings?",
+        "Explain the invoice retention policy document",
+    ],
+)
+def test_lookups_are_retrieved(query):
+    assert classify_query(query).retrieve
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["12 * (3 + 4)", "what is 2^10?", "3 x 4", "100 ÷ 4 =", "what is 17 - 4?", "계산해줘 5 + 5"],
+)
+def test_expressions_skip_as_arithmetic(query):
+    decision = classify_query(query)
+    assert not decision.retrieve
+    assert decision.reason == "arithmetic"
+
+
+@pytest.mark.parametrize("query", ["2024-01-01", "A-123", "42", "1.2.3", "(3 +"])
+def test_non_expressions_are_not_arithmetic(query):
+    assert not is_arithmetic(query)
+
+
+@pytest.mark.parametrize(
+    "query, reason",
+    [("", "empty"), ("Hello!", "smalltalk"), ("안녕하세요", "smalltalk"), ("What is the weather in Seoul?", "weather")],
+)
+def test_rules_skip_retrieval(query, reason):
+    decision = classify_query(query)
+    assert not decision.retrieve
+    assert decision.reason == reason
+
+
+def test_short_queries_retrieve_regardless_of_threshold():
+    decision = classify_query("refund", threshold=0.99)
+    assert decision.retrieve
+    assert decision.reason == "short"
@@ -0,0 +1,38 @@
+"""Tests for reciprocal rank fusion."""
+
+import pytest
+
+from src.utils.rank_fusion import reciprocal_rank_fusion
+
+
+def test_items_ranked_well_by_both_lists_win():
+    lexical = ["code-match", "both", "lexical-only"]
+    vector = ["vector-only", "both", "code-match"]
+    fused = reciprocal_rank_fusion([lexical, vector], rank_constant=60)
+    keys = [key for key, _ in fused]
+    assert keys[:2] == ["code-match", "both"]
+    assert set(keys) == {"code-match", "both", "lexical-only", "vector-only"}
+
+
+def test_scores_follow_the_formula():
+    fused = dict(reciprocal_rank_fusion([["a", "b"], ["b"]], rank_constant=10))
+    assert fused["a"] == pytest.approx(1 / 11)
+    assert fused["b"] == pytest.approx(1 / 12 + 1 / 11)
+
+
+def test_weights_shift_the_order():
+    lexical, vector = ["lex"], ["vec"]
+    assert reciprocal_rank_fusion([lexical, vector], weights=[2.0, 1.0])[0][0] == "lex"
+    assert reciprocal_rank_fusion([lexical, vector], weights=[1.0, 2.0])[0][0] == "vec"
+
+
+def test_ties_keep_first_seen_order():
+    fused = reciprocal_rank_fusion([["a"], ["b"]])
+    assert [key for key, _ in fused] == ["a", "b"]
+
+
+def test_empty_and_mismatched_inputs():
+    assert reciprocal_rank_fusion([]) == []
+    assert reciprocal_rank_fusion([[], []]) == []
+    with pytest.raises(ValueError):
+        reciprocal_rank_fusion([["a"]], weights=[1.0, 2.0])
@@ -0,0 +1,235 @@
+"""Tests for Elasticsearch readiness tracking."""
+
+import asyncio
+
+import pytest
+from elastic_transport import ApiResponseMeta, ConnectionError, HttpHeaders, NodeConfig
+from elasticsearch import ApiError
+
+from src.config.config import Config
+from src.tools import retriever
+from src.utils import readiness as readiness_module
+from src.utils.readiness import (
+    READY,
+    UNKNOWN,
+    WAITING,
+    SearchReadiness,
+    SearchUnavailableError,
+    search_ready,
+)
+
+
+class FakeCluster:
+    def __init__(self, client):
+        self.client = client
+
+    async def health(self, **kwargs):
+        if self.client.error is not None:
+            raise self.client.error
+        return {"status": self.client.health, "timed_out": False}
+
+
+class FakeIndices:
+    def __init__(self, client):
+        self.client = client
+
+    async def exists(self, index):
+        return self.client.index_exists
+
+
+class FakeClient:
+    """Async Elasticsearch stand-in exposing the calls probe() makes."""
+
+    def __init__(self, health="green", index_exists=True, error=None):
+        self.health = health
+        self.index_exists = index_exists
+        self.error = error
+        self.cluster = FakeCluster(self)
+        self.indices = FakeIndices(self)
+
+    def options(self, **kwargs):
+        return self
+
+
+def api_error(status, message="error"):
+    meta = ApiResponseMeta(
+        status=status,
+        http_version="1.1",
+        headers=HttpHeaders(),
+        duration=0.0,
+        node=NodeConfig("http", "localhost", 9200),
+    )
+    return ApiError(message, meta=meta, body={})
+
+
+@pytest.fixture(autouse=True)
+def elasticsearch_backend(monkeypatch):
+    monkeypatch.setattr(Config, "VECTOR_BACKEND", "elasticsearch")
+
+
+def make_readiness(client, **kwargs):
+    return SearchReadiness(
+        index_name="docs", wait_for_status="yellow", probe_timeout=1, backoff=0.01, backoff_max=0.02,
+        client=client, **kwargs
+    )
+
+
+def test_probe_transitions():
+    client = FakeClient(health="red")
+    readiness = make_readiness(client)
+    assert readiness.status == UNKNOWN
+
+    assert not asyncio.run(readiness.probe())
+    assert readiness.status == WAITING and readiness.cluster_status == "red"
+
+    client.health = "yellow"
+    client.index_exists = False
+    assert not asyncio.run(readiness.probe())
+    assert "does not exist" in readiness.detail
+
+    client.error = ConnectionError("refused")
+    assert not asyncio.run(readiness.probe())
+    assert readiness.detail.startswith("ConnectionError")
+
+    client.error = None
+    client.index_exists = True
+    assert asyncio.run(readiness.probe())
+    assert readiness.ready
+    assert readiness.snapshot()["probes"] == 4
+
+
+def test_cluster_only_readiness_ignores_the_index():
+    readiness = make_readiness(FakeClient(index_exists=False), require_index=False)
+    assert asyncio.run(readiness.probe())
+
+
+def test_unknown_status_is_rejected():
+    with pytest.raises(ValueError):
+        SearchReadiness(wait_for_status="blue", client=FakeClient())
+
+
+def test_ensure_ready_fails_fast_and_probes_in_background():
+    client = FakeClient(index_exists=False)
+    readiness = make_readiness(client)
+
+    async def run():
+        with pytest.raises(SearchUnavailableError):
+            await readiness.ensure_ready()
+        # The background probe picks up the index once it is created
+        client.index_exists = True
+        await asyncio.wait_for(readiness._task, timeout=1)
+        await readiness.ensure_ready()
+
+    asyncio.run(run())
+    assert readiness.status == READY
+
+
+def test_wait_times_out():
+    readiness = make_readiness(FakeClient(health="red"))
+    assert not asyncio.run(readiness.wait(timeout=0.05))
+    assert readiness.probes >= 2
+
+
+def test_only_unavailability_errors_reset_readiness():
+    readiness = make_readiness(FakeClient())
+    asyncio.run(readiness.probe())
+
+    readiness.report_failure(api_error(400, "parsing_exception"))
+    readiness.report_failure(ValueError("bad query"))
+    assert readiness.ready
+
+    readiness.report_failure(api_error(404, "index_not_found_exception"))
+    assert readiness.status == WAITING
+    asyncio.run(readiness.probe())
+    readiness.report_failure(api_error(503))
+    assert readiness.status == WAITING
+    asyncio.run(readiness.probe())
+    readiness.report_failure(ConnectionError("reset"))
+    assert readiness.status == WAITING
+    asyncio.run(readiness.probe())
+    readiness.report_failure(asyncio.TimeoutError())
+    assert readiness.status == WAITING
+    assert readiness.detail == "TimeoutError: search timed out"
+
+
+class FakeSearchClients:
+    """Shared clients whose embedding and search calls take given seconds."""
+
+    def __init__(self, embed_seconds=0.0, search_seconds=0.0):
+        self.embed_seconds = embed_seconds
+        self.search_seconds = search_seconds
+
+    def get_embeddings(self):
+        return self
+
+    def get_async_es_client(self):
+        return self
+
+    async def aembed_query(self, query):
+        await asyncio.sleep(self.embed_seconds)
+        return [1.0, 0.0]
+
+    async def search(self, **kwargs):
+        await asyncio.sleep(self.search_seconds)
+        return {"hits": {"hits": []}}
+
+
+@pytest.fixture
+def search_setup(monkeypatch):
+    monkeypatch.setattr(Config, "RETRIEVAL_EMBED_TIMEOUT", 0.05)
+    monkeypatch.setattr(Config, "RETRIEVAL_SEARCH_TIMEOUT", 0.05)
+    # Keep background re-probes from turning the cluster ready again
+    client = FakeClient()
+    readiness = make_readiness(client)
+    asyncio.run(readiness.probe())
+    client.health = "red"
+    monkeypatch.setattr(retriever, "get_search_readiness", lambda: readiness)
+
+    def use(clients):
+        monkeypatch.setattr(retriever, "get_clients", lambda: clients)
+        return readiness
+
+    return use
+
+
+def test_search_timeout_marks_the_cluster_unavailable(search_setup):
+    readiness = search_setup(FakeSearchClients(search_seconds=10))
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await retriever.asearch_with_scores("q", mode="dense", diversify=False)
+        assert readiness.status == WAITING
+        # Later requests fail fast instead of waiting for the timeout
+        with pytest.raises(SearchUnavailableError):
+            await retriever.asearch_with_scores("q", mode="dense", diversify=False)
+
+    asyncio.run(run())
+
+
+def test_embedding_timeout_keeps_the_cluster_ready(search_setup):
+    readiness = search_setup(FakeSearchClients(embed_seconds=10))
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await retriever.asearch_with_scores("q", mode="dense", diversify=False)
+
+    asyncio.run(run())
+    assert readiness.ready
+
+
+def test_search_ready_treats_unprobed_cluster_as_ready(monkeypatch):
+    readiness = make_readiness(FakeClient(health="red"))
+    monkeypatch.setattr(readiness_module, "_readiness", readiness)
+    assert search_ready()
+    asyncio.run(readiness.probe())
+    assert not search_ready()
+
+
+def test_local_backend_is_always_ready(monkeypatch):
+    monkeypatch.setattr(Config, "VECTOR_BACKEND", "local")
+    readiness = make_readiness(FakeClient(health="red"))
+    asyncio.run(readiness.ensure_ready())
+    readiness.report_failure(ConnectionError("refused"))
+    assert readiness.status == UNKNOWN and readiness.probes == 0
+    assert readiness.snapshot() == {"backend": "local", "status": READY}
+    assert search_ready()
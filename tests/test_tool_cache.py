@@ -0,0 +1,125 @@
+"""Tests for the tool result cache."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.config.config import Config
+from src.tools import cache as tool_cache
+from src.tools.cache import (
+    ToolResultCache,
+    cached_tool,
+    canonicalize_args,
+    is_cacheable,
+    track_cache_hits,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(monkeypatch):
+    monkeypatch.setattr(Config, "TOOL_CACHE_ENABLED", True)
+    monkeypatch.setattr(tool_cache, "_caches", {})
+
+
+def test_canonical_keys_ignore_order_and_whitespace():
+    assert canonicalize_args({"b": 1, "a": "x  y"}) == canonicalize_args({"a": " x y ", "b": 1})
+    assert canonicalize_args({"a": ["p  q", {"c": "r\ts"}]}) == '{"a": ["p q", {"c": "r s"}]}'
+    assert canonicalize_args({"a": "x"}) != canonicalize_args({"a": "y"})
+
+
+def test_errors_are_not_cacheable():
+    assert is_cacheable("42")
+    assert is_cacheable(None)
+    assert not is_cacheable("Error: division by zero")
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = ToolResultCache("t", ttl=10, max_size=10)
+    cache.put("k", "v")
+    now[0] = 10
+    assert cache.get("k") == (True, "v")
+    now[0] = 10.5
+    assert cache.get("k") == (False, None)
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 0}
+
+
+def test_lru_eviction():
+    cache = ToolResultCache("t", ttl=60, max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1) and cache.get("c") == (True, 3)
+
+
+def test_cached_tool_shares_entries_for_equivalent_calls():
+    calls = []
+
+    @cached_tool(ttl=60)
+    def lookup(query: str, limit: int = 5) -> str:
+        calls.append(query)
+        return "Error: bad" if query == "bad" else f"result {query}"
+
+    assert lookup("a  b") == "result a  b"
+    with track_cache_hits() as info:
+        assert lookup(" a b", limit=5) == "result a  b"
+    assert info == {"cache_hit": True}
+    lookup("bad")
+    lookup("bad")
+    assert calls == ["a  b", "bad", "bad"]
+    assert tool_cache.get_tool_cache_stats()["lookup"]["size"] == 1
+
+
+def test_generation_is_part_of_the_key():
+    generation = ["g1"]
+    calls = []
+
+    @cached_tool(ttl=60, generation=lambda: generation[0])
+    async def search(query: str) -> str:
+        calls.append(query)
+        return query
+
+    async def run():
+        await search("q")
+        await search("q")
+        generation[0] = "g2"
+        await search("q")
+        # A None generation bypasses the cache
+        generation[0] = None
+        await search("q")
+
+    asyncio.run(run())
+    assert len(calls) == 3
+
+
+def test_disabled_cache_and_invalidation(monkeypatch):
+    calls = []
+
+    @cached_tool(ttl=60)
+    def tool(x: int) -> int:
+        calls.append(x)
+        return x
+
+    tool(1)
+    tool_cache.invalidate_tool_cache("tool")
+    tool(1)
+    monkeypatch.setattr(Config, "TOOL_CACHE_ENABLED", False)
+    tool(1)
+    assert calls == [1, 1, 1]
+
+
+def test_metrics_export():
+    @cached_tool(ttl=60)
+    def tool(x: int) -> int:
+        return x
+
+    tool(1)
+    tool(1)
+    lines = tool_cache._collect_metrics()
+    assert 'langgraph_tool_cache_lookups_total{tool="tool",result="hit"} 1' in lines
+    assert 'langgraph_tool_cache_lookups_total{tool="tool",result="miss"} 1' in lines
+    assert 'langgraph_tool_cache_entries{tool="tool"} 1' in lines
@@ -0,0 +1,121 @@
+"""Tests for the concurrent tool executor."""
+
+import asyncio
+
+import pytest
+from langchain_core.tools import tool
+
+from src.config.config import Config
+from src.tools import cache as tool_cache
+from src.tools.cache import cached_tool
+from src.tools.registry import ToolRegistry
+
+
+class Tracker:
+    """Counts how many fake tool calls run at the same time."""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+
+    async def run(self, seconds):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self.running -= 1
+
+
+@pytest.fixture
+def tracker():
+    return Tracker()
+
+
+@pytest.fixture
+def tools(tracker):
+    @tool
+    async def slow(seconds: float) -> str:
+        """Sleep, then answer."""
+        await tracker.run(seconds)
+        return f"slept {seconds}"
+
+    @tool
+    async def failing(reason: str) -> str:
+        """Always fail."""
+        raise ValueError(reason)
+
+    return [slow, failing]
+
+
+def call(name, call_id, **args):
+    return {"name": name, "args": args, "id": call_id}
+
+
+def test_calls_run_concurrently_and_keep_their_order(tools, tracker):
+    registry = ToolRegistry(tools, max_concurrency=8)
+    calls = [call("slow", "1", seconds=0.1), call("slow", "2", seconds=0.0), call("slow", "3", seconds=0.05)]
+
+    messages = asyncio.run(registry.execute_all(calls))
+    assert [m.tool_call_id for m in messages] == ["1", "2", "3"]
+    assert [m.content for m in messages] == ["slept 0.1", "slept 0.0", "slept 0.05"]
+    assert tracker.peak == 3
+
+
+def test_concurrency_is_bounded(tools, tracker):
+    registry = ToolRegistry(tools, max_concurrency=2)
+    asyncio.run(registry.execute_all([call("slow", str(i), seconds=0.01) for i in range(5)]))
+    assert tracker.peak == 2
+
+
+def test_per_tool_timeouts(tools):
+    registry = ToolRegistry(tools, default_timeout=5, timeouts={"slow": 0.05})
+    assert registry.get_timeout("slow") == 0.05
+    assert registry.get_timeout("failing") == 5
+
+    message, = asyncio.run(registry.execute_all([call("slow", "1", seconds=1)]))
+    assert message.status == "error"
+    assert message.content == "Error: slow timed out after 0.05s"
+
+
+def test_timeouts_default_to_the_config(tools, monkeypatch):
+    monkeypatch.setattr(Config, "TOOL_TIMEOUTS", {"slow": 2.0})
+    monkeypatch.setattr(Config, "TOOL_TIMEOUT", 7.0)
+    registry = ToolRegistry(tools)
+    assert registry.get_timeout("slow") == 2.0
+    assert registry.get_timeout("failing") == 7.0
+
+
+def test_failures_become_error_messages(tools):
+    registry = ToolRegistry(tools)
+    failed, unknown, ok = asyncio.run(registry.execute_all([
+        call("failing", "1", reason="boom"),
+        call("missing", "2"),
+        call("slow", "3", seconds=0),
+    ]))
+    assert failed.status == "error" and failed.content == "Error running failing: boom"
+    assert unknown.status == "error" and unknown.content == "Unknown tool: missing"
+    assert ok.status == "success"
+
+
+def test_cache_hits_are_reported_in_response_metadata(monkeypatch):
+    monkeypatch.setattr(Config, "TOOL_CACHE_ENABLED", True)
+    monkeypatch.setattr(tool_cache, "_caches", {})
+
+    @tool
+    @cached_tool(ttl=60)
+    async def lookup(query: str) -> str:
+        """Look something up."""
+        return query.upper()
+
+    registry = ToolRegistry([lookup])
+
+    async def run():
+        return await registry.execute(call("lookup", "1", query="a")), await registry.execute(
+            call("lookup", "2", query="a")
+        )
+
+    first, second = asyncio.run(run())
+    assert first.response_metadata == {"cache_hit": False}
+    assert second.response_metadata == {"cache_hit": True}
+    assert second.content == "A"